@@ -0,0 +1,55 @@
+"""
+Benchmark for mixed precision.
+Runs forward + backward of element-wise and tmult heavy steps in float32 and under
+autocast (float16 activations) and reports step time and peak traced memory.
+
+Run with: python benchmarks/bench_autocast.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor, tmult
+from mytorch.amp import autocast
+
+
+def step(a: Tensor, b: Tensor, w: Tensor, depth: int):
+    x = a
+    for _ in range(depth):
+        x = x * b + a
+    out = tmult(x, w, ([1], [0]), (a.dim[0], w.dim[1]))
+    out.backward(Tensor(np.ones(out.dim, dtype=out.dtype), requires_grad=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, nargs="+", default=[256, 1024])
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    print(f"{'size':>8}{'mode':>10}{'step [ms]':>12}{'peak [MiB]':>12}")
+    rng = np.random.default_rng(0)
+    for n in args.size:
+        a = Tensor(rng.standard_normal((n, n)), dtype=np.float32)
+        b = Tensor(rng.uniform(0.5, 1.0, (n, n)), dtype=np.float32)
+        w = Tensor(rng.standard_normal((n, n)) / n, dtype=np.float32)
+        for mode in ("float32", "autocast"):
+            def run():
+                a.grad = b.grad = w.grad = None
+                if mode == "autocast":
+                    with autocast():
+                        step(a, b, w, args.depth)
+                else:
+                    step(a, b, w, args.depth)
+            run()  # warm up
+            peak = peak_bytes(run)
+            seconds = best_time(run, args.min_time, args.repeat)
+            print(f"{n:>8}{mode:>10}{seconds * 1e3:>12.1f}{peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark for the backward engine.
+Times backward on deep chains and on wide / diamond-shaped graphs of growing size
+and reports the time per graph node, which should stay roughly constant.
+
+Run with: python benchmarks/bench_backward.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.tensor import Tensor
+
+
+def deep_chain(n: int) -> tuple[Tensor, Tensor]:
+    """r = a + c + c + ... (n additions)"""
+    a = Tensor([1.0, 2.0])
+    c = Tensor([1.0, 1.0], requires_grad=False)
+    r = a
+    for _ in range(n):
+        r = r + c
+    return a, r
+
+
+def wide_graph(n: int) -> tuple[Tensor, Tensor]:
+    """r = a*c_1 + a*c_2 + ... (a is reused by n branches)"""
+    a = Tensor([1.0, 2.0])
+    r = a * Tensor([1.0, 1.0], requires_grad=False)
+    for _ in range(n - 1):
+        r = r + a * Tensor([1.0, 1.0], requires_grad=False)
+    return a, r
+
+
+def diamond_graph(n: int) -> tuple[Tensor, Tensor]:
+    """r_{k+1} = r_k * r_k (2^n paths from r_n to a)"""
+    a = Tensor([1.0, 1.0])
+    r = a
+    for _ in range(n):
+        r = r * r
+    return a, r
+
+
+def time_backward(build, n: int, min_time: float, repeat: int) -> float:
+    _, r = build(n)
+    grad = Tensor([1.0, 1.0], requires_grad=False)
+    # the graph is retained, so every timed call backpropagates through the same graph
+    return best_time(lambda: r.backward(grad, retain_graph=True), min_time, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000])
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each graph")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per graph")
+    args = parser.parse_args()
+
+    np.seterr(over="ignore")  # gradients of the diamond graph grow like 2^n
+    print(f"{'graph':<10}{'nodes':>10}{'total [ms]':>14}{'per node [us]':>16}")
+    for name, build in [("deep", deep_chain), ("wide", wide_graph), ("diamond", diamond_graph)]:
+        for n in args.sizes:
+            t = time_backward(build, n, args.min_time, args.repeat)
+            print(f"{name:<10}{n:>10}{t * 1e3:>14.2f}{t / n * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark for graph capture.
+Compares eager training steps of a small MLP-like graph against replaying the captured step.
+
+Run with: python benchmarks/bench_capture.py
+"""
+
+import argparse
+
+import numpy as np
+
+import mytorch
+from mytorch.bench import best_time
+from mytorch.tensor import Tensor
+from mytorch.nn import Linear
+
+
+def make_step(layers: list):
+    def step(x):
+        for layer in layers:
+            x = layer(x) * 0.5 + x
+        return x
+    return step
+
+
+def eager_step(step, x):
+    out = step(x)
+    out.backward(Tensor(np.ones(out.dim), requires_grad=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, nargs="+", default=[8, 64, 256])
+    parser.add_argument("--depth", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    print(f"{'width':>8}{'eager [us]':>12}{'replay [us]':>13}{'speedup':>10}")
+    for width in args.width:
+        step = make_step([Linear(width, width) for _ in range(args.depth)])
+        x = Tensor(np.random.default_rng(0).standard_normal((args.batch, width)))
+        captured = mytorch.compile(step)
+        eager = best_time(lambda: eager_step(step, x), args.min_time, args.repeat)
+        replay = best_time(lambda: captured(x), args.min_time, args.repeat)
+        print(f"{width:>8}{eager * 1e6:>12.1f}{replay * 1e6:>13.1f}{eager / replay:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark for gradient checkpointing.
+Runs forward + backward of a deep stack of residual blocks with different checkpoint
+policies and reports the peak traced memory (after a warm-up step, so the Linear
+workspaces are already allocated) and the step time of each.
+
+Run with: python benchmarks/bench_checkpoint.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor
+from mytorch.nn import Module, Linear
+from mytorch.utils import checkpoint_sequential
+
+
+class Block(Module):
+    def __init__(self, width: int):
+        super().__init__()
+        self.linear = Linear(width, width)
+
+    def forward(self, x: Tensor) -> Tensor:
+        return self.linear(x) * 0.5 + x
+
+
+def step(layers: list, x: Tensor, segments: int, every: int):
+    if segments == 0:
+        out = x
+        for layer in layers:
+            out = layer(out)
+    else:
+        out = checkpoint_sequential(layers, segments, x, every)
+    out.backward(Tensor(np.ones(out.dim), requires_grad=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=32)
+    parser.add_argument("--width", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--segments", type=int, nargs="+", default=[0, 2, 4, 8])
+    parser.add_argument("--every", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    layers = [Block(args.width) for _ in range(args.depth)]
+    x = Tensor(np.random.default_rng(0).standard_normal((args.batch, args.width)), requires_grad=False)
+    print(f"{'segments':>10}{'peak [MiB]':>12}{'step [ms]':>12}")
+    for segments in args.segments:
+        run = lambda: step(layers, x, segments, args.every)
+        run()
+        peak = peak_bytes(run)
+        seconds = best_time(run, args.min_time, args.repeat)
+        label = "none" if segments == 0 else str(segments)
+        print(f"{label:>10}{peak / 2**20:>12.1f}{seconds * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
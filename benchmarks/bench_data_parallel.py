@@ -0,0 +1,72 @@
+"""
+Benchmark for DataParallel.
+Trains a two-layer MLP with SGD on random batches, comparing a single process running the
+whole batch against DataParallel with several worker processes (shared-memory all-reduce).
+
+Run with: python benchmarks/bench_data_parallel.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.nn import Linear
+from mytorch.optim import SGD
+from mytorch.parallel import DataParallel
+from mytorch.tensor import Tensor
+
+
+def make_step(features: int, hidden: int):
+    first = Linear(features, hidden)
+    second = Linear(hidden, 1)
+
+    def fn(x):
+        h = first(x)
+        return second(h * h)
+    return fn, list(first.parameters()) + list(second.parameters())
+
+
+def steps_per_second(step, min_time: float, repeat: int) -> float:
+    step()  # warm-up (forks the workers)
+    return 1.0 / best_time(step, min_time, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--features", type=int, default=256)
+    parser.add_argument("--hidden", type=int, default=512)
+    parser.add_argument("--min-time", type=float, default=1.0, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    np.seterr(over="ignore", invalid="ignore")  # the weights diverge over the calibrated number of steps
+    x = np.random.default_rng(0).standard_normal((args.batch_size, args.features), dtype=np.float32)
+    fn, params = make_step(args.features, args.hidden)
+    opt = SGD(params, lr=1e-4)
+
+    def single():
+        opt.zero_grad()
+        out = fn(Tensor(x, requires_grad=False))
+        out.backward(Tensor(np.ones(out.dim, dtype=out.dtype), requires_grad=False))
+        opt.step()
+
+    print(f"{'workers':>8}{'steps/s':>10}{'speedup':>10}")
+    baseline = steps_per_second(single, args.min_time, args.repeat)
+    print(f"{'eager':>8}{baseline:>10.1f}{1.0:>10.2f}")
+    for workers in args.workers:
+        fn, params = make_step(args.features, args.hidden)
+        with DataParallel(fn, params, num_workers=workers) as dp:
+            opt = SGD(params, lr=1e-4)
+
+            def parallel():
+                dp.step(x)
+                opt.step()
+            rate = steps_per_second(parallel, args.min_time, args.repeat)
+        print(f"{workers:>8}{rate:>10.1f}{rate / baseline:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark for the DataLoader.
+Writes .npy shards to a temporary directory and iterates over them with a simulated
+training step, comparing loading in the calling thread against prefetching on worker threads.
+
+Run with: python benchmarks/bench_dataloader.py
+"""
+
+import argparse
+import pathlib
+import tempfile
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.data import DataLoader, NpyShardDataset
+
+
+def write_shards(directory: pathlib.Path, shards: int, rows: int, features: int) -> tuple[list, list]:
+    rng = np.random.default_rng(0)
+    xs, ys = [], []
+    for k in range(shards):
+        xs.append(directory / f"x{k}.npy")
+        ys.append(directory / f"y{k}.npy")
+        np.save(xs[-1], rng.standard_normal((rows, features), dtype=np.float32))
+        np.save(ys[-1], rng.integers(0, 10, rows))
+    return xs, ys
+
+
+def epoch(loader: DataLoader, weight: np.ndarray):
+    for x, _ in loader:
+        np.dot(x.data, weight)  # stands in for the training step
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--features", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--min-time", type=float, default=1.0, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples (epochs) per variant")
+    args = parser.parse_args()
+
+    weight = np.ones((args.features, 512), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as directory:
+        xs, ys = write_shards(pathlib.Path(directory), args.shards, args.rows, args.features)
+        dataset = NpyShardDataset(xs, ys)
+        print(f"{'workers':>8}{'epoch [s]':>12}{'samples/s':>14}")
+        for workers in args.workers:
+            loader = DataLoader(dataset, args.batch_size, shuffle=True, num_workers=workers, seed=0)
+            seconds = best_time(lambda: epoch(loader, weight), args.min_time, args.repeat)
+            loader.close()
+            print(f"{workers:>8}{seconds:>12.3f}{len(dataset) / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
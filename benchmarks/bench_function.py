@@ -0,0 +1,71 @@
+"""
+Benchmark for custom autograd Functions.
+Runs forward + backward of a deep chain of f(x) = c * x * x + x, once composed of builtin
+operations (every intermediate is kept for backward) and once as a Function that saves only
+its input and computes the gradient 2 * c * x + 1 in one backward call.
+Reports the bytes the graph keeps after forward, the peak traced memory and the step time.
+
+Run with: python benchmarks/bench_function.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.autograd import Function
+from mytorch.bench import best_time, peak_bytes
+from mytorch.memory import graph_stats
+from mytorch.tensor import Tensor
+
+C = 1e-3
+
+
+class Poly(Function):
+    @staticmethod
+    def forward(ctx, x):
+        ctx.save_for_backward(x)
+        return C * x * x + x
+
+    @staticmethod
+    def backward(ctx, grad):
+        x, = ctx.saved
+        return grad * (2 * C * x + 1)
+
+
+def builtin(x: Tensor) -> Tensor:
+    return x * x * C + x
+
+
+def forward(f, x: Tensor, depth: int) -> Tensor:
+    out = x
+    for _ in range(depth):
+        out = f(out)
+    return out
+
+
+def step(f, x: Tensor, depth: int):
+    out = forward(f, x, depth)
+    out.backward(Tensor(np.ones(out.dim), requires_grad=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=32)
+    parser.add_argument("--size", type=int, default=1 << 18)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    x = Tensor(np.random.default_rng(0).standard_normal(args.size) * 0.1)
+    print(f"{'variant':>10}{'graph [MiB]':>13}{'peak [MiB]':>12}{'step [ms]':>12}")
+    for name, f in (("builtin", builtin), ("Function", Poly.apply)):
+        saved = graph_stats(forward(f, x, args.depth))["saved_bytes"]
+        run = lambda: step(f, x, args.depth)
+        run()
+        peak = peak_bytes(run)
+        seconds = best_time(run, args.min_time, args.repeat)
+        print(f"{name:>10}{saved / 2**20:>13.1f}{peak / 2**20:>12.1f}{seconds * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
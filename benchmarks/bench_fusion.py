@@ -0,0 +1,56 @@
+"""
+Benchmark for the lazy expression mode.
+Compares eager and fused evaluation of a*b + c*d + e (forward and backward)
+in wall time and peak traced memory.
+
+Run with: python benchmarks/bench_fusion.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor, lazy
+
+
+def expression(a, b, c, d, e):
+    return a*b + c*d + e
+
+
+def make_run(n: int, fused: bool, backward: bool) -> callable:
+    operands = [Tensor(np.ones((n, 256)), requires_grad=backward) for _ in range(5)]
+    grad_out = Tensor(np.ones((n, 256)), requires_grad=False)
+
+    def run():
+        if fused:
+            with lazy():
+                r = expression(*operands).materialize()
+        else:
+            r = expression(*operands)
+        if backward:
+            r.backward(grad_out)
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1024, 8192, 32768])
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'pass':>10}{'mode':>8}{'time [ms]':>12}{'peak [MiB]':>12}")
+    for n in args.rows:
+        for backward in (False, True):
+            for fused in (False, True):
+                run = make_run(n, fused, backward)
+                peak = peak_bytes(run)
+                t = best_time(run, args.min_time, args.repeat)
+                mode = "fused" if fused else "eager"
+                name = "fwd+bwd" if backward else "fwd"
+                print(f"{n:>8}{name:>10}{mode:>8}{t * 1e3:>12.2f}{peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
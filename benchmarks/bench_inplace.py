@@ -0,0 +1,58 @@
+"""
+Benchmark for in-place tensor operations.
+Runs a chain of scale-and-shift steps (x * scale + shift) on a large tensor without grad,
+once with the out-of-place operators (a new array per operation) and once with *= and +=
+writing into the data of x (scale < 1, so x stays finite over repeated runs).
+Reports the time and the peak traced memory of each.
+
+Run with: python benchmarks/bench_inplace.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.autograd import no_grad
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor
+
+
+def out_of_place(x: Tensor, scale: Tensor, shift: Tensor, steps: int) -> Tensor:
+    for _ in range(steps):
+        x = x * scale + shift
+    return x
+
+
+def in_place(x: Tensor, scale: Tensor, shift: Tensor, steps: int) -> Tensor:
+    for _ in range(steps):
+        x *= scale
+        x += shift
+    return x
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--features", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=16)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    data = rng.standard_normal((args.rows, args.features), dtype=np.float32)
+    scale = Tensor(rng.random(args.features, dtype=np.float32) * 0.5 + 0.25, requires_grad=False)
+    shift = Tensor(rng.standard_normal(args.features, dtype=np.float32), requires_grad=False)
+    print(f"{'variant':>14}{'peak [MiB]':>12}{'time [ms]':>12}")
+    with no_grad():
+        for name, fn in (("out-of-place", out_of_place), ("in-place", in_place)):
+            x = Tensor(data.copy(), requires_grad=False)
+            run = lambda: fn(x, scale, shift, args.steps)
+            run()
+            peak = peak_bytes(run)
+            seconds = best_time(run, args.min_time, args.repeat)
+            print(f"{name:>14}{peak / 2**20:>12.1f}{seconds * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark for the memory footprint of graph construction.
+Builds chains of small tensors and reports the bytes held per graph node
+(Tensor + GradOperation + result array) and the graph construction rate.
+
+Run with: python benchmarks/bench_memory.py
+"""
+
+import argparse
+import sys
+
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor
+
+
+def build_chain(n: int, size: int) -> Tensor:
+    a = Tensor([1.0] * size)
+    c = Tensor([1.0] * size, requires_grad=False)
+    r = a
+    for i in range(n):
+        r = r * c if i % 2 else r + c
+    return r
+
+
+def bytes_per_node(n: int, size: int) -> float:
+    # the chain only grows while it is built, so the peak is the memory of the whole graph
+    return peak_bytes(lambda: build_chain(n, size)) / n
+
+
+def ops_per_second(n: int, size: int, min_time: float, repeat: int) -> float:
+    return n / best_time(lambda: build_chain(n, size), min_time, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each size")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing samples per size")
+    args = parser.parse_args()
+
+    t = Tensor([1.0])
+    print(f"sys.getsizeof(Tensor): {sys.getsizeof(t)} bytes, has __dict__: {hasattr(t, '__dict__')}")
+    print(f"{'elements':>10}{'bytes/node':>14}{'ops/sec':>14}")
+    for size in args.sizes:
+        b = bytes_per_node(args.nodes, size)
+        ops = ops_per_second(args.nodes, size, args.min_time, args.repeat)
+        print(f"{size:>10}{b:>14.1f}{ops:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark for out-of-core tensor multiplication.
+Projects a memory-mapped feature matrix (rows x features, float32, on disk) onto a dense
+weight matrix with tmult, once in memory (the whole operand and result resident) and once
+blocked with different memory budgets and worker threads. Reports the time and the peak
+traced (anonymous) memory of each; pages of the mapping itself are only cached by the OS.
+
+Run with: python benchmarks/bench_out_of_core.py
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from mytorch.autograd import no_grad
+from mytorch.bench import best_time, peak_bytes
+from mytorch.tensor import Tensor, tmult
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--features", type=int, default=512)
+    parser.add_argument("--out", type=int, default=64)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[4, 16, 64], help="memory budgets in MiB")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "features")
+        features = np.memmap(path, dtype=np.float32, mode="w+", shape=(args.rows, args.features))
+        for start in range(0, args.rows, 8192):
+            features[start:start + 8192] = rng.standard_normal((min(8192, args.rows - start), args.features), dtype=np.float32)
+        features.flush()
+        x = Tensor(np.memmap(path, dtype=np.float32, mode="r", shape=(args.rows, args.features)), requires_grad=False)
+        weight = Tensor(rng.standard_normal((args.features, args.out), dtype=np.float32), requires_grad=False)
+        dim_out = (args.rows, args.out)
+        print(f"operand {x.data.nbytes / 2**20:.0f} MiB, result {np.prod(dim_out) * 4 / 2**20:.0f} MiB")
+        print(f"{'variant':>20}{'peak [MiB]':>12}{'time [ms]':>12}")
+
+        def in_memory():
+            tmult(Tensor(np.array(x.data), requires_grad=False), weight, ([1], [0]), dim_out)
+
+        runs = [("in memory", in_memory)]
+        for budget in args.budgets:
+            for workers in args.workers:
+                run = lambda budget=budget, workers=workers: tmult(x, weight, ([1], [0]), dim_out,
+                                                                   memory_budget=budget * 2**20, num_workers=workers)
+                runs.append((f"{budget} MiB, {workers} thr", run))
+        with no_grad():
+            for name, run in runs:
+                run()
+                peak = peak_bytes(run)
+                seconds = best_time(run, args.min_time, args.repeat)
+                print(f"{name:>20}{peak / 2**20:>12.1f}{seconds * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark for the buffer pool.
+Runs a steady-state training step (forward + backward) with and without
+mytorch.memory.buffer_pool() and reports the time per step and the pool statistics.
+
+Run with: python benchmarks/bench_pool.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.tensor import Tensor, tmult
+from mytorch.memory import buffer_pool
+
+
+def step(x: Tensor, w: Tensor, b: Tensor, grad_out: Tensor):
+    h = tmult(x, w, axes=([1], [0]), dim_out=(x.dim[0], w.dim[1])) + b
+    r = h * h + h
+    r.backward(grad_out)
+
+
+def run(n: int, pooled: bool, min_time: float, repeat: int) -> tuple[float, dict | None]:
+    rng = np.random.default_rng(0)
+    x = Tensor(rng.standard_normal((n, 256)), requires_grad=False)
+    w = Tensor(rng.standard_normal((256, 256)))
+    b = Tensor(rng.standard_normal(256))
+    grad_out = Tensor(np.ones((n, 256)), requires_grad=False)
+    if pooled:
+        with buffer_pool() as pool:
+            step(x, w, b, grad_out)  # warm up
+            return best_time(lambda: step(x, w, b, grad_out), min_time, repeat), pool.stats()
+    step(x, w, b, grad_out)
+    return best_time(lambda: step(x, w, b, grad_out), min_time, repeat), None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[64, 1024, 8192])
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'plain [ms]':>12}{'pooled [ms]':>13}  pool stats")
+    for n in args.rows:
+        plain, _ = run(n, False, args.min_time, args.repeat)
+        pooled, stats = run(n, True, args.min_time, args.repeat)
+        print(f"{n:>8}{plain * 1e3:>12.2f}{pooled * 1e3:>13.2f}  {stats}")
+
+
+if __name__ == "__main__":
+    main()
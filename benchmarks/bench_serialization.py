@@ -0,0 +1,55 @@
+"""
+Benchmark for saving and loading checkpoints.
+Compares pickle against mytorch.save/mytorch.load with and without mmap
+for a state dict of many float32 parameters.
+
+Run with: python benchmarks/bench_serialization.py
+"""
+
+import argparse
+import pathlib
+import pickle
+import tempfile
+
+import numpy as np
+
+import mytorch
+from mytorch.bench import best_time
+from mytorch.tensor import Tensor
+
+
+def pickle_save(state: dict, path: pathlib.Path):
+    with open(path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def pickle_load(path: pathlib.Path) -> dict:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=256)
+    parser.add_argument("--params", type=int, default=200)
+    parser.add_argument("--min-time", type=float, default=1.0, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    size = args.megabytes * 2**20 // (4 * args.params)
+    state = {f"layer{i}.weight": Tensor(np.full(size, i, dtype=np.float32)) for i in range(args.params)}
+    with tempfile.TemporaryDirectory() as directory:
+        directory = pathlib.Path(directory)
+        print(f"{'format':>14}{'save [s]':>10}{'load [s]':>10}")
+        seconds = best_time(lambda: pickle_save({k: v.data for k, v in state.items()}, directory / "state.pkl"), args.min_time, args.repeat)
+        load = best_time(lambda: pickle_load(directory / "state.pkl"), args.min_time, args.repeat)
+        print(f"{'pickle':>14}{seconds:>10.3f}{load:>10.3f}")
+        seconds = best_time(lambda: mytorch.save(state, directory / "state.mt"), args.min_time, args.repeat)
+        load = best_time(lambda: mytorch.load(directory / "state.mt"), args.min_time, args.repeat)
+        print(f"{'mytorch':>14}{seconds:>10.3f}{load:>10.3f}")
+        load = best_time(lambda: mytorch.load(directory / "state.mt", mmap=True), args.min_time, args.repeat)
+        print(f"{'mytorch mmap':>14}{'':>10}{load:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark for the SGD optimizer.
+Compares the flat-buffer SGD step against a per-parameter python loop
+on models made of thousands of small parameters.
+
+Run with: python benchmarks/bench_sgd.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.tensor import Tensor
+from mytorch.optim import SGD
+
+
+def per_parameter_step(params: list, bufs: list, lr: float, momentum: float, weight_decay: float):
+    for i, p in enumerate(params):
+        d_p = p.grad.data + weight_decay * p.data
+        bufs[i] *= momentum
+        bufs[i] += d_p
+        p.data -= lr * bufs[i]
+
+
+def make_params(n: int, size: int) -> list:
+    params = [Tensor(np.ones(size)) for _ in range(n)]
+    for p in params:
+        p.backward(Tensor(np.ones(size), requires_grad=False))
+    return params
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--params", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=10, help="number of timing samples per variant")
+    args = parser.parse_args()
+
+    print(f"{'params':>8}{'loop [ms]':>12}{'flat [ms]':>12}{'speedup':>10}")
+    for n in args.params:
+        params = make_params(n, args.size)
+        bufs = [np.zeros(args.size) for _ in params]
+        loop = best_time(lambda: per_parameter_step(params, bufs, 0.01, 0.9, 1e-4), args.min_time, args.repeat)
+
+        opt = SGD(make_params(n, args.size), lr=0.01, momentum=0.9, weight_decay=1e-4)
+        flat = best_time(opt.step, args.min_time, args.repeat)
+        print(f"{n:>8}{loop * 1e3:>12.2f}{flat * 1e3:>12.2f}{loop / flat:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for sparse tensors.
+Compares forward + backward of a sparse feature matrix times a dense weight matrix
+(SparseTensor vs. the dense tensor with all its zeros) and an SGD step on an embedding
+table looked up through a sparse matrix (row sparse vs. dense gradient).
+
+Run with: python benchmarks/bench_sparse.py
+"""
+
+import argparse
+
+import numpy as np
+
+from mytorch.bench import best_time
+from mytorch.optim import SGD
+from mytorch.tensor import Tensor, SparseTensor, tmult
+
+
+def matmul_step(x, weight: Tensor, dim_out: tuple):
+    weight.grad = None
+    out = tmult(x, weight, ([1], [0]), dim_out)
+    out.backward(Tensor(np.ones(dim_out, dtype=out.data.dtype), requires_grad=False))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1024)
+    parser.add_argument("--features", type=int, default=20_000)
+    parser.add_argument("--out", type=int, default=64)
+    parser.add_argument("--density", type=float, nargs="+", default=[0.001, 0.01, 0.05])
+    parser.add_argument("--vocab", type=int, default=200_000)
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each variant")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timing samples per variant")
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    weight = Tensor(rng.standard_normal((args.features, args.out), dtype=np.float32))
+    print(f"{'density':>8}{'dense [ms]':>12}{'sparse [ms]':>13}{'speedup':>10}")
+    for density in args.density:
+        dense = rng.standard_normal((args.rows, args.features), dtype=np.float32)
+        dense *= rng.random((args.rows, args.features), dtype=np.float32) < density
+        sparse = SparseTensor.from_dense(dense, requires_grad=False)
+        x = Tensor(dense, requires_grad=False)
+        dim_out = (args.rows, args.out)
+        dense_time = best_time(lambda: matmul_step(x, weight, dim_out), args.min_time, args.repeat)
+        sparse_time = best_time(lambda: matmul_step(sparse, weight, dim_out), args.min_time, args.repeat)
+        print(f"{density:>8}{dense_time * 1e3:>12.2f}{sparse_time * 1e3:>13.2f}{dense_time / sparse_time:>10.1f}")
+
+    # embedding lookup of a batch of token ids, one SGD step
+    ids = rng.integers(0, args.vocab, args.rows)
+    lookup = SparseTensor.from_coo(np.arange(args.rows), ids, Tensor(np.ones(args.rows, dtype=np.float32), requires_grad=False),
+                                   (args.rows, args.vocab))
+    print(f"\n{'embedding':>10}{'step [ms]':>12}")
+    for name, sparse_params in (("dense", False), ("sparse", True)):
+        table = Tensor(rng.standard_normal((args.vocab, args.out), dtype=np.float32))
+        opt = SGD([table], lr=0.1, sparse_params=[table] if sparse_params else ())
+
+        def step():
+            opt.zero_grad()
+            tmult(lookup, table, ([1], [0]), (args.rows, args.out)).backward(
+                Tensor(np.ones((args.rows, args.out), dtype=np.float32), requires_grad=False))
+            opt.step()
+        print(f"{name:>10}{best_time(step, args.min_time, args.repeat) * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
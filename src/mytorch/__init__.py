@@ -2,6 +2,12 @@
 
 from .core import version
 
-from .tensor import Tensor, tmult
+from .tensor import Tensor, SparseTensor, tmult, einsum, lazy, LazyTensor, get_default_dtype, set_default_dtype
+from .autograd import no_grad, enable_grad, inference_mode, is_grad_enabled
+from .jit import capture
+from .amp import autocast
+from .serialization import save, load
 
-__all__ = [version, Tensor, tmult]
+compile = capture
+
+__all__ = [version, Tensor, SparseTensor, tmult, einsum, lazy, LazyTensor, get_default_dtype, set_default_dtype, no_grad, enable_grad, inference_mode, is_grad_enabled, capture, compile, autocast, save, load]
@@ -0,0 +1,8 @@
+"""
+Package for mixed precision training.
+"""
+
+from .autocast_mode import autocast
+from .grad_scaler import GradScaler
+
+__all__ = [autocast, GradScaler]
@@ -0,0 +1,49 @@
+"""
+Implements the autocast mode for the MyTorch library.
+Inside autocast() the floating point results of element-wise operations, tmult, einsum and
+Linear are stored in a reduced precision dtype (float16 by default), halving the memory held by
+activations. Results are computed in the dtype of the operands first: numpy has no fast float16
+arithmetic, so matmuls still go through float32 BLAS. Weights stay float32 and gradients are
+propagated and accumulated in float32.
+"""
+
+import functools
+
+import numpy as np
+
+from mytorch.tensor.dtype import _autocast
+
+
+class autocast:
+    """
+    Enables the autocast mode.
+    Can be used as context manager or as function decorator.
+
+    :param dtype: reduced precision floating point dtype
+    :type dtype: np.dtype
+    :param enabled: whether autocast is enabled (False disables it inside an autocast region)
+    :type enabled: bool
+    """
+    def __init__(self, dtype=np.float16, enabled: bool = True):
+        dtype = np.dtype(dtype)
+        if dtype.kind != "f":
+            raise TypeError("autocast dtype must be a floating point dtype", dtype)
+        self.dtype = dtype
+        self.enabled = enabled
+        self._prev = []
+
+    def __enter__(self):
+        self._prev.append(_autocast.dtype)
+        _autocast.dtype = self.dtype if self.enabled else None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _autocast.dtype = self._prev.pop()
+        return False
+
+    def __call__(self, func: callable) -> callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with autocast(self.dtype, self.enabled):
+                return func(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,109 @@
+"""
+Implements dynamic loss scaling for the MyTorch library.
+Small gradients underflow in float16; scaling the loss before backward moves them into the
+representable range. Gradients are unscaled before the optimizer step, and steps whose
+gradients overflowed are skipped while the scale is reduced.
+"""
+
+import numpy as np
+
+from mytorch.optim import SGD
+from mytorch.tensor import Tensor, RowSparseTensor
+
+from .autocast_mode import autocast
+
+
+class GradScaler:
+    """
+    Dynamic loss scaler.
+    Usage per step: scaler.scale(loss).backward(...), scaler.step(optimizer), scaler.update().
+    The scale is multiplied by backoff_factor after a step with inf/nan gradients and by
+    growth_factor after growth_interval consecutive steps without.
+    """
+    def __init__(self, init_scale: float = 2.0**16, growth_factor: float = 2.0, backoff_factor: float = 0.5,
+                 growth_interval: int = 2000, enabled: bool = True):
+        if init_scale <= 0.0:
+            raise ValueError("invalid initial scale:", init_scale)
+        if growth_factor <= 1.0:
+            raise ValueError("invalid growth factor:", growth_factor)
+        if not 0.0 < backoff_factor < 1.0:
+            raise ValueError("invalid backoff factor:", backoff_factor)
+        if growth_interval < 1:
+            raise ValueError("invalid growth interval:", growth_interval)
+        self.scale_factor = init_scale
+        self.growth_factor = growth_factor
+        self.backoff_factor = backoff_factor
+        self.growth_interval = growth_interval
+        self.enabled = enabled
+        self._growth_tracker = 0
+        self._unscaled = False
+        self._found_inf = False
+
+    def scale(self, loss: Tensor) -> Tensor:
+        """
+        Returns loss multiplied by the current scale (in at least float32, outside of autocast).
+
+        :param loss: loss tensor
+        :type loss: Tensor
+        """
+        if not self.enabled:
+            return loss
+        with autocast(enabled=False):
+            if loss.data.dtype.kind == "f" and loss.data.dtype.itemsize < 4:
+                loss = loss.to(np.float32)
+            return loss * self.scale_factor
+
+    @staticmethod
+    def _grads(optimizer) -> list:
+        if isinstance(optimizer, SGD):
+            optimizer._check_views()
+            sparse = [optimizer.params[i].grad for i in optimizer._sparse if optimizer.params[i].grad is not None]
+            return [group.flat_grad for group in optimizer.groups] + [g.values if isinstance(g, RowSparseTensor) else g.data for g in sparse]
+        return [p.grad.values if isinstance(p.grad, RowSparseTensor) else p.grad.data for p in optimizer.params if p.grad is not None]
+
+    def unscale_(self, optimizer):
+        """
+        Divides the gradients of the optimizer's parameters by the scale in place
+        and checks them for inf/nan. Called by step() if not called before.
+        """
+        if not self.enabled or self._unscaled:
+            return
+        inv_scale = 1.0 / self.scale_factor
+        found_inf = False
+        for grad in self._grads(optimizer):
+            np.multiply(grad, inv_scale, out=grad)
+            found_inf = found_inf or not np.isfinite(grad).all()
+        self._found_inf = found_inf
+        self._unscaled = True
+
+    def step(self, optimizer) -> bool:
+        """
+        Unscales the gradients and performs optimizer.step() unless they contain inf/nan.
+        Returns whether the step was taken.
+        """
+        if not self.enabled:
+            optimizer.step()
+            return True
+        self.unscale_(optimizer)
+        if self._found_inf:
+            return False
+        optimizer.step()
+        return True
+
+    def update(self):
+        """Updates the scale after a step."""
+        if not self.enabled:
+            return
+        if self._found_inf:
+            self.scale_factor *= self.backoff_factor
+            self._growth_tracker = 0
+        else:
+            self._growth_tracker += 1
+            if self._growth_tracker == self.growth_interval:
+                self.scale_factor *= self.growth_factor
+                self._growth_tracker = 0
+        self._unscaled = False
+        self._found_inf = False
+
+    def get_scale(self) -> float:
+        return self.scale_factor if self.enabled else 1.0
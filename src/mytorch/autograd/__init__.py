@@ -2,6 +2,9 @@
 Package for autograd-related things.
 """
 
-from .grad_operation import GradOperation
+from .grad_operation import GradOperation, JointGradOperation
+from .engine import backward
+from .function import Function, FunctionCtx
+from .grad_mode import no_grad, enable_grad, inference_mode, is_grad_enabled, is_inference_mode_enabled
 
-__all__ = [GradOperation]
+__all__ = [GradOperation, JointGradOperation, backward, Function, FunctionCtx, no_grad, enable_grad, inference_mode, is_grad_enabled, is_inference_mode_enabled]
@@ -0,0 +1,126 @@
+"""
+Implements the backward engine for the MyTorch library.
+The graph reachable from the root tensor is topologically sorted once,
+incoming gradients are summed per tensor and every GradOperation is visited exactly once.
+Gradients are passed around as raw numpy arrays; leaves accumulate them in place on arrival.
+Unless the graph is retained, every GradOperation drops its operands as soon as it has been
+visited, so activations are freed during the backward pass instead of when the output dies.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from mytorch.memory import pool as _memory_pool
+
+from .grad_operation import FREED_GRAPH_MESSAGE
+from mytorch.profiler import profiler as _profiler
+
+
+def _topological_order(root) -> list:
+    """
+    Returns the GradOperations of all non-leaf tensors that require grad and are reachable from root,
+    ordered so that every GradOperation comes before those of its operands (root first).
+    Edges are the operand_ops recorded with each GradOperation, tensors sharing one (see autograd.function)
+    are one node.
+    Iterative depth-first search, so deep graphs do not hit the recursion limit.
+    """
+    order = []
+    visited = set()
+    stack = [(root.grad_op, False)]
+    while stack:
+        op, expanded = stack.pop()
+        if expanded:
+            order.append(op)
+            continue
+        if id(op) in visited:
+            continue
+        visited.add(id(op))
+        if op.operands is None:
+            raise RuntimeError(FREED_GRAPH_MESSAGE)
+        stack.append((op, True))
+        for operand, operand_op in zip(op.operands, op.operand_ops):
+            if operand_op is not None and operand.requires_grad and id(operand_op) not in visited:
+                stack.append((operand_op, False))
+    order.reverse()
+    return order
+
+
+def backward(root, grad: np.ndarray, order: list = None, retain_graph: bool = False):
+    """
+    Propagates grad from root through the graph and accumulates it into the leaves.
+
+    :param root: tensor to start the backward pass from
+    :type root: Tensor
+    :param grad: gradient of the root (same shape as root)
+    :type grad: np.ndarray
+    :param order: precomputed _topological_order(root), reused by replayed graphs
+    :type order: list
+    :param retain_graph: whether the graph is kept for another backward pass (otherwise its operands are released)
+    :type retain_graph: bool
+    """
+    if not root.requires_grad:
+        return
+    if root.grad_op is None:
+        root._accumulate_grad(grad)
+        return
+    pool = _memory_pool._active
+    prof = _profiler._active
+    if prof is not None:
+        prof_start = time.perf_counter_ns()
+    # id of grad_op -> (summed gradient, whether the array is owned by the engine and may be updated in place)
+    grads = {id(root.grad_op): (grad, False)}
+    owned = order is None
+    if owned:
+        order = _topological_order(root)
+    elif any(op.operands is None for op in order):
+        raise RuntimeError(FREED_GRAPH_MESSAGE)
+    for position, op in enumerate(order):
+        if owned:
+            order[position] = None  # the node is released once nothing else references it
+        entry = grads.pop(id(op), None)
+        if entry is None:
+            if not retain_graph:
+                op.release()
+            continue
+        node_grad = entry[0]
+        del entry
+        operand_grads = op.backward(node_grad) if prof is None else prof.backward_step(op, node_grad)
+        operand_grad = None
+        operand_ops = op.operand_ops
+        for index, operand in enumerate(op.operands):
+            operand_grad = operand_grads[index]
+            if operand_grad is None:
+                continue
+            operand_grads[index] = None
+            operand_op = operand_ops[index]
+            if operand_op is None:
+                # leaf node (unless it was a constant when it was used and got a history in place since)
+                if operand.grad_op is None:
+                    operand._accumulate_grad(operand_grad)
+            else:
+                key = id(operand_op)
+                summed = grads.get(key)
+                if summed is None:
+                    grads[key] = (operand_grad, False)
+                    continue
+                if summed[1]:
+                    np.add(summed[0], operand_grad, out=summed[0])
+                elif pool is None:
+                    grads[key] = (summed[0] + operand_grad, True)
+                else:
+                    out = pool.empty(summed[0].shape, np.result_type(summed[0], operand_grad))
+                    grads[key] = (np.add(summed[0], operand_grad, out=out), True)
+                    del out
+                del summed
+            # hand consumed gradient buffers back to the pool (local variable + argument)
+            if pool is not None and sys.getrefcount(operand_grad) == 2:
+                pool.release(operand_grad)
+        del operand_grads, operand_grad
+        if not retain_graph:
+            op.release()
+        if pool is not None and sys.getrefcount(node_grad) == 2:
+            pool.release(node_grad)
+    if prof is not None:
+        prof.record("backward", "engine", prof_start, [list(grad.shape)])
@@ -0,0 +1,159 @@
+"""
+Implements custom autograd functions for the MyTorch library.
+A Function defines forward and backward on numpy arrays; forward saves exactly the state its
+backward needs on the context (arrays, shapes, scalars) and backward returns the gradients of
+all inputs in one call, so shared intermediate results are computed once.
+The graph node of a Function keeps only that state: inputs that are results of other operations
+are linked through stand-ins without data, so their arrays are freed unless they were saved.
+Builtin operations (Tensor.__add__, __mul__, ...) keep their operand tensors themselves in
+grad_op.operands, which is part of their graph API; a Function is the way to record an
+operation with less saved state.
+"""
+
+import functools
+
+import numpy as np
+
+from .grad_operation import JointGradOperation
+
+
+class FunctionCtx:
+    """
+    Context of one Function application, passed to forward and backward.
+    needs_input_grad tells per input whether its gradient is needed (False for non-tensor inputs).
+    """
+    __slots__ = ("saved", "needs_input_grad")
+
+    def __init__(self, needs_input_grad: tuple):
+        self.saved = ()
+        self.needs_input_grad = needs_input_grad
+
+    def save_for_backward(self, *values):
+        """Keeps values (arrays, shapes, scalars) for backward, available as ctx.saved."""
+        self.saved = values
+
+
+class _FunctionGradOperation(JointGradOperation):
+    """
+    GradOperation of a Function, keeps its context alive until backward.
+    """
+    __slots__ = ("ctx",)
+
+    def __init__(self, op_name: str, backward_fn: callable, operands: list, ctx: FunctionCtx):
+        super().__init__(op_name, backward_fn, operands)
+        self.ctx = ctx
+
+    def release(self):
+        super().release()
+        self.ctx = None
+
+
+def _edge(t):
+    """
+    Graph operand standing in for t: leaves requiring grad are kept (they accumulate the gradient),
+    any other tensor is replaced by a data-less tensor sharing its grad_op (and version counter).
+    """
+    if t.requires_grad and t.grad_op is None:
+        return t
+    edge = type(t).__new__(type(t))
+    edge.data = None
+    edge.requires_grad = t.requires_grad
+    edge._grad = None
+    edge.grad_op = t.grad_op
+    edge._is_inference = t._is_inference
+    edge._pool = None
+    edge._version_counter = t._shared_version()
+    edge.sparse_grad = False
+    return edge
+
+
+def _function_backward(fn: type, ctx: FunctionCtx, positions: tuple, shapes: tuple, grad, operands) -> list:
+    grads = fn.backward(ctx, grad)
+    if not isinstance(grads, tuple):
+        grads = (grads,)
+    if len(grads) != len(ctx.needs_input_grad):
+        raise ValueError(fn.__name__ + ".backward returned", len(grads), "gradients, expected", len(ctx.needs_input_grad))
+    result = []
+    for position, shape, operand in zip(positions, shapes, operands):
+        g = grads[position]
+        if g is None or not operand.requires_grad:
+            result.append(None)
+            continue
+        g = np.asarray(g)
+        if g.shape != shape:
+            raise ValueError(fn.__name__ + ".backward returned gradient of shape", g.shape, "for input", position,
+                             "of shape", shape)
+        result.append(g)
+    return result
+
+
+def _function_kernel(fn: type, ctx: FunctionCtx, args: tuple, positions: tuple, *arrays, out):
+    """Recomputes the result in place for graph capture (refreshing the saved state of ctx)."""
+    args = list(args)
+    for position, array in zip(positions, arrays):
+        args[position] = array
+    np.copyto(out, fn.forward(ctx, *args))
+
+
+class Function:
+    """
+    Base class of custom differentiable operations, used through apply():
+
+        class Square(Function):
+            @staticmethod
+            def forward(ctx, x):
+                ctx.save_for_backward(x)
+                return x * x
+
+            @staticmethod
+            def backward(ctx, grad):
+                x, = ctx.saved
+                return 2 * x * grad
+
+        y = Square.apply(x)
+
+    forward receives the inputs with tensors replaced by their numpy arrays and returns the result array.
+    backward receives the gradient of the result and returns one gradient per forward input
+    (a tuple if there is more than one), None where no gradient is needed (see ctx.needs_input_grad).
+    Only what forward saves on ctx is kept for backward.
+    """
+
+    @staticmethod
+    def forward(ctx: FunctionCtx, *args) -> np.ndarray:
+        raise NotImplementedError()
+
+    @staticmethod
+    def backward(ctx: FunctionCtx, grad: np.ndarray):
+        raise NotImplementedError()
+
+    @classmethod
+    def apply(cls, *args):
+        """
+        Runs forward on args and records the operation for backward.
+
+        :param args: inputs of forward (tensors and other values)
+        """
+        from mytorch.profiler import profiler as _profiler
+        from mytorch.tensor import Tensor
+        from mytorch.tensor.fusion import _materialize
+        from mytorch.tensor.tensor import _vmap
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call(cls.__name__, cls.apply, *args)
+        args = tuple(_materialize(a) for a in args)
+        level = _vmap.level
+        if level is not None and any(level.is_batched(a) for a in args):
+            raise RuntimeError("Function", cls.__name__, "has no batching rule for vmap")
+        positions = tuple(i for i, a in enumerate(args) if isinstance(a, Tensor))
+        tensors = [args[i] for i in positions]
+        ctx = FunctionCtx(tuple(isinstance(a, Tensor) and a.requires_grad for a in args))
+        data = cls.forward(ctx, *(a.data if isinstance(a, Tensor) else a for a in args))
+        if not isinstance(data, np.ndarray):
+            data = np.asarray(data)
+        template = tuple(None if isinstance(a, Tensor) else a for a in args)
+        kernel = functools.partial(_function_kernel, cls, ctx, template, positions)
+        t = Tensor._from_op(data, cls.__name__, None, tensors, kernel)
+        if t.grad_op is not None:
+            backward_fn = functools.partial(_function_backward, cls, ctx, positions, tuple(x.data.shape for x in tensors))
+            t.grad_op = _FunctionGradOperation(cls.__name__, backward_fn, [_edge(x) for x in tensors], ctx)
+        return t
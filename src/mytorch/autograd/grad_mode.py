@@ -0,0 +1,92 @@
+"""
+Implements the grad mode contexts for the MyTorch library.
+Inside no_grad() and inference_mode() operations do not build a graph:
+their results have requires_grad == False and no grad_op, so the operands
+can be garbage collected right away.
+"""
+
+import functools
+import threading
+
+
+class _GradModeState(threading.local):
+    enabled = True
+    inference = False
+
+
+_state = _GradModeState()
+
+
+def is_grad_enabled() -> bool:
+    """Returns whether operations currently record GradOperations."""
+    return _state.enabled
+
+
+def is_inference_mode_enabled() -> bool:
+    """Returns whether inference_mode is currently active."""
+    return _state.inference
+
+
+class _GradModeContext:
+    """
+    Base class for grad mode contexts.
+    Can be used as context manager or as function decorator.
+    inference None leaves the inference flag as it is.
+    """
+    enabled = True
+    inference = None
+
+    def __init__(self):
+        self._prev = []
+
+    def __enter__(self):
+        self._prev.append((_state.enabled, _state.inference))
+        _state.enabled = self.enabled
+        if self.inference is not None:
+            _state.inference = self.inference
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _state.enabled, _state.inference = self._prev.pop()
+        return False
+
+    def __call__(self, func: callable) -> callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.__class__():
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class no_grad(_GradModeContext):
+    """
+    Disables graph construction.
+    Tensors created inside have requires_grad == False and no grad_op.
+    Inside inference_mode() the tensors stay inference tensors.
+    """
+    enabled = False
+
+
+class enable_grad(_GradModeContext):
+    """
+    Re-enables graph construction inside a no_grad() block.
+    Has no effect inside inference_mode().
+    """
+    enabled = True
+
+    def __enter__(self):
+        super().__enter__()
+        if _state.inference:
+            # inference mode cannot be left from the inside
+            _state.enabled = self._prev[-1][0]
+        return self
+
+
+class inference_mode(_GradModeContext):
+    """
+    Stricter version of no_grad().
+    Tensors created inside are marked as inference tensors and cannot be
+    recorded by operations that build a graph later on (raises RuntimeError).
+    """
+    enabled = False
+    inference = True
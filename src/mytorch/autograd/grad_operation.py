@@ -1,19 +1,79 @@
+FREED_GRAPH_MESSAGE = ("Trying to backward through the graph a second time (or to use its saved tensors after "
+                       "they were freed). Pass retain_graph=True to the first backward call to keep the graph.")
+MODIFIED_MESSAGE = "One of the tensors needed for gradient computation has been modified by an in-place operation:"
+
+
 class GradOperation:
-    def __init__(self, op_name: str, backward_fn: callable, operands: list):
+    """
+    Records the operation that created a tensor.
+    backward_fn(grad, operands, index) returns the gradient with respect to operands[index]
+    given the gradient of the result (all numpy arrays).
+    Unless the graph is retained, backward releases the operands after using them.
+    saved holds the indices of the operands whose data backward_fn reads (None: all of them);
+    their versions are recorded and backward raises if one of them was modified in place since.
+    The grad_ops of the operands are recorded as well (operand_ops): the gradient of an operand
+    that was modified in place afterwards still flows into the history it had when it was used.
+    """
+    __slots__ = ("op_name", "operands", "operand_ops", "backward_fn", "saved", "versions")
+
+    def __init__(self, op_name: str, backward_fn: callable, operands: list, saved: tuple = None):
         self.op_name = op_name
         self.operands = operands
+        self.operand_ops = [operand.grad_op for operand in operands]
         self.backward_fn = backward_fn
+        self.saved = range(len(operands)) if saved is None else saved
+        self.versions = None  # all saved operands at version 0
+        for index in self.saved:
+            if operands[index]._version_counter is not None:
+                self.versions = tuple(operands[i]._version for i in self.saved)
+                break
+
+    def check_operands(self):
+        """Raises if the operands were released or modified in place after the operation was recorded."""
+        if self.operands is None:
+            raise RuntimeError(FREED_GRAPH_MESSAGE)
+        versions = self.versions
+        for position, index in enumerate(self.saved):
+            counter = self.operands[index]._version_counter
+            version = 0 if versions is None else versions[position]
+            if counter is not None and counter.value != version:
+                raise RuntimeError(MODIFIED_MESSAGE, "operand", index, "of", self.op_name, "is at version",
+                                   counter.value, "but version", version, "was saved")
 
-    def backward(self, grad):
-        for operand in self.operands:
-            if operand.requires_grad:
-                operands_without_self = self.operands.copy()
-                operands_without_self.remove(operand)
-                new_grad = self.backward_fn(operand, operands_without_self)
-                operand.backward(new_grad * grad)
+    def backward(self, grad) -> list:
+        """
+        Computes the gradients for all operands of this operation (does not recurse).
+        Returns one entry per operand, None for operands that do not require grad.
+        """
+        self.check_operands()
+        grads = []
+        for index, operand in enumerate(self.operands):
+            if not operand.requires_grad:
+                grads.append(None)
+                continue
+            grads.append(self.backward_fn(grad, self.operands, index))
+        return grads
+
+    def release(self):
+        """Drops the saved operands and the backward function once the graph was backpropagated."""
+        self.operands = None
+        self.operand_ops = None
+        self.backward_fn = None
 
     def __str__(self):
         return "GradOperation(" + self.op_name + ", " + str(self.operands) + ")"
     
     def __repr__(self):
         return "GradOperation(" + self.op_name + ", " + repr(self.operands) + ")"
+
+
+class JointGradOperation(GradOperation):
+    """
+    GradOperation whose backward_fn(grad, operands) returns the gradients of all operands in one pass,
+    e.g. fused expressions, checkpointed segments and Functions.
+    """
+    __slots__ = ()
+
+    def backward(self, grad) -> list:
+        self.check_operands()
+        return self.backward_fn(grad, self.operands)
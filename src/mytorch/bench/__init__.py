@@ -0,0 +1,8 @@
+"""
+Package for the benchmark suite (run with python -m mytorch.bench).
+"""
+
+from .runner import Case, best_time, peak_bytes, run_case, run_suite
+from .cases import CASES
+
+__all__ = [Case, best_time, peak_bytes, run_case, run_suite, CASES]
@@ -0,0 +1,75 @@
+"""
+Command line entry point of the benchmark suite.
+
+Run with: python -m mytorch.bench [--filter add] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import sys
+
+from .cases import CASES
+from .runner import run_suite
+
+
+def _print_header():
+    print(f"{'case':<40}{'time':>12}{'ops/s':>14}{'numpy':>12}{'overhead/op':>14}{'peak':>12}{'vs base':>10}")
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m mytorch.bench", description="Benchmark suite of mytorch.")
+    parser.add_argument("--filter", default="", help="only run cases whose key contains this string")
+    parser.add_argument("--group", choices=sorted({case.group for case in CASES}), help="only run cases of this group")
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds spent timing each case")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing samples per case")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.filter in case.key and (args.group is None or case.group == args.group)]
+    if args.list:
+        for case in cases:
+            print(case.key)
+        return 0
+    base = {}
+    if args.compare:
+        with open(args.compare) as f:
+            base = {result["key"]: result for result in json.load(f)["results"]}
+
+    def report(result: dict):
+        overhead = result["overhead_per_op_us"]
+        ratio = "-"
+        if result["key"] in base:
+            ratio = f"{base[result['key']]['seconds'] / result['seconds']:.2f}x"
+        print(f"{result['key']:<40}{_format_time(result['seconds']):>12}{result['ops_per_second']:>14.3g}"
+              f"{_format_time(result['numpy_seconds']):>12}{'-' if overhead is None else f'{overhead:.2f} us':>14}"
+              f"{_format_bytes(result['peak_bytes']):>12}{ratio:>10}", flush=True)
+
+    _print_header()
+    run = run_suite(cases, args.min_time, args.repeat, report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
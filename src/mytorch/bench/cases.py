@@ -0,0 +1,102 @@
+"""
+Implements the benchmark cases for the MyTorch library:
+element-wise operators, tmult contraction patterns, graph construction and backward.
+"""
+
+import numpy as np
+
+from mytorch.tensor import Tensor, tmult
+
+from .runner import Case
+
+
+def _rng():
+    return np.random.default_rng(0)
+
+
+def _elementwise(op: str, size: int):
+    a = Tensor(_rng().standard_normal(size))
+    b = Tensor(_rng().standard_normal(size))
+    if op == "add":
+        return (lambda: a + b), (lambda: a.data + b.data), 1
+    return (lambda: a * b), (lambda: np.multiply(a.data, b.data)), 1
+
+
+# pattern -> (x shape, y shape, axes, output shape) for size n
+_TMULT_PATTERNS = {
+    "matmul": lambda n: ((n, n), (n, n), ([1], [0]), (n, n)),
+    "matvec": lambda n: ((n, n), (n,), ([1], [0]), (n,)),
+    "outer": lambda n: ((n,), (n,), ([], []), (n, n)),
+    "batched": lambda n: ((8, n, n), (n, 8, n), ([0, 2], [1, 0]), (n, n)),
+    "double": lambda n: ((n, n, 4), (4, n, n), ([2, 1], [0, 1]), (n, n)),
+}
+
+
+def _tmult(pattern: str, n: int):
+    x_shape, y_shape, axes, dim_out = _TMULT_PATTERNS[pattern](n)
+    x = Tensor(_rng().standard_normal(x_shape))
+    y = Tensor(_rng().standard_normal(y_shape))
+    return (lambda: tmult(x, y, axes, dim_out)), (lambda: np.tensordot(x.data, y.data, axes=axes)), 1
+
+
+def _chain(depth: int, size: int, backward: bool):
+    """x = x * c + c repeated depth times (2 * depth ops), optionally followed by backward."""
+    a = Tensor(np.ones(size))
+    c = Tensor(np.full(size, 0.5), requires_grad=False)
+    seed = Tensor(np.ones(size), requires_grad=False)
+
+    def fn():
+        x = a
+        for _ in range(depth):
+            x = x * c + c
+        if backward:
+            a.grad = None
+            x.backward(seed)
+
+    def baseline():
+        x = a.data
+        for _ in range(depth):
+            x = x * c.data + c.data
+        if backward:
+            g = seed.data
+            for _ in range(depth):
+                g = g * c.data
+            g.copy()
+
+    return fn, baseline, 2 * depth
+
+
+def _wide(width: int, size: int):
+    """Sum of width leaves followed by backward (width - 1 adds, width leaf gradients)."""
+    leaves = [Tensor(np.ones(size)) for _ in range(width)]
+    seed = Tensor(np.ones(size), requires_grad=False)
+
+    def fn():
+        x = leaves[0]
+        for leaf in leaves[1:]:
+            x = x + leaf
+        for leaf in leaves:
+            leaf.grad = None
+        x.backward(seed)
+
+    def baseline():
+        x = leaves[0].data
+        for leaf in leaves[1:]:
+            x = x + leaf.data
+        for _ in leaves:
+            seed.data.copy()
+
+    return fn, baseline, width - 1
+
+
+CASES = (
+    [Case("add", "ops", {"size": size}, lambda size: _elementwise("add", size)) for size in (1, 1_000, 1_000_000)]
+    + [Case("mul", "ops", {"size": size}, lambda size: _elementwise("mul", size)) for size in (1, 1_000, 1_000_000)]
+    + [Case("tmult", "tmult", {"pattern": pattern, "n": n}, _tmult)
+       for pattern in _TMULT_PATTERNS for n in (16, 128, 512)]
+    + [Case("graph", "autograd", {"depth": depth, "size": 16}, lambda depth, size: _chain(depth, size, False))
+       for depth in (100, 1_000)]
+    + [Case("backward-deep", "autograd", {"depth": depth, "size": 16}, lambda depth, size: _chain(depth, size, True))
+       for depth in (100, 1_000)]
+    + [Case("backward-wide", "autograd", {"width": width, "size": 16}, _wide) for width in (100, 1_000)]
+)
@@ -0,0 +1,134 @@
+"""
+Implements the benchmark runner for the MyTorch library.
+Every case is timed against an equivalent raw numpy baseline; the runner reports throughput,
+the per-op overhead of mytorch over numpy and the peak memory traced by tracemalloc.
+Only the standard library (and numpy) is used.
+"""
+
+import gc
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from mytorch.core import version
+
+
+class Case:
+    """
+    Benchmark case.
+    setup(**params) returns (fn, baseline, ops): fn runs the mytorch code once, baseline (or None)
+    runs equivalent numpy code once and ops is the number of tensor operations fn performs.
+    """
+    __slots__ = ("name", "group", "params", "setup")
+
+    def __init__(self, name: str, group: str, params: dict, setup: callable):
+        self.name = name
+        self.group = group
+        self.params = params
+        self.setup = setup
+
+    @property
+    def key(self) -> str:
+        """Unique name of the case including its parameters (used to compare runs)."""
+        return self.name + "[" + ",".join(str(k) + "=" + str(v) for k, v in self.params.items()) + "]"
+
+
+def best_time(fn: callable, min_time: float = 0.2, repeat: int = 5) -> float:
+    """
+    Returns the best time per call of fn (seconds) over repeat samples; the number of calls
+    per sample is calibrated like timeit.autorange so that all samples take about min_time.
+    Used by the runner and by the scripts in benchmarks/.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        number *= 10 if elapsed < min_time / (10 * repeat) else 2
+    best = elapsed / number
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best
+
+
+def peak_bytes(fn: callable) -> int:
+    """Returns the peak memory traced by tracemalloc during one call of fn (bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(case: Case, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Runs a case and returns its result record.
+
+    :param case: benchmark case
+    :type case: Case
+    :param min_time: approximate total time spent timing each of fn and baseline (seconds)
+    :type min_time: float
+    :param repeat: number of timing samples (the best one is reported)
+    :type repeat: int
+    """
+    fn, baseline, ops = case.setup(**case.params)
+    fn()  # warm up caches (plans, workspaces)
+    seconds = best_time(fn, min_time, repeat)
+    result = {
+        "key": case.key,
+        "name": case.name,
+        "group": case.group,
+        "params": case.params,
+        "ops": ops,
+        "seconds": seconds,
+        "ops_per_second": ops / seconds,
+        "peak_bytes": peak_bytes(fn),
+        "numpy_seconds": None,
+        "overhead_per_op_us": None,
+    }
+    if baseline is not None:
+        baseline()
+        numpy_seconds = best_time(baseline, min_time, repeat)
+        result["numpy_seconds"] = numpy_seconds
+        result["overhead_per_op_us"] = (seconds - numpy_seconds) / ops * 1e6
+    return result
+
+
+def run_suite(cases: list, min_time: float = 0.2, repeat: int = 5, report: callable = None) -> dict:
+    """
+    Runs all cases and returns the JSON-serializable results of the run.
+
+    :param report: called with every result record as soon as it is available
+    :type report: callable
+    """
+    results = []
+    for case in cases:
+        result = run_case(case, min_time, repeat)
+        results.append(result)
+        if report is not None:
+            report(result)
+    return {
+        "mytorch": version(),
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
@@ -0,0 +1,8 @@
+"""
+Package for data loading.
+"""
+
+from .dataset import Dataset, TensorDataset, NpyShardDataset
+from .dataloader import DataLoader
+
+__all__ = [Dataset, TensorDataset, NpyShardDataset, DataLoader]
@@ -0,0 +1,127 @@
+"""
+Implements the DataLoader for the MyTorch library.
+The DataLoader draws (shuffled) mini-batches of sample indices, fills preallocated batch
+buffers with the dataset's vectorized gather() and wraps them as tensors without a copy.
+Batches are prefetched on a thread pool, so disk reads and copies overlap with compute.
+"""
+
+import concurrent.futures
+import sys
+
+import numpy as np
+
+from mytorch.tensor import Tensor
+
+from .dataset import Dataset
+
+
+class DataLoader:
+    """
+    Iterates over a dataset in mini-batches; yields a tuple of tensors (one per field)
+    or a single tensor if the samples have one field.
+    Batch buffers are reused once the tensors of an earlier batch are no longer referenced.
+    The samples within a batch are ordered by index, so shards are read sequentially.
+
+    :param dataset: dataset to load from
+    :type dataset: Dataset
+    :param batch_size: number of samples per batch
+    :type batch_size: int
+    :param shuffle: whether the samples are reshuffled every epoch
+    :type shuffle: bool
+    :param drop_last: whether the last incomplete batch is dropped
+    :type drop_last: bool
+    :param num_workers: number of prefetch threads (0 loads batches in the calling thread)
+    :type num_workers: int
+    :param prefetch: number of batches loaded ahead per worker
+    :type prefetch: int
+    :param seed: seed of the shuffling generator
+    :type seed: int
+    """
+    def __init__(self, dataset: Dataset, batch_size: int = 1, shuffle: bool = False, drop_last: bool = False,
+                 num_workers: int = 0, prefetch: int = 2, seed: int = None):
+        if batch_size < 1:
+            raise ValueError("invalid batch size:", batch_size)
+        if num_workers < 0:
+            raise ValueError("invalid number of workers:", num_workers)
+        if prefetch < 1:
+            raise ValueError("invalid prefetch factor:", prefetch)
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_workers = num_workers
+        self.prefetch = prefetch
+        self.rng = np.random.default_rng(seed)
+        self.spec = dataset.sample_spec()
+        self._buffers = {}  # batch size -> list of buffer tuples
+        self._executor = None
+
+    def __len__(self) -> int:
+        n = len(self.dataset)
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def _batches(self) -> list:
+        n = len(self.dataset)
+        order = self.rng.permutation(n) if self.shuffle else np.arange(n)
+        stop = n - n % self.batch_size if self.drop_last else n
+        return [np.sort(order[start:start + self.batch_size]) for start in range(0, stop, self.batch_size)]
+
+    def _acquire(self, size: int) -> tuple:
+        """
+        Returns batch buffers for size samples, reusing buffers nothing else references anymore
+        (yielded tensors and batches in flight keep a reference).
+        """
+        buffers = self._buffers.setdefault(size, [])
+        for batch in buffers:
+            # references: buffer list (tuple) or tuple (buffers) + loop variable + getrefcount argument;
+            # batches in flight hold the tuple, yielded tensors the buffers
+            if sys.getrefcount(batch) == 3 and all(sys.getrefcount(buffer) == 3 for buffer in batch):
+                return batch
+        batch = tuple(np.empty((size,) + tuple(shape), dtype=dtype) for shape, dtype in self.spec)
+        buffers.append(batch)
+        return batch
+
+    def _load(self, indices: np.ndarray, out: tuple) -> tuple:
+        self.dataset.gather(indices, out)
+        return out
+
+    def _wrap(self, batch: tuple):
+        tensors = tuple(Tensor(buffer, requires_grad=False) for buffer in batch)
+        return tensors[0] if len(tensors) == 1 else tensors
+
+    def __iter__(self):
+        batches = self._batches()
+        if self.num_workers == 0:
+            for indices in batches:
+                batch = self._load(indices, self._acquire(len(indices)))
+                yield self._wrap(batch)
+                del batch
+            return
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self.num_workers, thread_name_prefix="mytorch-data")
+        pending = []
+        next_batch = 0
+        try:
+            while next_batch < len(batches) or pending:
+                while next_batch < len(batches) and len(pending) < self.num_workers * self.prefetch:
+                    indices = batches[next_batch]
+                    pending.append(self._executor.submit(self._load, indices, self._acquire(len(indices))))
+                    next_batch += 1
+                batch = pending.pop(0).result()
+                yield self._wrap(batch)
+                del batch
+        finally:
+            for future in pending:
+                future.cancel()
+            concurrent.futures.wait(pending)
+
+    def close(self):
+        """Shuts the prefetch threads down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __del__(self):
+        # __init__ may have raised before the executor attribute was set
+        if getattr(self, "_executor", None) is not None:
+            self.close()
@@ -0,0 +1,109 @@
+"""
+Implements datasets for the MyTorch library.
+A dataset is a sequence of samples, each a tuple of numpy arrays (one per field).
+Datasets that implement gather() fill a whole mini-batch with vectorized fancy indexing.
+"""
+
+import numpy as np
+
+
+class Dataset:
+    """
+    Base class for datasets.
+    Subclasses implement __len__() and __getitem__(index) returning a tuple of arrays.
+    """
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def __getitem__(self, index: int) -> tuple:
+        raise NotImplementedError()
+
+    def sample_spec(self) -> list:
+        """Returns (shape, dtype) of every field of a sample."""
+        return [(np.shape(field), np.asarray(field).dtype) for field in self[0]]
+
+    def gather(self, indices: np.ndarray, out: tuple):
+        """
+        Writes the samples at indices into the batch buffers out (one per field).
+        The default implementation copies sample by sample.
+
+        :param indices: sorted sample indices
+        :type indices: np.ndarray
+        :param out: batch buffers of shape (len(indices), *sample shape)
+        :type out: tuple[np.ndarray]
+        """
+        for row, index in enumerate(indices):
+            for buffer, field in zip(out, self[int(index)]):
+                buffer[row] = field
+
+
+class TensorDataset(Dataset):
+    """
+    Dataset over in-memory arrays of equal length (first axis indexes the samples).
+    """
+    def __init__(self, *arrays: np.ndarray):
+        if len(arrays) == 0:
+            raise ValueError("TensorDataset needs at least one array")
+        arrays = [np.asarray(a) for a in arrays]
+        for i, a in enumerate(arrays):
+            if a.ndim == 0 or len(a) != len(arrays[0]):
+                raise ValueError("array", i, "does not have", len(arrays[0]), "samples")
+        self.arrays = arrays
+
+    def __len__(self) -> int:
+        return len(self.arrays[0])
+
+    def __getitem__(self, index: int) -> tuple:
+        return tuple(a[index] for a in self.arrays)
+
+    def sample_spec(self) -> list:
+        return [(a.shape[1:], a.dtype) for a in self.arrays]
+
+    def gather(self, indices: np.ndarray, out: tuple):
+        # indices are in range; mode="clip" lets take write straight into out instead of a temporary
+        for buffer, a in zip(out, self.arrays):
+            np.take(a, indices, axis=0, out=buffer, mode="clip")
+
+
+class NpyShardDataset(Dataset):
+    """
+    Dataset over .npy shards that are memory-mapped (read-only) instead of loaded,
+    so datasets larger than RAM stream through the page cache.
+    Every field is given as a list of shard files; shard k of every field holds the same samples.
+    """
+    def __init__(self, *fields: list):
+        if len(fields) == 0:
+            raise ValueError("NpyShardDataset needs at least one field")
+        self.shards = [[np.load(path, mmap_mode="r") for path in paths] for paths in fields]
+        lengths = [len(shard) for shard in self.shards[0]]
+        for i, shards in enumerate(self.shards):
+            if [len(shard) for shard in shards] != lengths:
+                raise ValueError("shards of field", i, "do not match the shards of field 0 in length")
+            if any(shard.shape[1:] != shards[0].shape[1:] or shard.dtype != shards[0].dtype for shard in shards):
+                raise ValueError("shards of field", i, "differ in sample shape or dtype")
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def __getitem__(self, index: int) -> tuple:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sample index out of range", index)
+        k = int(np.searchsorted(self.offsets, index, side="right")) - 1
+        return tuple(shards[k][index - self.offsets[k]] for shards in self.shards)
+
+    def sample_spec(self) -> list:
+        return [(shards[0].shape[1:], shards[0].dtype) for shards in self.shards]
+
+    def gather(self, indices: np.ndarray, out: tuple):
+        # indices are sorted, so the samples of each shard form one contiguous run of the batch
+        bounds = np.searchsorted(indices, self.offsets)
+        for k in range(len(self.offsets) - 1):
+            start, stop = bounds[k], bounds[k + 1]
+            if start == stop:
+                continue
+            local = indices[start:stop] - self.offsets[k]
+            for buffer, shards in zip(out, self.shards):
+                np.take(shards[k], local, axis=0, out=buffer[start:stop], mode="clip")
@@ -0,0 +1,7 @@
+"""
+Package for function transforms.
+"""
+
+from .vmap import vmap, per_sample_grad
+
+__all__ = [vmap, per_sample_grad]
@@ -0,0 +1,243 @@
+"""
+Implements vectorizing maps (vmap) and per-sample gradients for the MyTorch library.
+A function written for a single sample runs once on the whole batch: tensors carrying the
+batch axis are tracked by a batching level, and every tensor operation maps its per-sample
+semantics to one operation on the batched data (elementwise operands are aligned behind the
+batch axis, contractions get the batch axis as an extra einsum index).
+The backward pass of the batched graph is an ordinary backward pass, so gradients of
+parameters broadcast along the batch axis come out per sample instead of summed.
+"""
+
+import functools
+import string
+
+import numpy as np
+
+from mytorch.autograd import enable_grad
+from mytorch.tensor import Tensor
+from mytorch.tensor.fusion import _materialize
+from mytorch.tensor.tensor import _vmap, _basic_index, _shape_arg
+from mytorch.tensor.tensor_mult import _tmult_plan, _einsum_plan, tmult, einsum
+
+
+class _BatchingLevel:
+    """
+    State of one vmap call: the batch size and the tensors whose data has a leading batch axis
+    (keyed by id, the level holds a reference so ids are not reused while it is active).
+    The tensor operations call the batching rules below while a level is active.
+    """
+    __slots__ = ("size", "batched")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.batched = {}
+
+    def is_batched(self, t) -> bool:
+        return isinstance(t, Tensor) and id(t) in self.batched
+
+    def mark(self, t: Tensor) -> Tensor:
+        self.batched[id(t)] = t
+        return t
+
+    def _call(self, op: callable, *args, batched: bool):
+        """Runs the unbatched op on the (physical) batched data and marks the result as batched."""
+        _vmap.level = None
+        try:
+            result = op(*args)
+        finally:
+            _vmap.level = self
+        if batched and isinstance(result, Tensor):
+            self.mark(result)
+        return result
+
+    def unary(self, op: callable, t: Tensor, *args) -> Tensor:
+        return self._call(op, t, *args, batched=self.is_batched(t))
+
+    def elementwise(self, op: callable, a: Tensor, b) -> Tensor:
+        b = a._wrap_operand(b)
+        if b is NotImplemented:
+            return NotImplemented
+        operands = [a, b]
+        flags = [self.is_batched(t) for t in operands]
+        if any(flags):
+            # align the per-sample shapes behind the batch axis: (B, 1, ..., 1, *sample shape)
+            ndim = max(t.data.ndim - flag for t, flag in zip(operands, flags))
+            for i, (t, flag) in enumerate(zip(operands, flags)):
+                if flag and t.data.ndim - 1 < ndim:
+                    shape = (self.size,) + (1,) * (ndim - t.data.ndim + 1) + t.data.shape[1:]
+                    operands[i] = self._call(Tensor.reshape, t, shape, batched=True)
+        return self._call(op, *operands, batched=any(flags))
+
+    def reshape(self, op: callable, t: Tensor, shape: tuple) -> Tensor:
+        if not self.is_batched(t):
+            return self._call(op, t, *shape, batched=False)
+        return self._call(op, t, (self.size,) + _shape_arg(shape), batched=True)
+
+    def permute(self, t: Tensor, dims: tuple) -> Tensor:
+        if not self.is_batched(t):
+            return self._call(Tensor.permute, t, *dims, batched=False)
+        dims = _shape_arg(dims)
+        ndim = t.data.ndim - 1
+        if len(dims) != ndim or any(not -ndim <= d < ndim for d in dims):
+            raise ValueError("Invalid permutation", dims, "for tensor of dim", t.dim)
+        return self._call(Tensor.permute, t, (0,) + tuple(d % ndim + 1 for d in dims), batched=True)
+
+    def getitem(self, t: Tensor, key) -> Tensor:
+        if not self.is_batched(t):
+            return self._call(Tensor.__getitem__, t, key, batched=False)
+        return self._call(Tensor.__getitem__, t, (slice(None),) + _basic_index(key), batched=True)
+
+    def tmult(self, x: Tensor, y: Tensor, axes: tuple, dim_out: tuple) -> Tensor:
+        x_batched, y_batched = self.is_batched(x), self.is_batched(y)
+        if not (x_batched or y_batched):
+            return self._call(tmult, x, y, axes, dim_out, batched=False)
+        if not isinstance(axes, tuple) or len(axes) != 2:
+            raise TypeError("axes given for tensor multiplication must be a tuple of two lists")
+        x_axes, y_axes = list(axes[0]), list(axes[1])
+        if not y_batched:
+            # the batch axis is a free axis of x: plain tensordot, already in front
+            return self._call(tmult, x, y, ([i + 1 for i in x_axes], y_axes), (self.size,) + tuple(dim_out), batched=True)
+        n_x_free = len(x.dim) - len(x_axes)
+        if not x_batched:
+            # the batch axis is the first free axis of y: tensordot, then move it to the front
+            dim_out = tuple(dim_out)
+            out = self._call(tmult, x, y, (x_axes, [i + 1 for i in y_axes]), dim_out[:n_x_free] + (self.size,) + dim_out[n_x_free:], batched=False)
+            order = (n_x_free,) + tuple(i for i in range(out.data.ndim) if i != n_x_free)
+            return self._call(Tensor.permute, out, order, batched=True)
+        # both batched: batched contraction as einsum with the batch axis as shared index
+        plan = _tmult_plan(x.dim, y.dim, tuple(x_axes), tuple(y_axes))
+        if plan.dim_out != tuple(dim_out):
+            raise ValueError("output of tensor multiplication is not of expected shape", dim_out, "but instead of shape", plan.dim_out)
+        letters = iter(string.ascii_letters[1:])
+        x_sub = [next(letters) for _ in x.dim]
+        y_sub = [next(letters) for _ in y.dim]
+        for i, j in zip(x_axes, y_axes):
+            y_sub[j] = x_sub[i]
+        out_sub = [c for i, c in enumerate(x_sub) if i not in x_axes] + [c for j, c in enumerate(y_sub) if j not in y_axes]
+        subscripts = "a" + "".join(x_sub) + ",a" + "".join(y_sub) + "->a" + "".join(out_sub)
+        return self._call(einsum, subscripts, x, y, batched=True)
+
+    def einsum(self, subscripts: str, operands: tuple) -> Tensor:
+        flags = [self.is_batched(operand) for operand in operands]
+        if not any(flags):
+            return self._call(einsum, subscripts, *operands, batched=False)
+        for i, operand in enumerate(operands):
+            if not isinstance(operand, Tensor):
+                raise TypeError("operand", i, "of einsum must be of type Tensor")
+        plan = _einsum_plan(subscripts, tuple(operand.dim for operand in operands))
+        batch = next(c for c in string.ascii_letters if c not in plan.sizes)
+        inputs = [batch + sub if flag else sub for sub, flag in zip(plan.inputs, flags)]
+        return self._call(einsum, ",".join(inputs) + "->" + batch + plan.output, *operands, batched=True)
+
+    def linear(self, module, x: Tensor) -> Tensor:
+        if not (self.is_batched(module.weight) or self.is_batched(module.bias)):
+            # Linear already maps over leading axes of x
+            return self._call(module.forward, x, batched=self.is_batched(x))
+        if not isinstance(x, Tensor):
+            raise TypeError("input of Linear must be of type Tensor")
+        if len(x.dim) == 0 or x.dim[-1] != module.in_features:
+            raise ValueError("last dimension of input must be", module.in_features, "but input is of shape", x.dim)
+        # per-sample weights: the batching rules of tmult and add apply
+        out = tmult(x, module.weight, ([len(x.dim) - 1], [1]), x.dim[:-1] + (module.out_features,))
+        return out if module.bias is None else out + module.bias
+
+
+def _batch_size(args: tuple, in_dims: tuple) -> int:
+    sizes = {len(arg.data) if isinstance(arg, Tensor) else len(arg) for arg, d in zip(args, in_dims) if d == 0}
+    if len(sizes) != 1:
+        raise ValueError("vmap needs at least one batched argument and equal batch sizes, got", sorted(sizes))
+    return sizes.pop()
+
+
+def _in_dims(in_dims, args: tuple) -> tuple:
+    in_dims = in_dims if isinstance(in_dims, tuple) else (in_dims,) * len(args)
+    if len(in_dims) != len(args):
+        raise ValueError("vmap got", len(in_dims), "in_dims for", len(args), "arguments")
+    for arg, d in zip(args, in_dims):
+        if d not in (0, None):
+            raise ValueError("vmap only maps over the leading axis (in_dims 0 or None), got", d)
+        if d == 0 and (not isinstance(arg, (Tensor, np.ndarray)) or np.ndim(arg.data if isinstance(arg, Tensor) else arg) == 0):
+            raise TypeError("batched arguments of vmap must be tensors or arrays with a leading batch axis", type(arg))
+    return in_dims
+
+
+def _run_batched(fn: callable, args: tuple, in_dims: tuple, level: _BatchingLevel) -> Tensor:
+    """Runs fn with the batching level active and returns its output with a leading batch axis."""
+    if _vmap.level is not None:
+        raise RuntimeError("vmap cannot be nested")
+    args = tuple(Tensor(arg, requires_grad=False) if isinstance(arg, np.ndarray) else arg for arg in args)
+    for arg, d in zip(args, in_dims):
+        if d == 0:
+            level.mark(arg)
+    _vmap.level = level
+    try:
+        out = _materialize(fn(*args))
+        if not isinstance(out, Tensor):
+            raise TypeError("Function mapped by vmap must return a tensor.", type(out))
+        if not level.is_batched(out):
+            # output independent of the batched inputs: broadcast along the batch axis
+            zeros = Tensor(np.zeros((level.size,) + (1,) * out.data.ndim, dtype=out.data.dtype), requires_grad=False)
+            out = level.elementwise(Tensor.__add__, level.mark(zeros), out)
+    finally:
+        _vmap.level = None
+    return out
+
+
+def vmap(fn: callable, in_dims=0) -> callable:
+    """
+    Vectorizes fn over the leading axis of its arguments.
+    fn is written for one sample using tensor operations (add, mul, to, reshape/view, permute/transpose,
+    basic indexing, tmult, einsum, Linear); the returned function runs it once on the whole batch and
+    returns a tensor with a leading batch axis. The result is differentiable like any other tensor.
+
+    :param fn: function mapping per-sample tensors to a tensor
+    :type fn: callable
+    :param in_dims: 0 (mapped) or None (shared by all samples), for all arguments or per argument
+    :type in_dims: int | None | tuple
+    """
+    @functools.wraps(fn)
+    def batched(*args) -> Tensor:
+        dims = _in_dims(in_dims, args)
+        return _run_batched(fn, args, dims, _BatchingLevel(_batch_size(args, dims)))
+    return batched
+
+
+def per_sample_grad(fn: callable, params, in_dims=0) -> callable:
+    """
+    Returns a function computing the gradients of fn with respect to params separately for every
+    sample of a batch, in one vectorized forward and backward pass (instead of one backward per sample).
+    fn computes the loss of one sample (its output is summed); params are the tensors it depends on,
+    e.g. module.parameters(). The returned function takes the batched inputs and returns one
+    tensor per parameter with the per-sample gradients stacked along a leading batch axis.
+    The .grad of params is not modified.
+
+    :param fn: per-sample loss function
+    :type fn: callable
+    :param params: tensors to differentiate with respect to
+    :type params: iterable[Tensor]
+    :param in_dims: see vmap
+    :type in_dims: int | None | tuple
+    """
+    params = list(params)
+
+    @functools.wraps(fn)
+    def grads(*args) -> list:
+        dims = _in_dims(in_dims, args)
+        level = _BatchingLevel(_batch_size(args, dims))
+        saved = [(p.data, p.grad) for p in params]
+        try:
+            for p in params:
+                # every sample sees the same values, the backward pass keeps its gradient separate
+                p.data = np.broadcast_to(p.data, (level.size,) + p.data.shape)
+                p.grad = None
+                level.mark(p)
+            with enable_grad():
+                out = _run_batched(fn, args, dims, level)
+                if out.requires_grad:
+                    out.backward(Tensor(np.ones(out.data.shape, dtype=out.data.dtype), requires_grad=False))
+            return [Tensor(np.zeros(p.data.shape, dtype=p.data.dtype), requires_grad=False) if p.grad is None else p.grad
+                    for p in params]
+        finally:
+            for p, (data, grad) in zip(params, saved):
+                p.data, p.grad = data, grad
+    return grads
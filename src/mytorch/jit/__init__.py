@@ -0,0 +1,7 @@
+"""
+Package for graph capture.
+"""
+
+from .capture import capture, CapturedFunction
+
+__all__ = [capture, CapturedFunction]
@@ -0,0 +1,153 @@
+"""
+Implements graph capture and replay for the MyTorch library.
+A captured function is traced once per input signature: every tensor operation of one
+forward pass is recorded as a kernel writing into the buffer of its traced output, and the
+topological order of the backward pass is planned once. Later calls copy the new inputs into
+the traced input tensors and replay the flat kernel list and the planned backward pass,
+skipping operator dispatch, validation and graph construction.
+"""
+
+import functools
+
+import numpy as np
+
+from mytorch import autograd
+from mytorch.autograd import is_grad_enabled
+from mytorch.autograd.engine import _topological_order
+from mytorch.tensor import Tensor
+from mytorch.tensor import fusion as _fusion
+from mytorch.tensor.tensor import _capture
+
+
+class _CapturedGraph:
+    """
+    Traced forward (and backward) pass for one input signature.
+    steps holds (kernel, operands, result) in execution order; each replayed kernel
+    reads its operands' data and writes into the data of its traced result.
+    """
+    __slots__ = ("inputs", "steps", "output", "seed", "order")
+
+    def __init__(self, inputs: list, steps: list, output: Tensor, backward: bool):
+        self.inputs = inputs
+        self.steps = steps
+        self.output = output
+        self.seed = None
+        self.order = None
+        if backward and output.requires_grad:
+            self.seed = np.ones(output.dim, dtype=output.data.dtype)
+            if output.grad_op is not None:
+                self.order = _topological_order(output)
+
+    def replay(self, args: tuple) -> Tensor:
+        for placeholder, arg in zip(self.inputs, args):
+            if placeholder is not None:
+                np.copyto(placeholder.data, arg.data)
+        for kernel, operands, result in self.steps:
+            kernel(*[operand.data for operand in operands], out=result.data)
+        self.backward(args)
+        return self.output
+
+    def backward(self, args: tuple):
+        """Runs the planned backward pass and hands the input gradients to the caller's tensors."""
+        if self.seed is None:
+            return
+        autograd.backward(self.output, self.seed, self.order, retain_graph=True)
+        for placeholder, arg in zip(self.inputs, args):
+            if placeholder is not None and placeholder.grad is not None:
+                arg._accumulate_grad(placeholder.grad.data)
+                placeholder._grad = None  # not a parameter: no optimizer has to re-pack it
+
+
+class CapturedFunction:
+    """
+    Function whose tensor operations are traced once per input signature and replayed afterwards.
+    The signature consists of shape, dtype and requires_grad of every tensor argument,
+    all other arguments (compared by value) and the grad mode.
+    When a new signature shows up after max_graphs graphs have been captured,
+    the function is executed eagerly.
+
+    The returned tensor is owned by the captured graph and overwritten by the next call.
+    """
+    def __init__(self, fn: callable, backward: bool = True, max_graphs: int = 8):
+        if max_graphs < 0:
+            raise ValueError("max_graphs must not be negative")
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.backward = backward
+        self.max_graphs = max_graphs
+        self.graphs = {}  # signature -> _CapturedGraph
+
+    @staticmethod
+    def _signature(args: tuple) -> tuple:
+        key = [is_grad_enabled()]
+        for arg in args:
+            if isinstance(arg, Tensor):
+                key.append((Tensor, arg.dim, arg.data.dtype, arg.requires_grad))
+            else:
+                key.append(arg)
+        return tuple(key)
+
+    def __call__(self, *args) -> Tensor:
+        try:
+            key = self._signature(args)
+            graph = self.graphs.get(key)
+        except TypeError:  # unhashable argument
+            return self._eager(args)
+        if graph is not None:
+            return graph.replay(args)
+        if len(self.graphs) >= self.max_graphs:
+            return self._eager(args)
+        graph = self._trace(args)
+        self.graphs[key] = graph
+        graph.backward(args)
+        return graph.output
+
+    def _eager(self, args: tuple) -> Tensor:
+        output = _materialize(self.fn(*args))
+        if self.backward and output.requires_grad and is_grad_enabled():
+            output.backward(Tensor(np.ones(output.dim, dtype=output.data.dtype), requires_grad=False))
+        return output
+
+    def _trace(self, args: tuple) -> _CapturedGraph:
+        """Runs fn on copies of the tensor arguments while recording every tensor operation."""
+        inputs = [Tensor(np.array(arg.data), requires_grad=arg.requires_grad) if isinstance(arg, Tensor) else None
+                  for arg in args]
+        traced_args = [arg if placeholder is None else placeholder for arg, placeholder in zip(args, inputs)]
+        if _capture.tape is not None:
+            raise RuntimeError("Captured functions cannot be called while another function is traced.")
+        _capture.tape = []
+        try:
+            output = _materialize(self.fn(*traced_args))
+            steps = _capture.tape
+        finally:
+            _capture.tape = None
+        return _CapturedGraph(inputs, steps, output, self.backward and is_grad_enabled())
+
+    def __repr__(self):
+        return "CapturedFunction(" + getattr(self.fn, "__name__", repr(self.fn)) + ", graphs=" + str(len(self.graphs)) + ")"
+
+
+def _materialize(output) -> Tensor:
+    output = _fusion._materialize(output)
+    if not isinstance(output, Tensor):
+        raise TypeError("Captured function must return a tensor.", type(output))
+    return output
+
+
+def capture(fn: callable = None, *, backward: bool = True, max_graphs: int = 8):
+    """
+    Captures fn for replay (see CapturedFunction).
+    Only operations on tensors are recorded: python control flow and scalars are frozen
+    at trace time and numpy computations on .data are not replayed.
+    Can be used as function or as decorator, with or without arguments.
+
+    :param fn: function mapping tensors to a tensor
+    :type fn: callable
+    :param backward: whether each call also runs backward from the output (seeded with ones)
+    :type backward: bool
+    :param max_graphs: number of input signatures to capture before falling back to eager execution
+    :type max_graphs: int
+    """
+    if fn is None:
+        return functools.partial(capture, backward=backward, max_graphs=max_graphs)
+    return CapturedFunction(fn, backward, max_graphs)
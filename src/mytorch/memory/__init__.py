@@ -0,0 +1,8 @@
+"""
+Package for memory management.
+"""
+
+from .pool import BufferPool, buffer_pool, get_pool
+from .graph import graph_stats
+
+__all__ = [BufferPool, buffer_pool, get_pool, graph_stats]
@@ -0,0 +1,63 @@
+"""
+Implements the autograd graph memory tracker for the MyTorch library.
+Reports the graph nodes (GradOperations) that still hold their operands, i.e. graphs that
+were not backpropagated yet or were retained, and the bytes of the arrays they keep alive
+(operand data and the state custom Functions saved for backward).
+"""
+
+import gc
+
+import numpy as np
+
+
+def _owner(array: np.ndarray) -> np.ndarray:
+    """Array owning the memory of array (views are resolved to their base)."""
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _reachable(tensors: tuple) -> list:
+    """Live GradOperations of the graphs that created tensors."""
+    ops = []
+    visited = set()
+    stack = [t.grad_op for t in tensors if t.grad_op is not None]
+    while stack:
+        op = stack.pop()
+        if id(op) in visited or op.operands is None:
+            continue
+        visited.add(id(op))
+        ops.append(op)
+        stack.extend(operand_op for operand_op in op.operand_ops if operand_op is not None)
+    return ops
+
+
+def graph_stats(*tensors) -> dict:
+    """
+    Returns the number of live graph nodes, of the tensors they save for backward and the bytes
+    of the saved data (memory shared by views is counted once).
+    With tensors given, only the graphs that created them are inspected, otherwise all live nodes
+    (found through the garbage collector, which makes the call slow on large heaps).
+
+    :param tensors: outputs whose graphs are inspected
+    :type tensors: Tensor
+    """
+    from mytorch.autograd import GradOperation
+    if tensors:
+        ops = _reachable(tensors)
+    else:
+        ops = [o for o in gc.get_objects() if isinstance(o, GradOperation) and o.operands is not None]
+    saved = set()
+    buffers = {}
+    for op in ops:
+        arrays = [operand.data for operand in op.operands if operand.data is not None]
+        saved.update(id(operand) for operand in op.operands if operand.data is not None)
+        ctx = getattr(op, "ctx", None)  # Function nodes keep the state saved on their context
+        if ctx is not None:
+            arrays.extend(value for value in ctx.saved if isinstance(value, np.ndarray))
+            saved.update(id(value) for value in ctx.saved if isinstance(value, np.ndarray))
+        for array in arrays:
+            if isinstance(array, np.ndarray):
+                owner = _owner(array)
+                buffers[id(owner)] = owner.nbytes
+    return {"nodes": len(ops), "saved_tensors": len(saved), "saved_bytes": sum(buffers.values())}
@@ -0,0 +1,132 @@
+"""
+Implements a caching allocator for numpy buffers.
+Buffers are kept per (shape, dtype) after their tensor is released and handed out
+again by later operations, so steady-state training loops stop allocating and
+page-faulting the same shapes every iteration.
+"""
+
+import collections
+import threading
+
+import numpy as np
+
+_active = None  # pool used by operations, set by buffer_pool()
+
+
+class BufferPool:
+    """
+    Pool of free numpy buffers keyed by (shape, dtype).
+    Holds at most max_bytes; when full, the least recently released buffers are evicted.
+    """
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        if max_bytes < 0:
+            raise ValueError("max_bytes of buffer pool must not be negative")
+        self.max_bytes = max_bytes
+        self._free = {}  # (shape, dtype) -> list of buffers
+        self._lru = collections.OrderedDict()  # id(buffer) -> (shape, dtype), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def empty(self, shape: tuple, dtype) -> np.ndarray:
+        """
+        Returns an uninitialized buffer of the given shape and dtype,
+        reusing a released one if available.
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            buffers = self._free.get(key)
+            if buffers:
+                buffer = buffers.pop()
+                del self._lru[id(buffer)]
+                self.bytes_held -= buffer.nbytes
+                self.hits += 1
+                return buffer
+            self.misses += 1
+        return np.empty(key[0], dtype=key[1])
+
+    def release(self, buffer: np.ndarray) -> bool:
+        """
+        Hands a buffer back to the pool. The caller must not use it anymore.
+        Only contiguous, writeable arrays that own their memory are accepted.
+        Returns whether the buffer was taken.
+        """
+        if not isinstance(buffer, np.ndarray) or buffer.base is not None or not buffer.flags.c_contiguous or not buffer.flags.writeable:
+            return False
+        if buffer.nbytes > self.max_bytes:
+            return False
+        key = (buffer.shape, buffer.dtype)
+        with self._lock:
+            self._free.setdefault(key, []).append(buffer)
+            self._lru[id(buffer)] = key
+            self.bytes_held += buffer.nbytes
+            while self.bytes_held > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self):
+        buffer_id, key = self._lru.popitem(last=False)
+        buffers = self._free[key]
+        for i, buffer in enumerate(buffers):
+            if id(buffer) == buffer_id:
+                del buffers[i]
+                break
+        if not buffers:
+            del self._free[key]
+        self.bytes_held -= buffer.nbytes
+        self.evictions += 1
+
+    def clear(self):
+        """Drops all held buffers."""
+        with self._lock:
+            self._free.clear()
+            self._lru.clear()
+            self.bytes_held = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss/eviction counters and the bytes currently held."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes_held": self.bytes_held,
+                "buffers_held": len(self._lru),
+            }
+
+    def __repr__(self):
+        return "BufferPool(" + ", ".join(k + "=" + str(v) for k, v in self.stats().items()) + ")"
+
+
+def get_pool() -> BufferPool | None:
+    """Returns the pool currently used by operations (None if pooling is disabled)."""
+    return _active
+
+
+class buffer_pool:
+    """
+    Enables a buffer pool for all operations inside the block.
+    Results of element-wise operations, tmult and intermediate gradients are taken from
+    the pool, and tensors give their buffers back when they are garbage collected.
+
+    :param pool: pool to use (a new BufferPool(max_bytes) if None)
+    :type pool: BufferPool | None
+    :param max_bytes: size cap of a newly created pool
+    :type max_bytes: int
+    """
+    def __init__(self, pool: BufferPool | None = None, max_bytes: int = 256 * 2**20):
+        self.pool = pool if pool is not None else BufferPool(max_bytes)
+        self._prev = []
+
+    def __enter__(self) -> BufferPool:
+        global _active
+        self._prev.append(_active)
+        _active = self.pool
+        return self.pool
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = self._prev.pop()
+        return False
@@ -0,0 +1,7 @@
+"""
+Package for neural network related things.
+"""
+
+from .modules import Module, Linear
+
+__all__ = [Module, Linear]
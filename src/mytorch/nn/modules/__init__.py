@@ -0,0 +1,8 @@
+"""
+Package for neural network modules.
+"""
+
+from .module import Module
+from .linear import Linear
+
+__all__ = [Module, Linear]
@@ -1,4 +1,106 @@
 """
 Implements a linear (fully connected) layer for the MyTorch library.
 The Linear module applies a linear transformation to the incoming data: y = xW^T + b.
-"""
\ No newline at end of file
+"""
+
+import sys
+
+import numpy as np
+
+from mytorch.profiler import profiler as _profiler
+from mytorch.tensor import Tensor, get_default_dtype
+from mytorch.tensor.fusion import _materialize
+from mytorch.tensor.tensor import _autocast_dtype, _blas_operands, _vmap
+
+from .module import Module
+
+
+class Linear(Module):
+    """
+    Applies y = xW^T + b to the last dimension of x.
+    The whole mini-batch goes through one BLAS matmul; weight and bias gradients are
+    computed as one batched matmul and one reduction.
+    Output and gradient buffers are reused across calls with the same batch shape
+    once the previous results are no longer referenced.
+    """
+    def __init__(self, in_features: int, out_features: int, bias: bool = True):
+        super().__init__()
+        self.in_features = in_features
+        self.out_features = out_features
+        k = 1.0 / np.sqrt(in_features)
+        dtype = get_default_dtype()
+        self.weight = Tensor(np.random.uniform(-k, k, (out_features, in_features)), dtype=dtype)
+        if bias:
+            self.bias = Tensor(np.random.uniform(-k, k, (out_features,)), dtype=dtype)
+        else:
+            self.register_parameter("bias", None)
+        self._workspaces = {}
+
+    def _workspace(self, name: str, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """
+        Returns a buffer for name/shape/dtype.
+        The previous buffer is reused if nothing else references it anymore
+        (tensors, views and gradients in flight all keep a reference to it).
+        """
+        key = (name, shape, dtype)
+        buffer = self._workspaces.get(key)
+        # references: workspace dict + local variable + getrefcount argument
+        if buffer is not None and sys.getrefcount(buffer) == 3:
+            return buffer
+        buffer = np.empty(shape, dtype=dtype)
+        self._workspaces[key] = buffer
+        return buffer
+
+    def forward(self, x: Tensor) -> Tensor:
+        """
+        :param x: input of shape (*, in_features)
+        :type x: Tensor
+        """
+        x = _materialize(x)
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("linear", self.forward, x)
+        level = _vmap.level
+        if level is not None:
+            return level.linear(self, x)
+        if not isinstance(x, Tensor):
+            raise TypeError("input of Linear must be of type Tensor")
+        if len(x.dim) == 0 or x.dim[-1] != self.in_features:
+            raise ValueError("last dimension of input must be", self.in_features, "but input is of shape", x.dim)
+        batch_shape = x.dim[:-1]
+        operands = [x, self.weight] if self.bias is None else [x, self.weight, self.bias]
+        arrays = [operand.data for operand in operands]
+        dtype = _autocast_dtype(*arrays)
+        if dtype is None:
+            dtype = np.result_type(*arrays)
+        out = self._workspace("out", (int(np.prod(batch_shape)), self.out_features), dtype)
+        self._forward_into(*arrays, out=out)
+        data = out if len(batch_shape) == 1 else out.reshape(batch_shape + (self.out_features,))
+        return Tensor._from_op(data, "linear", self._backward, operands, self._forward_into)
+
+    def _forward_into(self, x: np.ndarray, weight: np.ndarray, bias: np.ndarray = None, *, out: np.ndarray) -> np.ndarray:
+        out_2d = out.reshape(-1, self.out_features)
+        x, weight = _blas_operands(x.reshape(-1, self.in_features), weight)
+        if out.dtype == np.result_type(x, weight):
+            np.matmul(x, weight.T, out=out_2d)
+        else:
+            # autocast: computed in the dtype of the operands, stored in reduced precision
+            np.copyto(out_2d, np.matmul(x, weight.T), casting="unsafe")
+        if bias is not None:
+            np.add(out_2d, bias, out=out_2d, casting="unsafe")
+        return out
+
+    def _backward(self, grad, operands, index):
+        x = operands[0]
+        grad2 = grad.reshape(-1, self.out_features)
+        if index == 0:
+            return np.matmul(*_blas_operands(grad2, operands[1].data)).reshape(x.dim)
+        if index == 1:
+            grad2_t, x2 = _blas_operands(grad2.T, x.data.reshape(-1, self.in_features))
+            out = self._workspace("grad_weight", operands[1].dim, np.result_type(grad2_t, x2))
+            return np.matmul(grad2_t, x2, out=out)
+        out = self._workspace("grad_bias", operands[2].dim, grad.dtype)
+        return np.sum(grad2, axis=0, out=out)
+
+    def extra_repr(self) -> str:
+        return "in_features=" + str(self.in_features) + ", out_features=" + str(self.out_features) + ", bias=" + str(self.bias is not None)
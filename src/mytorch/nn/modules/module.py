@@ -0,0 +1,107 @@
+"""
+Implements the Module base class for the MyTorch library.
+Modules hold parameters (tensors that require grad) and submodules,
+which are registered automatically on attribute assignment.
+"""
+
+import numpy as np
+
+from mytorch.tensor import Tensor
+
+
+class Module:
+    """
+    Base class for all neural network modules.
+    Subclasses implement forward(); calling the module calls forward().
+    """
+    def __init__(self):
+        object.__setattr__(self, "_parameters", {})
+        object.__setattr__(self, "_modules", {})
+
+    def __setattr__(self, name: str, value):
+        if "_parameters" not in self.__dict__:
+            raise AttributeError("Module.__init__() must be called before assigning attributes")
+        self._parameters.pop(name, None)
+        self._modules.pop(name, None)
+        if isinstance(value, Tensor) and value.requires_grad:
+            self._parameters[name] = value
+        elif isinstance(value, Module):
+            self._modules[name] = value
+        object.__setattr__(self, name, value)
+
+    def register_parameter(self, name: str, param: Tensor | None):
+        """
+        Registers a parameter under the given name (None removes it).
+
+        :param name: attribute name of the parameter
+        :type name: str
+        :param param: parameter tensor
+        :type param: Tensor | None
+        """
+        self._parameters.pop(name, None)
+        if param is not None:
+            self._parameters[name] = param
+        object.__setattr__(self, name, param)
+
+    def named_parameters(self, prefix: str = ""):
+        """Yields (name, parameter) for all parameters of this module and its submodules."""
+        seen = set()
+        stack = [(prefix, self)]
+        while stack:
+            module_prefix, module = stack.pop(0)
+            for name, param in module._parameters.items():
+                if id(param) not in seen:
+                    seen.add(id(param))
+                    yield module_prefix + name, param
+            for name, submodule in module._modules.items():
+                stack.append((module_prefix + name + ".", submodule))
+
+    def parameters(self):
+        """Yields all parameters of this module and its submodules."""
+        for _, param in self.named_parameters():
+            yield param
+
+    def state_dict(self) -> dict:
+        """Returns a dict mapping parameter names to parameters (not copies)."""
+        return dict(self.named_parameters())
+
+    def load_state_dict(self, state_dict: dict, strict: bool = True):
+        """
+        Copies the data of the given tensors (or arrays) into the parameters of the same name.
+
+        :param state_dict: parameter name -> tensor, e.g. from mytorch.load()
+        :type state_dict: dict
+        :param strict: whether the names must match the parameters exactly
+        :type strict: bool
+        """
+        params = self.state_dict()
+        if strict:
+            missing = [name for name in params if name not in state_dict]
+            unexpected = [name for name in state_dict if name not in params]
+            if missing or unexpected:
+                raise ValueError("state dict does not match the parameters; missing:", missing, "unexpected:", unexpected)
+        for name, param in params.items():
+            if name not in state_dict:
+                continue
+            value = state_dict[name]
+            data = value.data if isinstance(value, Tensor) else np.asarray(value)
+            if data.shape != param.data.shape:
+                raise ValueError("shape of", name, "does not match:", data.shape, "!=", param.data.shape)
+            np.copyto(param.data, data)
+
+    def zero_grad(self):
+        """Sets the gradients of all parameters to zero (reusing their buffers)."""
+        for param in self.parameters():
+            param.zero_grad()
+
+    def forward(self, *args, **kwargs):
+        raise NotImplementedError()
+
+    def __call__(self, *args, **kwargs):
+        return self.forward(*args, **kwargs)
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(" + self.extra_repr() + ")"
+
+    def extra_repr(self) -> str:
+        return ""
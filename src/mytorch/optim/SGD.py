@@ -1,4 +1,210 @@
 """
 Implements the Stochastic Gradient Descent (SGD) optimizer for the MyTorch library.
 SGD updates model parameters using gradients computed during backpropagation.
-"""
\ No newline at end of file
+"""
+
+import numpy as np
+
+from mytorch.tensor import Tensor, RowSparseTensor
+from mytorch.tensor.tensor import _rebinds
+
+
+def _flat_base(arrays: list, offsets: list, total: int, dtype: np.dtype) -> np.ndarray | None:
+    """Returns the 1d buffer arrays are views into if they lie at the given offsets, else None."""
+    base = arrays[0].base
+    if not isinstance(base, np.ndarray) or base.ndim != 1 or base.size != total or base.dtype != dtype:
+        return None
+    start = base.__array_interface__["data"][0]
+    for a, offset in zip(arrays, offsets):
+        if a.base is not base or not a.flags.c_contiguous or a.__array_interface__["data"][0] != start + offset * base.itemsize:
+            return None
+    return base
+
+
+class _FlatGroup:
+    """
+    Parameters of one dtype packed into flat buffers: data, gradient, momentum state and
+    scratch space; parameter indices[k] of the optimizer lies at offsets[k].
+    """
+    __slots__ = ("indices", "offsets", "flat_data", "flat_grad", "momentum_buffer", "scratch")
+
+    def __init__(self, params: list, indices: list, dtype: np.dtype, momentum: bool):
+        self.indices = indices
+        self.offsets = []
+        total = 0
+        for i in indices:
+            self.offsets.append(total)
+            total += params[i].data.size
+        members = [params[i] for i in indices]
+        # parameters (and gradients) that already are consecutive views into one flat buffer,
+        # e.g. shared memory of DataParallel, are used in place instead of being copied
+        self.flat_data = _flat_base([p.data for p in members], self.offsets, total, dtype)
+        if self.flat_data is None:
+            self.flat_data = np.empty(total, dtype=dtype)
+        self.flat_grad = None
+        if all(isinstance(p.grad, Tensor) for p in members):
+            self.flat_grad = _flat_base([p.grad.data for p in members], self.offsets, total, dtype)
+        if self.flat_grad is None:
+            self.flat_grad = np.zeros(total, dtype=dtype)
+        self.momentum_buffer = np.zeros(total, dtype=dtype) if momentum else None
+        self.scratch = np.empty(total, dtype=dtype)
+
+
+class SGD:
+    """
+    SGD with optional momentum, Nesterov momentum and weight decay.
+    The parameters of each dtype, their gradients and the momentum state are packed into
+    contiguous buffers (one _FlatGroup per dtype in groups, so parameters keep their dtype);
+    param.data and param.grad.data become views into them.
+    A step is therefore a handful of vectorized in-place numpy operations per dtype
+    instead of a python loop over the parameters.
+    Parameters listed in sparse_params (e.g. embedding tables multiplied with a SparseTensor)
+    get sparse_grad set and keep row sparse gradients; they are left out of the flat buffers and
+    updated in the touched rows only (plain SGD only).
+    Assigned gradients (param.grad = ..., including None, which counts as a zero gradient) and data
+    arrays that mytorch replaces are moved back into the buffers by the next step() or zero_grad();
+    after assigning param.data yourself, call repack().
+    """
+    def __init__(self, params, lr: float, momentum: float = 0.0, dampening: float = 0.0,
+                 weight_decay: float = 0.0, nesterov: bool = False, sparse_params=()):
+        if lr < 0.0:
+            raise ValueError("invalid learning rate:", lr)
+        if momentum < 0.0:
+            raise ValueError("invalid momentum:", momentum)
+        if not 0.0 <= dampening < 1.0:
+            raise ValueError("invalid dampening:", dampening)
+        if weight_decay < 0.0:
+            raise ValueError("invalid weight decay:", weight_decay)
+        if nesterov and (momentum <= 0.0 or dampening != 0.0):
+            raise ValueError("Nesterov momentum requires a momentum and zero dampening")
+        self.params = list(params)
+        if len(self.params) == 0:
+            raise ValueError("optimizer got an empty parameter list")
+        self.lr = lr
+        self.momentum = momentum
+        self.dampening = dampening
+        self.weight_decay = weight_decay
+        self.nesterov = nesterov
+        sparse_ids = {id(p) for p in sparse_params}
+        self._sparse = {i for i, p in enumerate(self.params) if id(p) in sparse_ids}  # row sparse gradients
+        if self._sparse and (momentum != 0.0 or weight_decay != 0.0):
+            raise ValueError("sparse parameters are only supported without momentum and weight decay")
+        for i in self._sparse:
+            self.params[i].sparse_grad = True
+
+        by_dtype = {}  # dtype -> indices of the dense parameters of that dtype (integer ones are updated as float64)
+        for i, p in enumerate(self.params):
+            if i not in self._sparse:
+                dtype = p.data.dtype if np.issubdtype(p.data.dtype, np.inexact) else np.dtype(np.float64)
+                by_dtype.setdefault(dtype, []).append(i)
+        self.groups = [_FlatGroup(self.params, indices, dtype, momentum != 0.0) for dtype, indices in by_dtype.items()]
+        self._places = [None] * len(self.params)  # (group, offset) of every dense parameter
+        for group in self.groups:
+            for i, offset in zip(group.indices, group.offsets):
+                self._places[i] = (group, offset)
+        self._momentum_initialized = False
+        self._rebinds_seen = None
+        self.repack()
+
+    def _views(self, i: int) -> tuple[np.ndarray, np.ndarray]:
+        p = self.params[i]
+        group, start = self._places[i]
+        stop = start + p.data.size
+        return group.flat_data[start:stop].reshape(p.data.shape), group.flat_grad[start:stop].reshape(p.data.shape)
+
+    def _pack(self, i: int):
+        """Moves data and gradient of parameter i into the flat buffers."""
+        p = self.params[i]
+        group = self._places[i][0]
+        data, grad = self._views(i)
+        if p.data.base is not group.flat_data:
+            np.copyto(data, p.data)
+            p.data = data
+            _rebinds.value += 1
+        if isinstance(p.grad, RowSparseTensor):
+            grad.fill(0)
+            p.grad.add_to(grad)
+            p.grad = Tensor(grad, requires_grad=False)
+            return
+        if p.grad is None or p.grad.data.base is not group.flat_grad:
+            if p.grad is None:
+                grad.fill(0)
+            else:
+                np.copyto(grad, p.grad.data)
+            p.grad = Tensor(grad, requires_grad=False)
+
+    def _check_views(self):
+        """Re-packs the parameters if a grad was assigned or mytorch replaced a data array since the last check."""
+        if _rebinds.value != self._rebinds_seen:
+            self.repack()
+
+    def repack(self):
+        """Moves the data and gradients of all parameters that are no views into the flat buffers back into them."""
+        for group in self.groups:
+            flat_data = group.flat_data
+            flat_grad = group.flat_grad
+            for i in group.indices:
+                p = self.params[i]
+                if p.data.base is not flat_data or not isinstance(p.grad, Tensor) or p.grad.data.base is not flat_grad:
+                    if p.data.shape != self._views(i)[0].shape:
+                        raise ValueError("shape of parameter", i, "changed after it was added to the optimizer")
+                    self._pack(i)
+        self._rebinds_seen = _rebinds.value
+
+    def zero_grad(self):
+        """Sets all gradients to zero (one fill over the flat gradient buffer of each dtype)."""
+        self._check_views()
+        for group in self.groups:
+            group.flat_grad.fill(0)
+        for i in self._sparse:
+            self.params[i].grad = None
+
+    def step(self):
+        """Performs a single optimization step."""
+        self._check_views()
+        if self._sparse:
+            self._sparse_step()
+        for group in self.groups:
+            self._step_group(group)
+        self._momentum_initialized = True
+
+    def _step_group(self, group: _FlatGroup):
+        scratch = group.scratch
+        d_p = group.flat_grad
+        if self.weight_decay != 0.0:
+            np.multiply(group.flat_data, self.weight_decay, out=scratch)
+            np.add(scratch, d_p, out=scratch)
+            d_p = scratch
+        if self.momentum != 0.0:
+            buf = group.momentum_buffer
+            if not self._momentum_initialized:
+                np.copyto(buf, d_p)
+            elif self.dampening == 0.0:
+                np.multiply(buf, self.momentum, out=buf)
+                np.add(buf, d_p, out=buf)
+            else:
+                # buf = momentum * buf + (1 - dampening) * d_p without a temporary
+                np.multiply(buf, self.momentum / (1.0 - self.dampening), out=buf)
+                np.add(buf, d_p, out=buf)
+                np.multiply(buf, 1.0 - self.dampening, out=buf)
+            if self.nesterov:
+                # p -= lr * (d_p + momentum * buf)
+                np.multiply(d_p, self.lr, out=scratch)
+                np.subtract(group.flat_data, scratch, out=group.flat_data)
+                d_p = buf
+                np.multiply(d_p, self.lr * self.momentum, out=scratch)
+                np.subtract(group.flat_data, scratch, out=group.flat_data)
+                return
+            d_p = buf
+        np.multiply(d_p, self.lr, out=scratch)
+        np.subtract(group.flat_data, scratch, out=group.flat_data)
+
+    def _sparse_step(self):
+        """Updates the sparse parameters, with row sparse gradients only in the touched rows."""
+        for i in self._sparse:
+            p = self.params[i]
+            if isinstance(p.grad, RowSparseTensor):
+                grad = p.grad.coalesce()
+                p.data[grad.rows] -= self.lr * grad.values
+            elif p.grad is not None:
+                p.data -= self.lr * p.grad.data
@@ -0,0 +1,7 @@
+"""
+Package for optimizers.
+"""
+
+from .SGD import SGD
+
+__all__ = [SGD]
@@ -0,0 +1,7 @@
+"""
+Package for parallel training.
+"""
+
+from .data_parallel import DataParallel
+
+__all__ = [DataParallel]
@@ -0,0 +1,230 @@
+"""
+Implements data-parallel training for the MyTorch library.
+Worker processes are forked once; parameters, per-worker gradients and the batch live in
+multiprocessing.shared_memory buffers, so nothing but a few bytes of metadata is pickled per step.
+Every worker runs forward and backward on its shard of the batch into its own gradient row;
+the rows are then summed in place by all workers together, each reducing one chunk of the
+flat gradient (a reduce-scatter whose result every process sees, i.e. an all-reduce).
+"""
+
+import multiprocessing
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mytorch.tensor import Tensor
+from mytorch.tensor.tensor import _rebinds
+
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class _SharedArray:
+    """numpy array in a new shared memory segment (inherited by forked workers)."""
+    __slots__ = ("shm", "array")
+
+    def __init__(self, shape: tuple, dtype: np.dtype):
+        nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    def close(self):
+        self.array = None
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # views are still alive (e.g. held by an optimizer), unmapped once they are gone
+
+
+class DataParallel:
+    """
+    Runs fn data-parallel on num_workers forked processes.
+    fn(*shards) maps the shards (tensors, split along the first axis) of the step inputs to a tensor;
+    its backward is seeded with ones, so the gradients of all shards add up to the gradient of the
+    whole batch. After step() the parameters' .grad hold the summed gradients.
+
+    Parameter data is moved into shared memory (param.data becomes a view), so updates made
+    by the parent, e.g. SGD, which works on the shared buffers in place, are seen by the workers.
+    Requires the fork start method (POSIX).
+
+    :param fn: step function executed by the workers
+    :type fn: callable
+    :param params: parameters fn depends on
+    :type params: iterable[Tensor]
+    :param num_workers: number of worker processes
+    :type num_workers: int
+    """
+    def __init__(self, fn: callable, params, num_workers: int = 2):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("DataParallel requires the fork start method")
+        if num_workers < 1:
+            raise ValueError("invalid number of workers:", num_workers)
+        self.fn = fn
+        self.params = list(params)
+        if len(self.params) == 0:
+            raise ValueError("DataParallel got an empty parameter list")
+        self.num_workers = num_workers
+        dtype = np.result_type(*(p.data.dtype for p in self.params))
+        self.offsets = []
+        total = 0
+        for p in self.params:
+            self.offsets.append(total)
+            total += p.data.size
+        self.total = total
+        self._data = _SharedArray((total,), dtype)
+        self._worker_grads = _SharedArray((num_workers, total), dtype)
+        self._grad = _SharedArray((total,), dtype)
+        self._grad.array.fill(0)
+        for i, p in enumerate(self.params):
+            view = self._view(self._data.array, i)
+            np.copyto(view, p.data)
+            p.data = view
+            p.grad = Tensor(self._view(self._grad.array, i), requires_grad=False)
+        _rebinds.value += 1
+        self._inputs = None
+        self._processes = []
+        self._pipes = []
+
+    def _view(self, flat: np.ndarray, i: int) -> np.ndarray:
+        start = self.offsets[i]
+        return flat[start:start + self.params[i].data.size].reshape(self.params[i].data.shape)
+
+    def _sync_params(self):
+        """Moves parameters whose data or grad was replaced since the last step back into shared memory."""
+        for i, p in enumerate(self.params):
+            view = self._view(self._data.array, i)
+            if p.data.base is not self._data.array:
+                if p.data.shape != view.shape:
+                    raise ValueError("shape of parameter", i, "changed after it was added to DataParallel")
+                np.copyto(view, p.data)
+                p.data = view
+                _rebinds.value += 1
+            if p.grad is None or p.grad.data.base is not self._grad.array:
+                p.grad = Tensor(self._view(self._grad.array, i), requires_grad=False)
+
+    def _start(self):
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(self.num_workers)
+        for rank in range(self.num_workers):
+            parent, child = context.Pipe()
+            process = context.Process(target=self._worker, args=(rank, child, barrier), daemon=True)
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._pipes.append(parent)
+
+    def _stop(self):
+        for pipe in self._pipes:
+            try:
+                pipe.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join()
+        for pipe in self._pipes:
+            pipe.close()
+        self._processes = []
+        self._pipes = []
+
+    def _worker(self, rank: int, pipe, barrier):
+        grads = self._worker_grads.array[rank]
+        for i, p in enumerate(self.params):
+            p.grad = Tensor(self._view(grads, i), requires_grad=False)
+        chunk = -(-self.total // self.num_workers)
+        lo, hi = min(rank * chunk, self.total), min((rank + 1) * chunk, self.total)
+        while True:
+            message = pipe.recv()
+            if message is None:
+                return
+            try:
+                grads.fill(0)
+                start, stop = message["bounds"][rank], message["bounds"][rank + 1]
+                shards = [Tensor(np.ndarray(shape, dtype=dtype, buffer=self._inputs.shm.buf, offset=offset)[start:stop], requires_grad=False)
+                          for shape, dtype, offset in message["inputs"]]
+                out = self.fn(*shards)
+                out.backward(Tensor(np.ones(out.dim, dtype=out.data.dtype), requires_grad=False))
+                value = float(out.data.sum())
+                barrier.wait()
+                # reduce-scatter: this worker sums its chunk over all gradient rows
+                np.sum(self._worker_grads.array[:, lo:hi], axis=0, out=self._grad.array[lo:hi])
+                barrier.wait()
+                pipe.send(("ok", value))
+            except Exception:
+                barrier.abort()
+                pipe.send(("error", traceback.format_exc()))
+
+    def _stage_inputs(self, arrays: list) -> list:
+        """Copies the inputs into the shared input buffer (re-forking the workers if it has to grow)."""
+        layout = []
+        nbytes = 0
+        for a in arrays:
+            nbytes = _align(nbytes)
+            layout.append((a.shape, a.dtype.str, nbytes))
+            nbytes += a.nbytes
+        capacity = 0 if self._inputs is None else self._inputs.array.size
+        if capacity < nbytes:
+            # the workers map the buffer at fork time, so they are restarted with the grown one
+            self._stop()
+            if self._inputs is not None:
+                self._inputs.close()
+            self._inputs = _SharedArray((max(nbytes, 2 * capacity),), np.uint8)
+        for a, (_, _, offset) in zip(arrays, layout):
+            np.copyto(np.ndarray(a.shape, dtype=a.dtype, buffer=self._inputs.shm.buf, offset=offset), a)
+        return layout
+
+    def step(self, *inputs) -> float:
+        """
+        Runs fn forward and backward on the shards of inputs on all workers and sums the gradients
+        into the parameters' .grad (previous gradients are overwritten).
+        Returns the sum of fn's outputs over the whole batch.
+
+        :param inputs: batch inputs (tensors or arrays) with equal first dimension
+        :type inputs: Tensor | np.ndarray
+        """
+        arrays = [np.ascontiguousarray(x.data if isinstance(x, Tensor) else x) for x in inputs]
+        if len(arrays) == 0 or any(a.ndim == 0 or len(a) != len(arrays[0]) for a in arrays):
+            raise ValueError("inputs of DataParallel.step must have the same (first) batch dimension")
+        self._sync_params()
+        layout = self._stage_inputs(arrays)
+        if not self._processes:
+            self._start()
+        bounds = [len(arrays[0]) * rank // self.num_workers for rank in range(self.num_workers + 1)]
+        message = {"inputs": layout, "bounds": bounds}
+        for pipe in self._pipes:
+            pipe.send(message)
+        results = [pipe.recv() for pipe in self._pipes]
+        errors = [result[1] for result in results if result[0] == "error"]
+        if errors:
+            self._stop()
+            raise RuntimeError("DataParallel worker failed:\n" + errors[0])
+        return sum(result[1] for result in results)
+
+    def close(self):
+        """Stops the workers and frees the shared memory (parameters are copied back into private memory)."""
+        if getattr(self, "_data", None) is None:  # closed, or __init__ failed
+            return
+        self._stop()
+        for p in self.params:
+            p.data = p.data.copy()
+            if p.grad is not None:
+                p.grad = Tensor(p.grad.data.copy(), requires_grad=False)
+        _rebinds.value += 1
+        for shared in (self._data, self._worker_grads, self._grad, self._inputs):
+            if shared is not None:
+                shared.close()
+        self._data = self._worker_grads = self._grad = self._inputs = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        self.close()
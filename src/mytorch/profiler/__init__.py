@@ -0,0 +1,7 @@
+"""
+Package for profiling.
+"""
+
+from .profiler import profile, get_profiler
+
+__all__ = [profile, get_profiler]
@@ -0,0 +1,166 @@
+"""
+Implements the per-operation profiler for the MyTorch library.
+While a profile() is active, every forward operation, every backward step and every backward
+pass are recorded with wall time, input/output shapes and the bytes of their results
+(optionally the bytes actually allocated, measured with tracemalloc).
+When no profiler is active the hooks cost a single global None check per operation.
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_active = None  # profiler used by operations, set by profile()
+
+
+class _Event:
+    __slots__ = ("name", "category", "start", "duration", "input_shapes", "output_shapes", "bytes", "thread")
+
+    def __init__(self, name: str, category: str, start: int, duration: int, input_shapes: list, output_shapes: list,
+                 nbytes: int, thread: int):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = duration
+        self.input_shapes = input_shapes
+        self.output_shapes = output_shapes
+        self.bytes = nbytes
+        self.thread = thread
+
+
+def _shape(x) -> list | None:
+    shape = getattr(x, "dim", None)
+    if shape is None:
+        shape = getattr(x, "shape", None)
+    return None if shape is None else list(shape)
+
+
+def _nbytes(x) -> int:
+    data = getattr(x, "data", x)
+    return getattr(data, "nbytes", 0)
+
+
+class profile:
+    """
+    Context manager that records all tensor operations executed inside it.
+    Profilers do not nest: the innermost one records.
+
+    :param record_memory: whether the bytes allocated by each operation are measured with tracemalloc
+        (slower); otherwise the bytes of the results are recorded
+    :type record_memory: bool
+    """
+    def __init__(self, record_memory: bool = False):
+        self.record_memory = record_memory
+        self.events = []
+        self._busy = False
+        self._prev = None
+        self._started_tracemalloc = False
+        self._origin = time.perf_counter_ns()
+
+    def __enter__(self):
+        global _active
+        self._prev = _active
+        if self.record_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _active = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+        _active = self._prev
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def _measure(self, fn: callable, args: tuple):
+        """Runs fn(*args), returns (result, start, duration, allocated bytes or None)."""
+        if self.record_memory:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter_ns()
+        result = fn(*args)
+        duration = time.perf_counter_ns() - start
+        allocated = tracemalloc.get_traced_memory()[1] - before if self.record_memory else None
+        return result, start, duration, allocated
+
+    def call(self, name: str, fn: callable, *args):
+        """
+        Runs the forward operation fn(*args) and records it.
+        Operations called by fn itself are not recorded separately.
+        """
+        if self._busy:
+            return fn(*args)
+        self._busy = True
+        try:
+            result, start, duration, allocated = self._measure(fn, args)
+        finally:
+            self._busy = False
+        input_shapes = [_shape(arg) for arg in args if _shape(arg) is not None]
+        nbytes = _nbytes(result) if allocated is None else allocated
+        self.events.append(_Event(name, "forward", start, duration, input_shapes, [_shape(result)], nbytes, threading.get_ident()))
+        return result
+
+    def backward_step(self, grad_op, grad) -> list:
+        """Runs grad_op.backward(grad) and records it."""
+        grads, start, duration, allocated = self._measure(grad_op.backward, (grad,))
+        output_shapes = [None if g is None else list(g.shape) for g in grads]
+        nbytes = sum(g.nbytes for g in grads if g is not None) if allocated is None else allocated
+        self.events.append(_Event(grad_op.op_name, "backward", start, duration, [list(grad.shape)], output_shapes, nbytes,
+                                  threading.get_ident()))
+        return grads
+
+    def record(self, name: str, category: str, start: int, input_shapes: list = None):
+        """Records a span that started at start (perf_counter_ns) and ends now, e.g. a whole backward pass."""
+        self.events.append(_Event(name, category, start, time.perf_counter_ns() - start, input_shapes or [], [], 0,
+                                  threading.get_ident()))
+
+    def key_averages(self) -> list:
+        """Returns one dict per (category, name) with count, total/average time (us) and bytes, slowest first."""
+        groups = {}
+        for event in self.events:
+            group = groups.setdefault((event.category, event.name), {"category": event.category, "name": event.name,
+                                                                     "count": 0, "total_us": 0.0, "bytes": 0})
+            group["count"] += 1
+            group["total_us"] += event.duration / 1e3
+            group["bytes"] += event.bytes
+        rows = sorted(groups.values(), key=lambda row: row["total_us"], reverse=True)
+        for row in rows:
+            row["avg_us"] = row["total_us"] / row["count"]
+        return rows
+
+    def table(self, limit: int = None) -> str:
+        """Returns the aggregated statistics as a printable table."""
+        rows = self.key_averages()[:limit]
+        # backward passes contain their steps, so percentages refer to the recorded ops only
+        total = sum(row["total_us"] for row in rows if row["category"] != "engine") or 1.0
+        lines = [f"{'category':<10}{'name':<24}{'count':>8}{'total [us]':>14}{'avg [us]':>12}{'%':>8}{'bytes':>14}"]
+        for row in rows:
+            percent = "-" if row["category"] == "engine" else f"{100 * row['total_us'] / total:.1f}"
+            lines.append(f"{row['category']:<10}{row['name']:<24}{row['count']:>8}{row['total_us']:>14.1f}"
+                         f"{row['avg_us']:>12.2f}{percent:>8}{row['bytes']:>14}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path: str | os.PathLike):
+        """Writes the events in Chrome trace format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        trace = [{
+            "name": event.name,
+            "cat": event.category,
+            "ph": "X",
+            "ts": (event.start - self._origin) / 1e3,
+            "dur": event.duration / 1e3,
+            "pid": pid,
+            "tid": event.thread,
+            "args": {"input_shapes": event.input_shapes, "output_shapes": event.output_shapes, "bytes": event.bytes},
+        } for event in self.events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def get_profiler() -> profile | None:
+    """Returns the active profiler (None if profiling is disabled)."""
+    return _active
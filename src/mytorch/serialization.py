@@ -0,0 +1,116 @@
+"""
+Implements saving and loading of tensors for the MyTorch library.
+File format: 8 byte magic, little-endian u64 header length, JSON header with name, kind, shape,
+dtype, requires_grad and offset of every entry, then the raw C-contiguous buffers, each aligned
+to ALIGNMENT bytes. Saving streams the buffers one by one; loading with mmap=True returns views
+into a memory map of the file, so data is only paged in when it is touched.
+"""
+
+import json
+import mmap as _mmap
+import os
+
+import numpy as np
+
+from .tensor import Tensor
+
+MAGIC = b"MYTORCH1"
+ALIGNMENT = 64
+
+
+def _entries(obj) -> tuple[str, list]:
+    if isinstance(obj, (Tensor, np.ndarray)):
+        return "single", [("", obj)]
+    if isinstance(obj, dict):
+        for name, value in obj.items():
+            if not isinstance(name, str):
+                raise TypeError("keys of saved dicts must be of type str", type(name))
+            if not isinstance(value, (Tensor, np.ndarray)):
+                raise TypeError("value of", name, "must be a Tensor or numpy array", type(value))
+        return "dict", list(obj.items())
+    raise TypeError("can only save a Tensor, a numpy array or a dict of them (e.g. Module.state_dict())", type(obj))
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save(obj, path: str | os.PathLike):
+    """
+    Saves a tensor, numpy array or dict of them (e.g. a state dict) to path.
+    Buffers are written one at a time, without building the file in memory.
+
+    :param obj: object to save
+    :type obj: Tensor | np.ndarray | dict
+    :param path: file to write
+    :type path: str | os.PathLike
+    """
+    structure, entries = _entries(obj)
+    records = []
+    offset = 0
+    for name, value in entries:
+        data = value.data if isinstance(value, Tensor) else value
+        if data.dtype.hasobject:
+            raise TypeError("cannot save arrays of dtype object", name)
+        offset = _align(offset)
+        records.append({
+            "name": name,
+            "kind": "tensor" if isinstance(value, Tensor) else "array",
+            "requires_grad": bool(value.requires_grad) if isinstance(value, Tensor) else False,
+            "shape": list(data.shape),
+            "dtype": data.dtype.str,
+            "offset": offset,
+        })
+        offset += data.nbytes
+    header = json.dumps({"structure": structure, "entries": records}).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for (_, value), record in zip(entries, records):
+            data = value.data if isinstance(value, Tensor) else value
+            f.write(b"\0" * (data_start + record["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(data).reshape(-1).view(np.uint8))
+
+
+def _read_header(f) -> tuple[dict, int]:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a mytorch file", getattr(f, "name", f))
+    length = int.from_bytes(f.read(8), "little")
+    header = json.loads(f.read(length))
+    return header, _align(len(MAGIC) + 8 + length)
+
+
+def load(path: str | os.PathLike, mmap: bool = False, writable: bool = False):
+    """
+    Loads what save() wrote: a tensor, a numpy array or a dict of them.
+
+    :param path: file to read
+    :type path: str | os.PathLike
+    :param mmap: whether the data is memory-mapped instead of read (paged in lazily on access)
+    :type mmap: bool
+    :param writable: with mmap, whether the views are writable copy-on-write (changes are not written to the file)
+    :type writable: bool
+    """
+    with open(path, "rb") as f:
+        header, data_start = _read_header(f)
+        if mmap:
+            size = os.fstat(f.fileno()).st_size
+            buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY if writable else _mmap.ACCESS_READ) if size > 0 else b""
+        values = []
+        for record in header["entries"]:
+            dtype = np.dtype(record["dtype"])
+            shape = tuple(record["shape"])
+            count = int(np.prod(shape))
+            if mmap:
+                data = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + record["offset"]).reshape(shape)
+            else:
+                data = np.empty(shape, dtype=dtype)
+                f.seek(data_start + record["offset"])
+                if f.readinto(data.reshape(-1).view(np.uint8)) != data.nbytes:
+                    raise ValueError("file is truncated", record["name"])
+            values.append(Tensor(data, requires_grad=record["requires_grad"]) if record["kind"] == "tensor" else data)
+    if header["structure"] == "single":
+        return values[0]
+    return {record["name"]: value for record, value in zip(header["entries"], values)}
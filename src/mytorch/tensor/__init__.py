@@ -3,6 +3,9 @@ Package for tensor-related things.
 """
 
 from .tensor import Tensor
-from .tensor_mult import tmult
+from .dtype import get_default_dtype, set_default_dtype
+from .tensor_mult import tmult, einsum
+from .sparse import SparseTensor, RowSparseTensor
+from .fusion import lazy, LazyTensor
 
 __all__ = [Tensor]
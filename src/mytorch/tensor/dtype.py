@@ -0,0 +1,37 @@
+"""
+Implements dtype defaults for the MyTorch library.
+Floating point data given as python lists takes the default dtype (float32 unless changed).
+Also holds the state of the autocast mode (see mytorch.amp).
+"""
+
+import threading
+
+import numpy as np
+
+_default_dtype = np.dtype(np.float32)
+
+
+def get_default_dtype() -> np.dtype:
+    """Returns the dtype floating point python data is converted to."""
+    return _default_dtype
+
+
+def set_default_dtype(dtype):
+    """
+    Sets the dtype floating point python data is converted to.
+
+    :param dtype: floating point dtype
+    :type dtype: np.dtype
+    """
+    global _default_dtype
+    dtype = np.dtype(dtype)
+    if dtype.kind != "f":
+        raise TypeError("default dtype must be a floating point dtype", dtype)
+    _default_dtype = dtype
+
+
+class _AutocastState(threading.local):
+    dtype = None  # dtype floating point results are stored in, None if autocast is disabled
+
+
+_autocast = _AutocastState()  # set by mytorch.amp.autocast()
@@ -0,0 +1,332 @@
+"""
+Implements the lazy expression mode for the MyTorch library.
+Inside lazy() element-wise operations build a deferred expression DAG of LazyTensors
+instead of computing their result. On materialization the whole DAG is evaluated as one
+fused kernel: chunk by chunk along the first axis, with a few reused out= buffers sized
+to fit in cache, so chains like a*b + c*d + e do not allocate full-size temporaries.
+The result records a single GradOperation whose backward is fused and chunked as well.
+"""
+
+import functools
+
+import numpy as np
+
+from mytorch.autograd import JointGradOperation
+from mytorch.profiler import profiler as _profiler
+
+from .tensor import Tensor, _lazy_mode, _reduce_to_shape
+
+CHUNK_BYTES = 1 << 20  # working set per chunk, roughly the size of a per-core L2 cache
+
+_UFUNCS = {"add": np.add, "mul": np.multiply}
+
+
+class lazy:
+    """
+    Enables the lazy expression mode.
+    Element-wise operations on tensors return LazyTensors until they are materialized.
+    Can be used as context manager or as function decorator.
+    """
+    def __init__(self):
+        self._prev = []
+
+    def __enter__(self):
+        self._prev.append(_lazy_mode.enabled)
+        _lazy_mode.enabled = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _lazy_mode.enabled = self._prev.pop()
+        return False
+
+    def __call__(self, func: callable) -> callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with lazy():
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class LazyTensor:
+    """
+    Deferred result of an element-wise operation.
+    Materialized (once) by materialize(), by accessing .data, by backward(), by reshape()/view()
+    and when passed to an operation that is not element-wise (tmult, einsum, Linear, Functions).
+    """
+    __slots__ = ("op", "inputs", "dim", "dtype", "requires_grad", "_result")
+
+    def __init__(self, op: str, inputs: tuple):
+        self.op = op
+        self.inputs = inputs
+        self.dim = np.broadcast_shapes(*(x.dim for x in inputs))
+        self.dtype = np.result_type(*(x.dtype if isinstance(x, LazyTensor) else x.data.dtype for x in inputs))
+        self.requires_grad = any(x.requires_grad for x in inputs)
+        self._result = None
+
+    @classmethod
+    def _from_op(cls, op: str, x, other):
+        """
+        Records op(x, other) lazily.
+        Non-tensor operands are wrapped like in the eager operators.
+        """
+        if isinstance(x, LazyTensor):
+            x = x._source()
+        if isinstance(other, LazyTensor):
+            other = other._source()
+        elif isinstance(x, Tensor):
+            other = x._wrap_operand(other)
+        else:
+            other = _wrap_constant(x.dtype, other)
+        if other is NotImplemented:
+            return NotImplemented
+        return cls(op, (x, other))
+
+    def _source(self):
+        """Returns the materialized result if there is one, so it is used as a leaf."""
+        return self if self._result is None else self._result
+
+    def __add__(self, other):
+        return LazyTensor._from_op("add", self, other)
+
+    def __radd__(self, other):
+        return LazyTensor._from_op("add", self, other)
+
+    def __mul__(self, other):
+        return LazyTensor._from_op("mul", self, other)
+
+    def __rmul__(self, other):
+        return LazyTensor._from_op("mul", self, other)
+
+    def materialize(self, chunk_bytes: int = CHUNK_BYTES) -> Tensor:
+        """
+        Evaluates the expression DAG as a single fused kernel and returns the result tensor.
+        The result is cached, later calls return the same tensor.
+
+        :param chunk_bytes: approximate working set per chunk
+        :type chunk_bytes: int
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy and self._result is None:
+            return prof.call("fused-elementwise", self.materialize, chunk_bytes)
+        if self._result is None:
+            program, leaves = _FusedProgram.compile(self, chunk_bytes)
+            data = program.forward([leaf.data for leaf in leaves])
+            t = Tensor._from_op(data, "fused-elementwise", None, leaves, program.kernel)
+            if t.grad_op is not None:
+                t.grad_op = JointGradOperation("fused-elementwise", program.backward, leaves)
+            self._result = t
+            self.inputs = ()  # the DAG is no longer needed
+        return self._result
+
+    @property
+    def data(self) -> np.ndarray:
+        return self.materialize().data
+
+    def backward(self, grad_out=None):
+        self.materialize().backward(grad_out)
+
+    def reshape(self, *shape) -> Tensor:
+        return self.materialize().reshape(*shape)
+
+    def view(self, *shape) -> Tensor:
+        return self.materialize().view(*shape)
+
+    def __str__(self):
+        return "LazyTensor(" + self.op + ", dim=" + str(self.dim) + ")"
+
+    def __repr__(self):
+        return "LazyTensor(" + self.op + ", " + repr(list(self.inputs)) + ")"
+
+
+def _materialize(x):
+    """Returns the materialized result of x if it is a LazyTensor (operations that are not element-wise), else x."""
+    return x.materialize() if isinstance(x, LazyTensor) else x
+
+
+def _wrap_constant(dtype: np.dtype, other):
+    """Wraps a non-tensor operand like Tensor._wrap_operand (python scalars take the given dtype)."""
+    if isinstance(other, Tensor):
+        return other
+    if isinstance(other, (int, float, bool)):
+        return Tensor(np.asarray(other, dtype=np.result_type(dtype, other)), requires_grad=False)
+    if isinstance(other, (np.ndarray, np.generic)):
+        return Tensor(np.asarray(other), requires_grad=False)
+    return NotImplemented
+
+
+class _FusedProgram:
+    """
+    Flat, topologically ordered instruction list of an expression DAG.
+    Values 0..n_leaves-1 are the leaves, value n_leaves + k is the result of instruction k.
+    Values that vary along the first output axis are evaluated chunk by chunk,
+    all others are evaluated once up front.
+    """
+    __slots__ = ("n_leaves", "instructions", "shapes", "dtypes", "varies", "needs_grad", "out_shape", "n_scratch", "buffer_of", "rows")
+
+    @classmethod
+    def compile(cls, root: LazyTensor, chunk_bytes: int) -> tuple["_FusedProgram", list]:
+        leaves = []
+        index = {}
+        nodes = []
+        # iterative post order over the unmaterialized nodes
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in index:
+                continue
+            if isinstance(node, Tensor):
+                index[id(node)] = ("leaf", len(leaves))
+                leaves.append(node)
+                continue
+            if expanded:
+                index[id(node)] = ("node", len(nodes))
+                nodes.append(node)
+                continue
+            stack.append((node, True))
+            for x in reversed(node.inputs):
+                if id(x) not in index:
+                    stack.append((x, False))
+        program = cls()
+        program.n_leaves = len(leaves)
+
+        def ref(x):
+            kind, i = index[id(x)]
+            return i if kind == "leaf" else program.n_leaves + i
+
+        program.instructions = [(node.op, ref(node.inputs[0]), ref(node.inputs[1])) for node in nodes]
+        program.shapes = [leaf.dim for leaf in leaves] + [node.dim for node in nodes]
+        program.dtypes = [leaf.data.dtype for leaf in leaves] + [node.dtype for node in nodes]
+        program.needs_grad = [leaf.requires_grad for leaf in leaves] + [node.requires_grad for node in nodes]
+        program.out_shape = root.dim
+        n0 = root.dim[0] if len(root.dim) > 0 else 1
+        program.varies = [n0 > 1 and len(s) == len(root.dim) and s[0] == n0 for s in program.shapes]
+        program._allocate()
+        program.rows = program._rows(chunk_bytes)
+        return program, leaves
+
+    def _allocate(self):
+        """Assigns reusable chunk buffers to the varying intermediate values (liveness based)."""
+        root = len(self.shapes) - 1
+        last_use = {}
+        for k, (_, a, b) in enumerate(self.instructions):
+            last_use[a] = k
+            last_use[b] = k
+        free = {}
+        self.buffer_of = {}
+        self.n_scratch = 0
+        for k, (_, a, b) in enumerate(self.instructions):
+            v = self.n_leaves + k
+            if self.varies[v] and v != root:
+                key = (self.shapes[v][1:], self.dtypes[v])
+                if free.get(key):
+                    self.buffer_of[v] = free[key].pop()
+                else:
+                    self.buffer_of[v] = (key, self.n_scratch)
+                    self.n_scratch += 1
+            for x in {a, b}:
+                if x in self.buffer_of and last_use[x] == k:
+                    free.setdefault(self.buffer_of[x][0], []).append(self.buffer_of[x])
+
+    def _rows(self, chunk_bytes: int) -> int:
+        n_varying = self.n_scratch + 1 + sum(self.varies[:self.n_leaves])
+        row_bytes = max(1, int(np.prod(self.out_shape[1:])) * max(dt.itemsize for dt in self.dtypes))
+        return max(1, chunk_bytes // (row_bytes * n_varying))
+
+    def _hoisted(self, leaf_arrays: list) -> list:
+        """Evaluates all values that do not vary along the first axis."""
+        values = list(leaf_arrays) + [None] * len(self.instructions)
+        for k, (op, a, b) in enumerate(self.instructions):
+            v = self.n_leaves + k
+            if not self.varies[v]:
+                values[v] = _UFUNCS[op](values[a], values[b])
+        return values
+
+    def _chunk(self, values: list, scratch: list, start: int, stop: int, out: np.ndarray | None) -> list:
+        """Evaluates the varying values for rows start:stop, the root is written into out."""
+        chunk = [values[v][start:stop] if self.varies[v] else values[v] for v in range(self.n_leaves)]
+        chunk += values[self.n_leaves:]
+        root = len(self.shapes) - 1
+        for k, (op, a, b) in enumerate(self.instructions):
+            v = self.n_leaves + k
+            if not self.varies[v]:
+                continue
+            if v == root and out is not None:
+                buffer = out[start:stop]
+            elif out is not None:
+                buffer = scratch[self.buffer_of[v][1]][:stop - start]
+            else:
+                buffer = None  # backward keeps all chunk values alive
+            chunk[v] = _UFUNCS[op](chunk[a], chunk[b], out=buffer)
+        return chunk
+
+    def forward(self, leaf_arrays: list, out: np.ndarray = None) -> np.ndarray:
+        values = self._hoisted(leaf_arrays)
+        root = len(self.shapes) - 1
+        if not self.varies[root]:
+            if out is None:
+                return values[root]
+            np.copyto(out, values[root])
+            return out
+        if out is None:
+            out = np.empty(self.out_shape, dtype=self.dtypes[root])
+        rows = self.rows
+        scratch = [None] * self.n_scratch
+        for v, (key, i) in self.buffer_of.items():
+            if scratch[i] is None:
+                scratch[i] = np.empty((rows,) + key[0], dtype=key[1])
+        for start in range(0, self.out_shape[0], rows):
+            self._chunk(values, scratch, start, min(start + rows, self.out_shape[0]), out)
+        return out
+
+    def kernel(self, *leaf_arrays, out: np.ndarray) -> np.ndarray:
+        """Kernel form of forward (see Tensor._from_op)."""
+        return self.forward(leaf_arrays, out)
+
+    def _backward_step(self, grads: dict, chunk: list, v: int, shapes: list):
+        """Propagates the gradient of value v to its inputs (within the same phase)."""
+        op, a, b = self.instructions[v - self.n_leaves]
+        g = grads.pop(v)
+        for x, other in ((a, b), (b, a)):
+            if not self.needs_grad[x]:
+                continue
+            gx = g if op == "add" else np.multiply(g, chunk[other])
+            gx = _reduce_to_shape(gx, shapes[x])
+            grads[x] = gx if x not in grads else grads[x] + gx
+
+    def backward(self, grad: np.ndarray, leaves: list) -> list:
+        leaf_arrays = [leaf.data for leaf in leaves]
+        values = self._hoisted(leaf_arrays)
+        root = len(self.shapes) - 1
+        n_values = len(self.shapes)
+        # gradients of non-varying values are summed over all chunks
+        totals = {}
+        if self.varies[root]:
+            rows = self.rows
+            n0 = self.out_shape[0]
+            leaf_grads = [np.empty(self.shapes[i], dtype=grad.dtype) if self.varies[i] and self.needs_grad[i] else None
+                          for i in range(self.n_leaves)]
+            for start in range(0, n0, rows):
+                stop = min(start + rows, n0)
+                chunk = self._chunk(values, None, start, stop, None)
+                shapes = [(stop - start,) + s[1:] if self.varies[v] else s for v, s in enumerate(self.shapes)]
+                grads = {root: grad[start:stop]}
+                for v in range(n_values - 1, self.n_leaves - 1, -1):
+                    if self.varies[v] and v in grads:
+                        self._backward_step(grads, chunk, v, shapes)
+                for v, g in grads.items():
+                    if self.varies[v]:
+                        leaf_grads[v][start:stop] = g
+                    elif v in totals:
+                        np.add(totals[v], g, out=totals[v])
+                    else:
+                        totals[v] = np.array(g, dtype=np.result_type(g, grad))
+        else:
+            leaf_grads = [None] * self.n_leaves
+            totals[root] = grad.reshape(self.shapes[root])
+        # remaining pass over the values that do not vary along the first axis
+        for v in range(n_values - 1, self.n_leaves - 1, -1):
+            if not self.varies[v] and v in totals:
+                self._backward_step(totals, values, v, self.shapes)
+        for i, g in totals.items():
+            leaf_grads[i] = g
+        return [leaf_grads[i] if self.needs_grad[i] else None for i in range(self.n_leaves)]
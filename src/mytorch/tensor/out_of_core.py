@@ -0,0 +1,131 @@
+"""
+Implements out-of-core tensor multiplication for the MyTorch library.
+Contractions over memory-mapped operands are computed as a blocked 2d matmul: tiles of both
+operands are read from the mapping, multiplied in memory and accumulated per output tile,
+which is stored into an output array that is itself memory-mapped if it exceeds the budget.
+At most memory_budget bytes of tiles are resident at a time (per worker thread); BLAS
+releases the GIL, so output tiles can be computed on a thread pool.
+Operands whose contraction layout is not a view of the mapping (e.g. contracting the first
+axis) are first restaged in blocks into a temporary memory-mapped file.
+"""
+
+import concurrent.futures
+import math
+import mmap
+import tempfile
+
+import numpy as np
+
+from .tensor import _blas_operands
+
+MEMORY_BUDGET = 256 * 2**20  # bytes; contractions over mapped operands within it run in memory
+
+
+def _is_mapped(array) -> bool:
+    """Returns whether array (or the array it is a view of) is backed by a memory mapping."""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = array.obj if isinstance(array, memoryview) else getattr(array, "base", None)
+    return False
+
+
+def _temporary(shape: tuple, dtype: np.dtype, tmpdir: str = None) -> np.ndarray:
+    """Array in an anonymous temporary file (deleted once the mapping is gone)."""
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype)
+    with tempfile.TemporaryFile(dir=tmpdir) as f:
+        return np.memmap(f, dtype=dtype, mode="w+", shape=shape)
+
+
+class _Blocking:
+    """
+    Settings of a blocked contraction.
+    tile is the (rows, columns, contracted) size of the tiles (one int for all three), by default
+    derived from memory_budget.
+    """
+    __slots__ = ("memory_budget", "tile", "num_workers", "tmpdir")
+
+    def __init__(self, memory_budget: int = None, tile=None, num_workers: int = 0, tmpdir: str = None):
+        memory_budget = MEMORY_BUDGET if memory_budget is None else memory_budget
+        if memory_budget < 1:
+            raise ValueError("invalid memory budget:", memory_budget)
+        if isinstance(tile, int):
+            tile = (tile, tile, tile)
+        if tile is not None and (len(tile) != 3 or any(t < 1 for t in tile)):
+            raise ValueError("invalid tile size:", tile)
+        if num_workers < 0:
+            raise ValueError("invalid number of workers:", num_workers)
+        self.memory_budget = memory_budget
+        self.tile = tile
+        self.num_workers = num_workers
+        self.tmpdir = tmpdir
+
+    def tile_sizes(self, m: int, n: int, k: int, itemsize: int) -> tuple:
+        if self.tile is not None:
+            tm, tn, tk = self.tile
+        else:
+            # square output tiles, the contracted extent takes the rest of the per-worker budget
+            elements = self.memory_budget // (itemsize * max(1, self.num_workers))
+            t = math.isqrt(elements // 3)
+            tm, tn = min(m, t), min(n, t)
+            tk = min(k, (elements - tm * tn) // max(1, tm + tn))
+        return max(1, tm), max(1, tn), max(1, tk)
+
+    def output(self, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """Output array, memory-mapped if it does not fit the budget."""
+        if int(np.prod(shape)) * np.dtype(dtype).itemsize <= self.memory_budget:
+            return np.empty(shape, dtype)
+        return _temporary(shape, dtype, self.tmpdir)
+
+    def as_2d(self, array: np.ndarray, perm: tuple, shape: tuple) -> np.ndarray:
+        """array.transpose(perm) as a 2d view, restaged in blocks into a temporary file if it has no such view."""
+        t = array.transpose(perm)
+        try:
+            return np.reshape(t, shape, copy=False)
+        except ValueError:
+            pass
+        staged = _temporary(t.shape, t.dtype, self.tmpdir)
+        rows = max(1, self.memory_budget // max(1, t[0].nbytes))
+        for start in range(0, len(t), rows):
+            staged[start:start + rows] = t[start:start + rows]
+        return staged.reshape(shape)
+
+    def into(self, plan, x: np.ndarray, y: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Computes tensordot(x, y) according to plan (see tensor_mult._TMultPlan) tile by tile into out
+        (C-contiguous, any dtype).
+        """
+        x_2d = self.as_2d(x, plan.x_perm, plan.x_2d)
+        y_2d = self.as_2d(y, plan.y_perm, plan.y_2d)
+        out_2d = out.reshape(plan.out_2d)
+        (m, k), n = plan.x_2d, plan.y_2d[1]
+        itemsize = max(x.itemsize, y.itemsize, out.itemsize, 4)
+        tm, tn, tk = self.tile_sizes(m, n, k, itemsize)
+
+        def tile(i: int, j: int):
+            acc = None
+            for p in range(0, k, tk):
+                a, b = _blas_operands(np.ascontiguousarray(x_2d[i:i + tm, p:p + tk]),
+                                      np.ascontiguousarray(y_2d[p:p + tk, j:j + tn]))
+                if acc is None:
+                    acc = np.dot(a, b)
+                else:
+                    acc += np.dot(a, b)
+            if acc is None:
+                out_2d[i:i + tm, j:j + tn] = 0
+            else:
+                np.copyto(out_2d[i:i + tm, j:j + tn], acc, casting="unsafe")
+
+        tiles = [(i, j) for i in range(0, m, tm) for j in range(0, n, tn)]
+        if self.num_workers == 0 or len(tiles) == 1:
+            for i, j in tiles:
+                tile(i, j)
+        else:
+            with concurrent.futures.ThreadPoolExecutor(self.num_workers, thread_name_prefix="mytorch-tmult") as executor:
+                for future in [executor.submit(tile, i, j) for i, j in tiles]:
+                    future.result()
+        return out
+
+    def run(self, plan, x: np.ndarray, y: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        return self.into(plan, x, y, self.output(plan.dim_out, dtype))
@@ -0,0 +1,397 @@
+"""
+Implements sparse tensors for the MyTorch library.
+SparseTensor stores a 2d matrix in CSR form (row pointers, column indices, values); the values
+are a Tensor, so gradients flow into them through the sparse operations. Products with dense
+tensors only touch the stored entries (a gather of dense rows and a segmented sum per row),
+elementwise operations map the values and keep the sparsity pattern.
+RowSparseTensor holds the gradient of a dense leaf that only some rows contribute to,
+e.g. an embedding table looked up through a sparse matrix; SGD applies it row by row.
+Row sparse gradients are opt-in (leaf.sparse_grad = True), other leaves get dense gradients.
+"""
+
+import functools
+
+import numpy as np
+
+from .tensor import Tensor
+
+ELL_PADDING = 3  # max. ratio of padded to stored entries for the batched matmul path
+
+
+def _gather(t: Tensor, index: tuple) -> Tensor:
+    """t.data[index] with advanced (integer array) indexing, differentiable."""
+    return Tensor._from_op(t.data[index], "sparse-gather", functools.partial(_gather_backward, index), [t],
+                           functools.partial(_gather_into, index), saved=())
+
+
+def _gather_into(index: tuple, x: np.ndarray, *, out: np.ndarray):
+    out[...] = x[index]
+
+
+def _gather_backward(index: tuple, grad, operands, index_operand):
+    shape = operands[index_operand].data.shape
+    flat = np.ravel_multi_index(index, shape) if len(index) > 1 else index[0]
+    out = np.bincount(flat, weights=grad, minlength=int(np.prod(shape)))
+    return out.astype(grad.dtype, copy=False).reshape(shape)
+
+
+def _segment_sum(t: Tensor, segments: np.ndarray, size: int) -> Tensor:
+    """Sums the entries of the 1d tensor t with equal segment id (ids in [0, size)), differentiable."""
+    data = np.bincount(segments, weights=t.data, minlength=size).astype(t.data.dtype, copy=False)
+    return Tensor._from_op(data, "sparse-segment-sum", functools.partial(_segment_sum_backward, segments), [t],
+                           functools.partial(_segment_sum_into, segments), saved=())
+
+
+def _segment_sum_into(segments: np.ndarray, x: np.ndarray, *, out: np.ndarray):
+    np.copyto(out, np.bincount(segments, weights=x, minlength=out.size), casting="unsafe")
+
+
+def _segment_sum_backward(segments: np.ndarray, grad, operands, index):
+    return grad[segments]
+
+
+def _csr_matmul(indptr: np.ndarray, indices: np.ndarray, values: np.ndarray, dense: np.ndarray, compact: bool = False):
+    """
+    CSR matrix times the 2d array dense, touching only the stored entries.
+    With compact, returns (rows, block) holding only the rows with stored entries.
+    If the rows hold similar numbers of entries, they are padded to equal length (ELL layout)
+    and multiplied with the gathered dense rows in one batched matmul; otherwise the products
+    of all entries are summed per row with a segmented reduction.
+    """
+    counts = np.diff(indptr)
+    rows = np.flatnonzero(counts)
+    dtype = np.result_type(values, dense)
+    width = counts.max() if len(counts) else 0
+    if len(indices) == 0:
+        block = np.zeros((0, dense.shape[1]), dtype=dtype)
+    elif width * len(rows) <= ELL_PADDING * len(indices):
+        counts = counts[rows]
+        slot = np.repeat(np.arange(len(rows)), counts)
+        position = np.arange(len(indices)) - np.repeat(indptr[rows], counts)
+        padded_values = np.zeros((len(rows), 1, width), dtype=dtype)
+        padded_indices = np.zeros((len(rows), width), dtype=np.int64)
+        padded_values[slot, 0, position] = values
+        padded_indices[slot, position] = indices
+        block = np.matmul(padded_values, np.take(dense, padded_indices, axis=0))[:, 0]
+    else:
+        block = np.take(dense, indices, axis=0).astype(dtype, copy=False)
+        block *= values[:, None]
+        block = np.add.reduceat(block, indptr[rows], axis=0)
+    if compact:
+        return rows, block
+    out = np.zeros((len(indptr) - 1, dense.shape[1]), dtype=dtype)
+    out[rows] = block
+    return out
+
+
+class RowSparseTensor:
+    """
+    Gradient of a dense tensor with nonzero entries in only some rows (along the first axis).
+    rows may contain duplicates until coalesce() sums them.
+    """
+    __slots__ = ("rows", "values", "shape")
+
+    def __init__(self, rows: np.ndarray, values: np.ndarray, shape: tuple):
+        self.rows = rows
+        self.values = values
+        self.shape = tuple(shape)
+
+    @property
+    def dim(self) -> tuple:
+        return self.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.values.nbytes
+
+    def coalesce(self) -> "RowSparseTensor":
+        """Sums duplicate rows (in place) and returns self."""
+        rows, inverse = np.unique(self.rows, return_inverse=True)
+        if len(rows) != len(self.rows):
+            values = np.zeros((len(rows),) + self.values.shape[1:], dtype=self.values.dtype)
+            np.add.at(values, inverse, self.values)
+            self.values = values
+        elif not np.array_equal(rows, self.rows):
+            order = np.argsort(self.rows)
+            self.values = self.values[order]
+        self.rows = rows
+        return self
+
+    def add_to(self, dense: np.ndarray):
+        """Adds the rows into the dense array in place."""
+        np.add.at(dense, self.rows, self.values)
+
+    def to_dense(self) -> np.ndarray:
+        out = np.zeros(self.shape, dtype=self.values.dtype)
+        self.add_to(out)
+        return out
+
+    def __add__(self, other: "RowSparseTensor") -> "RowSparseTensor":
+        if not isinstance(other, RowSparseTensor):
+            return NotImplemented
+        if other.shape != self.shape:
+            raise ValueError("Cannot add row sparse tensors of dim", self.shape, "and", other.shape)
+        return RowSparseTensor(np.concatenate([self.rows, other.rows]), np.concatenate([self.values, other.values]), self.shape)
+
+    def __repr__(self):
+        return "RowSparseTensor(rows=" + str(self.rows) + ", shape=" + str(self.shape) + ")"
+
+
+class SparseTensor:
+    """
+    2d sparse matrix in CSR layout: the entries of row i are values[indptr[i]:indptr[i + 1]]
+    in the columns indices[indptr[i]:indptr[i + 1]] (sorted, no duplicates).
+    values is a Tensor, gradients of the sparse operations are accumulated into it.
+
+    :param indptr: row pointers (length rows + 1)
+    :type indptr: np.ndarray
+    :param indices: column index of every stored entry
+    :type indices: np.ndarray
+    :param values: stored entries
+    :type values: Tensor | np.ndarray
+    :param shape: shape of the matrix
+    :type shape: tuple
+    """
+    __slots__ = ("indptr", "indices", "values", "shape", "_rows", "_transpose")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, values, shape: tuple):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.values = values if isinstance(values, Tensor) else Tensor(values)
+        self.shape = tuple(shape)
+        if len(self.shape) != 2:
+            raise ValueError("SparseTensor must be 2d, got shape", self.shape)
+        if len(self.indptr) != self.shape[0] + 1 or self.indptr[0] != 0 or self.indptr[-1] != len(self.indices):
+            raise ValueError("invalid row pointers for", len(self.indices), "entries and shape", self.shape)
+        if self.values.data.shape != self.indices.shape:
+            raise ValueError("values must be 1d with one entry per index, got", self.values.data.shape)
+        if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= self.shape[1]):
+            raise ValueError("column index out of range for shape", self.shape)
+        self._rows = None
+        self._transpose = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape: tuple) -> "SparseTensor":
+        """
+        Builds a SparseTensor from coordinate lists; duplicate coordinates are summed
+        (differentiably, if values is a Tensor).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = values if isinstance(values, Tensor) else Tensor(values)
+        if not rows.shape == cols.shape == values.data.shape or rows.ndim != 1:
+            raise ValueError("rows, cols and values must be 1d of equal length")
+        if len(rows) and (rows.min() < 0 or rows.max() >= shape[0] or cols.min() < 0 or cols.max() >= shape[1]):
+            raise ValueError("coordinates out of range for shape", tuple(shape))
+        keys, inverse = np.unique(rows * shape[1] + cols, return_inverse=True)
+        if len(keys) == len(rows):
+            order = np.argsort(inverse)
+            values = values if np.array_equal(order, np.arange(len(order))) else _gather(values, (order,))
+        else:
+            values = _segment_sum(values, inverse.reshape(-1), len(keys))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // shape[1], minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, keys % shape[1], values, shape)
+
+    @classmethod
+    def from_dense(cls, data, requires_grad: bool = True) -> "SparseTensor":
+        """Stores the nonzero entries of a 2d array (or tensor data)."""
+        data = np.asarray(data.data if isinstance(data, Tensor) else data)
+        rows, cols = np.nonzero(data)
+        return cls.from_coo(rows, cols, Tensor(data[rows, cols], requires_grad=requires_grad), data.shape)
+
+    @property
+    def dim(self) -> tuple:
+        return self.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.data.dtype
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    @property
+    def requires_grad(self) -> bool:
+        return self.values.requires_grad
+
+    def row_indices(self) -> np.ndarray:
+        """Row index of every stored entry (computed once)."""
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._rows
+
+    def _transpose_plan(self) -> tuple:
+        """(order, indptr, indices) of the CSR layout of the transpose (computed once)."""
+        if self._transpose is None:
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros(self.shape[1] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.indices, minlength=self.shape[1]), out=indptr[1:])
+            self._transpose = (order, indptr, self.row_indices()[order])
+        return self._transpose
+
+    def t(self) -> "SparseTensor":
+        """Transposed matrix (the values are reordered differentiably)."""
+        order, indptr, indices = self._transpose_plan()
+        t = SparseTensor(indptr, indices, _gather(self.values, (order,)), self.shape[::-1])
+        t._transpose = (np.argsort(order, kind="stable"), self.indptr, self.indices)
+        return t
+
+    def to_dense(self) -> Tensor:
+        """Dense tensor with the stored entries (differentiable)."""
+        data = np.zeros(self.shape, dtype=self.dtype)
+        rows = self.row_indices()
+        data[rows, self.indices] = self.values.data
+        index = (rows, self.indices)
+        return Tensor._from_op(data, "sparse-to-dense", functools.partial(_to_dense_backward, index), [self.values],
+                               functools.partial(_to_dense_into, index), saved=())
+
+    def _with_values(self, values: Tensor) -> "SparseTensor":
+        t = SparseTensor(self.indptr, self.indices, values, self.shape)
+        t._rows = self._rows
+        t._transpose = self._transpose
+        return t
+
+    def __mul__(self, other) -> "SparseTensor":
+        """
+        Elementwise multiplication with a scalar, a dense tensor/array broadcastable to the shape
+        of self or another SparseTensor (entries stored in both); the result keeps the sparsity.
+        """
+        if isinstance(other, SparseTensor):
+            if other.shape != self.shape:
+                raise ValueError("Cannot multiply sparse tensors of dim", self.shape, "and", other.shape)
+            mine = self.row_indices() * self.shape[1] + self.indices
+            theirs = other.row_indices() * self.shape[1] + other.indices
+            _, i, j = np.intersect1d(mine, theirs, assume_unique=True, return_indices=True)
+            rows, cols = np.divmod(mine[i], self.shape[1])
+            return SparseTensor.from_coo(rows, cols, _gather(self.values, (i,)) * _gather(other.values, (j,)), self.shape)
+        if isinstance(other, (int, float, bool, np.generic)):
+            return self._with_values(self.values * other)
+        other = other if isinstance(other, Tensor) else Tensor(np.asarray(other), requires_grad=False)
+        if other.data.ndim > 2:
+            raise ValueError("Cannot multiply sparse tensor of dim", self.shape, "with tensor of dim", other.dim)
+        np.broadcast_shapes(other.data.shape, self.shape)  # raises if not broadcastable
+        if other.data.shape != self.shape:
+            # a read-only view of other: captured without a kernel, replay keeps it up to date
+            other = Tensor._from_op(np.broadcast_to(other.data, self.shape), "sparse-broadcast",
+                                    functools.partial(_broadcast_backward, other.data.shape), [other], saved=())
+        return self._with_values(self.values * _gather(other, (self.row_indices(), self.indices)))
+
+    def __rmul__(self, other) -> "SparseTensor":
+        return self.__mul__(other)
+
+    def __add__(self, other):
+        """
+        Addition of another SparseTensor (sparse result with the union of the stored entries)
+        or of a dense tensor (dense result).
+        """
+        if isinstance(other, SparseTensor):
+            if other.shape != self.shape:
+                raise ValueError("Cannot add sparse tensors of dim", self.shape, "and", other.shape)
+            rows = np.concatenate([self.row_indices(), other.row_indices()])
+            cols = np.concatenate([self.indices, other.indices])
+            values = _concatenate(self.values, other.values)
+            return SparseTensor.from_coo(rows, cols, values, self.shape)
+        if isinstance(other, (Tensor, np.ndarray, int, float, np.generic)):
+            return self.to_dense() + other
+        return NotImplemented
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __repr__(self):
+        return "SparseTensor(shape=" + str(self.shape) + ", nnz=" + str(self.nnz) + ", requires_grad=" + str(self.requires_grad) + ")"
+
+
+def _to_dense_backward(index: tuple, grad, operands, operand_index):
+    return grad[index]
+
+
+def _to_dense_into(index: tuple, values: np.ndarray, *, out: np.ndarray):
+    out[index] = values  # the other entries stay zero
+
+
+def _broadcast_backward(shape: tuple, grad, operands, index):
+    lead = grad.ndim - len(shape)
+    axes = tuple(range(lead)) + tuple(lead + i for i, n in enumerate(shape) if n == 1 and grad.shape[lead + i] != 1)
+    return grad.sum(axis=axes, keepdims=True).reshape(shape)
+
+
+def _concatenate(a: Tensor, b: Tensor) -> Tensor:
+    """Concatenates two 1d tensors, differentiably."""
+    return Tensor._from_op(np.concatenate([a.data, b.data]), "sparse-concatenate",
+                           functools.partial(_concatenate_backward, len(a.data)), [a, b], _concatenate_into,
+                           saved=())
+
+
+def _concatenate_into(a: np.ndarray, b: np.ndarray, *, out: np.ndarray):
+    np.concatenate([a, b], out=out)
+
+
+def _concatenate_backward(split: int, grad, operands, index):
+    return grad[:split] if index == 0 else grad[split:]
+
+
+def _matmul(a: SparseTensor, dense: Tensor) -> Tensor:
+    """a @ dense for a 2d dense tensor (rows of dense that a does not reference are never read)."""
+    data = _csr_matmul(a.indptr, a.indices, a.values.data, dense.data)
+    return Tensor._from_op(data, "sparse-dense-mult", functools.partial(_matmul_backward, a), [a.values, dense],
+                           functools.partial(_matmul_into, a))
+
+
+def _matmul_into(a: SparseTensor, values: np.ndarray, dense: np.ndarray, *, out: np.ndarray):
+    np.copyto(out, _csr_matmul(a.indptr, a.indices, values, dense))
+
+
+def _matmul_backward(a: SparseTensor, grad, operands, index):
+    dense = operands[1]
+    if index == 0:
+        # d out[i, :] / d value(i, j) = dense[j, :]
+        return np.einsum("ij,ij->i", grad[a.row_indices()], dense.data[a.indices])
+    order, indptr, indices = a._transpose_plan()
+    values = operands[0].data[order]
+    if dense.grad_op is None and dense.sparse_grad:
+        # leaf (e.g. an embedding table): only the rows a references get a gradient
+        rows, block = _csr_matmul(indptr, indices, values, grad, compact=True)
+        return RowSparseTensor(rows, block.astype(dense.data.dtype, copy=False), dense.data.shape)
+    return _csr_matmul(indptr, indices, values, grad).astype(dense.data.dtype, copy=False)
+
+
+def tmult_sparse(x, y, axes: tuple, dim_out: tuple) -> Tensor:
+    """
+    tmult for a SparseTensor and a dense Tensor contracting one axis of the sparse matrix.
+    Reduced to (sparse or transposed sparse) @ (dense reshaped to 2d) and differentiable in both operands.
+    """
+    if isinstance(x, SparseTensor) and isinstance(y, SparseTensor):
+        raise NotImplementedError("tensor multiplication of two sparse tensors is not supported")
+    if not isinstance(axes, tuple) or len(axes) != 2 or len(axes[0]) != 1 or len(axes[1]) != 1:
+        raise ValueError("tensor multiplication with a sparse tensor must contract exactly one axis, got", axes)
+    sparse_first = isinstance(x, SparseTensor)
+    sparse, dense = (x, y) if sparse_first else (y, x)
+    sparse_axis, dense_axis = (axes[0][0], axes[1][0]) if sparse_first else (axes[1][0], axes[0][0])
+    if not isinstance(dense, Tensor):
+        raise TypeError("dense operand of tensor multiplication must be of type Tensor")
+    if sparse_axis not in (0, 1) or not 0 <= dense_axis < len(dense.dim):
+        raise ValueError("invalid axes", axes, "for operands of dim", x.dim, "and", y.dim)
+    if sparse.shape[sparse_axis] != dense.dim[dense_axis]:
+        raise ValueError("dimensions of axes", axes, "do not match:", x.dim, y.dim)
+    free = sparse.shape[1 - sparse_axis]
+    dense_free = tuple(n for i, n in enumerate(dense.dim) if i != dense_axis)
+    expected = (free,) + dense_free if sparse_first else dense_free + (free,)
+    if tuple(dim_out) != expected:
+        raise ValueError("output of tensor multiplication is not of expected shape", dim_out, "but instead of shape", expected)
+    a = sparse if sparse_axis == 1 else sparse.t()
+    order = (dense_axis,) + tuple(i for i in range(len(dense.dim)) if i != dense_axis)
+    if order != tuple(range(len(dense.dim))):
+        dense = dense.permute(order)
+    if len(dense.dim) != 2:
+        dense = dense.reshape(dense.dim[0], -1)
+    out = _matmul(a, dense)  # (free, prod(dense_free))
+    if not sparse_first:
+        out = out.transpose(0, 1)
+    return out if out.dim == expected else out.reshape(expected)
@@ -2,9 +2,174 @@
 Implements the Tensor class for the MyTorch library.
 """
 
+import functools
+import sys
+import threading
+
 import numpy as np
 
+from mytorch import autograd
 from mytorch.autograd import GradOperation
+from mytorch.autograd.grad_mode import _state as _grad_mode
+from mytorch.memory import pool as _memory_pool
+from mytorch.profiler import profiler as _profiler
+
+from . import dtype as _dtype
+
+
+class _LazyModeState(threading.local):
+    enabled = False
+
+
+_lazy_mode = _LazyModeState()  # set by mytorch.tensor.fusion.lazy()
+
+
+class _CaptureState(threading.local):
+    tape = None
+
+
+_capture = _CaptureState()  # set by mytorch.compiler while tracing
+
+
+class _VmapState(threading.local):
+    level = None
+
+
+_vmap = _VmapState()  # set by mytorch.func.vmap while a batched function runs
+
+
+def _reduce_to_shape(grad: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+    Sums a broadcast gradient back to the shape of the operand it belongs to.
+    Returns grad itself if no broadcasting happened.
+    """
+    if grad.shape == shape:
+        return grad
+    lead = grad.ndim - len(shape)
+    axes = tuple(range(lead))
+    axes += tuple(lead + i for i, n in enumerate(shape) if n == 1 and grad.shape[lead + i] != 1)
+    return grad.sum(axis=axes, keepdims=True).reshape(shape)
+
+
+def _cast_into(x: np.ndarray, out: np.ndarray) -> np.ndarray:
+    np.copyto(out, x, casting="unsafe")
+    return out
+
+
+def _blas_operands(*arrays: np.ndarray) -> tuple:
+    """Upcasts the operands of a matmul whose result would be float16 to float32 (numpy has no BLAS path for float16)."""
+    if np.result_type(*arrays) != np.float16:
+        return arrays
+    return tuple(a.astype(np.float32) for a in arrays)
+
+
+def _autocast_dtype(*arrays: np.ndarray) -> np.dtype | None:
+    """
+    Returns the dtype the floating point result of an operation on arrays is stored in under autocast,
+    None if autocast is disabled or the result keeps its dtype.
+    """
+    dtype = _dtype._autocast.dtype
+    if dtype is None:
+        return None
+    result = np.result_type(*arrays)
+    if result.kind != "f" or result == dtype:
+        return None
+    return dtype
+
+
+def _ufunc(ufunc, a: np.ndarray, b: np.ndarray, pool) -> np.ndarray:
+    """
+    Evaluates ufunc(a, b) into a buffer taken from the buffer pool (if any).
+    Under autocast the result is computed in its natural dtype and stored in the autocast dtype.
+    """
+    shape = np.broadcast_shapes(a.shape, b.shape)
+    storage = _autocast_dtype(a, b)
+    if storage is not None:
+        out = np.empty(shape, storage) if pool is None else pool.empty(shape, storage)
+        return ufunc(a, b, out=out, dtype=np.result_type(a, b), casting="unsafe")
+    if pool is None:
+        return ufunc(a, b)
+    return ufunc(a, b, out=pool.empty(shape, np.result_type(a, b)))
+
+
+def _shape_arg(shape: tuple) -> tuple:
+    """Accepts shapes given as one tuple/list or as separate ints."""
+    if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+        return tuple(shape[0])
+    return tuple(shape)
+
+
+def _reshape_into(x: np.ndarray, out: np.ndarray) -> np.ndarray:
+    np.copyto(out, x.reshape(out.shape))
+    return out
+
+
+def _permute_backward(dims: tuple, grad, operands, index):
+    return grad.transpose(np.argsort(dims))
+
+
+def _basic_index(key) -> tuple:
+    """
+    Validates a basic index and returns it as tuple ending in an Ellipsis,
+    so indexing always returns a view (never a numpy scalar).
+    """
+    key = key if isinstance(key, tuple) else (key,)
+    for k in key:
+        if not (k is None or k is Ellipsis or isinstance(k, (int, np.integer, slice))) or isinstance(k, bool):
+            raise TypeError("Only basic indexing (integers, slices, None, Ellipsis) is supported.", type(k))
+    if Ellipsis not in key:
+        key += (Ellipsis,)
+    return key
+
+
+def _getitem_backward(key: tuple, grad, operands, index):
+    x = operands[index].data
+    pool = _memory_pool._active
+    out = np.zeros(x.shape, dtype=grad.dtype) if pool is None else pool.empty(x.shape, grad.dtype)
+    if pool is not None:
+        out.fill(0)
+    out[key] = grad
+    return out
+
+
+class _VersionCounter:
+    """Number of in-place modifications of an array, shared by a tensor and its views."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+
+# bumped whenever the grad of a tensor is assigned or mytorch replaces the data array of one, so
+# optimizers holding views of them (optim.SGD) only have to look for replaced arrays when it changed
+_rebinds = _VersionCounter()
+
+
+def _before_inplace(t: "Tensor", data: np.ndarray) -> "Tensor":
+    """
+    Tensor standing for t as it was before an in-place operation in the graph: it has the grad_op of t
+    and data holds what the backward of the in-place operation needs (a copy or just shape and dtype).
+    """
+    old = Tensor.__new__(Tensor)
+    old.data = data
+    old.requires_grad = t.requires_grad
+    old._grad = None
+    old.grad_op = t.grad_op
+    old._is_inference = t._is_inference
+    old._pool = None
+    old._version_counter = None
+    old.sparse_grad = False
+    return old
+
+
+def _inplace_kernel(ufunc, saved: np.ndarray, x: np.ndarray, y: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Replays an in-place operation (graph capture), refreshing the copy of the old value its backward uses."""
+    if saved is not None:
+        np.copyto(saved, x)
+    return ufunc(x, y, out=out)
+
+
+_VIEW_OPS = frozenset(("tensor-reshape", "tensor-view", "tensor-permute", "tensor-getitem"))
 
 
 class Tensor:
@@ -14,14 +179,135 @@ class Tensor:
     backward() method accumulates gradients.
     Numpy is used under the hood for efficiency.
     """
-    def __init__(self, data: np.ndarray | list, requires_grad: bool = True):
-        if isinstance(data, list):
+    __slots__ = ("data", "requires_grad", "_grad", "grad_op", "_is_inference", "_pool", "_version_counter", "sparse_grad", "__weakref__")
+    __array_ufunc__ = None  # numpy defers to the reflected operators, e.g. ndarray + Tensor -> Tensor.__radd__
+
+    def __init__(self, data: np.ndarray | list, requires_grad: bool = True, dtype=None):
+        if dtype is not None:
+            data = np.asarray(data, dtype=dtype)
+        elif isinstance(data, list):
             data = np.array(data)
+            if data.dtype.kind == "f":
+                data = data.astype(_dtype._default_dtype, copy=False)
         self.data = data
-        self.dim = data.shape
         self.requires_grad = requires_grad
-        self.grad = None
+        self._grad = None
         self.grad_op: GradOperation = None  # operation that created this tensor
+        self._is_inference = _grad_mode.inference  # created inside inference_mode()
+        self._pool = None  # buffer pool data was taken from
+        self._version_counter = None  # _VersionCounter, created on the first in-place operation or view
+        self.sparse_grad = False  # whether sparse products give this leaf a row sparse gradient (opt-in)
+
+    def __del__(self, _getrefcount=sys.getrefcount):
+        # give pooled buffers back once nothing else references them (slot + argument)
+        if self._pool is not None and _getrefcount(self.data) == 2:
+            self._pool.release(self.data)
+
+    @classmethod
+    def _from_op(cls, data: np.ndarray, op_name: str, backward_fn: callable, operands: list,
+                 kernel: callable = None, pool=None, saved: tuple = None) -> "Tensor":
+        """
+        Creates the result tensor of an operation and records the GradOperation
+        if grad mode is enabled and any operand requires grad.
+        kernel(*operand_arrays, out=array) recomputes the result in place (used by graph capture),
+        operations without one must return a view of an operand, which replay keeps up to date.
+        pool is the buffer pool data was taken from.
+        saved holds the indices of the operands whose data backward_fn reads (None: all of them),
+        only those must not be modified in place before backward.
+        """
+        t = cls(data, requires_grad=False)
+        t._pool = pool
+        if _capture.tape is not None:
+            if kernel is not None:
+                _capture.tape.append((kernel, operands, t))
+            elif not any(np.may_share_memory(data, operand.data) for operand in operands):
+                raise RuntimeError("Operation", op_name, "has no replay kernel and cannot be captured.")
+        if not _grad_mode.enabled:
+            return t
+        if not any(operand.requires_grad for operand in operands):
+            return t
+        for operand in operands:
+            if operand._is_inference:
+                raise RuntimeError("Inference tensors cannot be used in operations that record a graph.")
+        t.requires_grad = True
+        t.grad_op = GradOperation(op_name, backward_fn, operands, saved)
+        return t
+
+    @property
+    def grad(self):
+        """Gradient accumulated by backward (Tensor, RowSparseTensor for sparse_grad leaves, or None)."""
+        return self._grad
+
+    @grad.setter
+    def grad(self, grad):
+        self._grad = grad
+        _rebinds.value += 1
+
+    @property
+    def dim(self) -> tuple:
+        """Shape of the tensor (derived from data, without the batch axis inside vmap)."""
+        level = _vmap.level
+        if level is not None and id(self) in level.batched:
+            return self.data.shape[1:]
+        return self.data.shape
+
+    @property
+    def _version(self) -> int:
+        """Number of in-place modifications of the data (through self or a view sharing it)."""
+        counter = self._version_counter
+        return 0 if counter is None else counter.value
+
+    def _shared_version(self) -> _VersionCounter:
+        """Version counter of self, to be shared with views of self."""
+        if self._version_counter is None:
+            self._version_counter = _VersionCounter()
+        return self._version_counter
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Dtype of the tensor (derived from data)."""
+        return self.data.dtype
+
+    def to(self, dtype) -> "Tensor":
+        """
+        Returns the tensor cast to dtype (self if it already is of that dtype).
+        The gradient is cast back to the dtype of self.
+
+        :param dtype: goal dtype
+        :type dtype: np.dtype
+        """
+        dtype = np.dtype(dtype)
+        if dtype == self.data.dtype:
+            return self
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-cast", Tensor.to, self, dtype)
+        level = _vmap.level
+        if level is not None:
+            return level.unary(Tensor.to, self, dtype)
+        return Tensor._from_op(self.data.astype(dtype), "tensor-cast", Tensor._cast_backward, [self], _cast_into, saved=())
+
+    @classmethod
+    def _cast_backward(cls, grad, operands, index):
+        return grad.astype(operands[index].data.dtype, copy=False)
+
+    def is_inference(self) -> bool:
+        """Returns whether this tensor was created inside inference_mode()."""
+        return self._is_inference
+
+    def _wrap_operand(self, other) -> "Tensor":
+        """
+        Wraps python scalars and numpy arrays into constant tensors (requires_grad == False).
+        Python scalars take the dtype of self where possible, like in numpy.
+        Returns NotImplemented for unsupported types.
+        """
+        if isinstance(other, Tensor):
+            return other
+        if isinstance(other, (int, float, bool)):
+            return Tensor(np.asarray(other, dtype=np.result_type(self.data.dtype, other)), requires_grad=False)
+        if isinstance(other, (np.ndarray, np.generic)):
+            return Tensor(np.asarray(other), requires_grad=False)
+        return NotImplemented
 
     def __eq__(self, other: "Tensor"):
         if not isinstance(other, Tensor):
@@ -55,82 +341,332 @@ class Tensor:
     def __add__(self, other: "Tensor"):
         """
         Tensor addition (returns new tensor).
+        Operands are broadcast against each other like in numpy.
 
         :param self: First Tensor opperand
-        :param other: Second Tensor opperand
+        :param other: Second Tensor opperand (Tensor, numpy array or python scalar)
         :type other: Tensor
         """
-        if not isinstance(other, Tensor):
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-add", Tensor.__add__, self, other)
+        level = _vmap.level
+        if level is not None:
+            return level.elementwise(Tensor.__add__, self, other)
+        if _lazy_mode.enabled:
+            from .fusion import LazyTensor
+            return LazyTensor._from_op("add", self, other)
+        other = self._wrap_operand(other)
+        if other is NotImplemented:
             return NotImplemented
-        if not self.dim == other.dim:
-            raise ValueError("Dimensions of operands of tensor addition must be equal:", self.dim, "!=", other.dim)
-        t = Tensor(self.data + other.data, requires_grad=self.requires_grad or other.requires_grad)
-        t.grad_op = GradOperation("tensor-add", Tensor._add_backward, [self, other])
-        return t
+        pool = _memory_pool._active
+        if pool is None and _dtype._autocast.dtype is None:
+            data = self.data + other.data
+        else:
+            data = _ufunc(np.add, self.data, other.data, pool)
+        return Tensor._from_op(data, "tensor-add", Tensor._add_backward, [self, other], np.add, pool, saved=())
 
     def __radd__(self, other: "Tensor"):
         return self.__add__(other)
 
     @classmethod
-    def _add_backward(cls, self, operands):
-        return Tensor(np.ones_like(self.data), requires_grad=False)
+    def _add_backward(cls, grad, operands, index):
+        # identity: the incoming gradient is passed through without a copy (unless it was broadcast)
+        return _reduce_to_shape(grad, operands[index].data.shape)
 
     def __mul__(self, other: "Tensor"):
         """
         Tensor element-wise multiplication (returns new tensor).
+        Operands are broadcast against each other like in numpy.
 
         :param self: First Tensor opperand
-        :param other: Second Tensor opperand
+        :param other: Second Tensor opperand (Tensor, numpy array or python scalar)
         :type other: Tensor
         """
-        if not isinstance(other, Tensor):
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-elem-mult", Tensor.__mul__, self, other)
+        level = _vmap.level
+        if level is not None:
+            return level.elementwise(Tensor.__mul__, self, other)
+        if _lazy_mode.enabled:
+            from .fusion import LazyTensor
+            return LazyTensor._from_op("mul", self, other)
+        other = self._wrap_operand(other)
+        if other is NotImplemented:
             return NotImplemented
-        if not self.dim == other.dim:
-            raise ValueError("Dimensions of operands of tensor addition must be equal:", self.dim, "!=", other.dim)
-        t = Tensor(np.multiply(self.data, other.data), requires_grad=self.requires_grad or other.requires_grad)
-        t.grad_op = GradOperation("tensor-elem-mult", Tensor._elem_mul_backward, [self, other])
-        return t
+        pool = _memory_pool._active
+        if pool is None and _dtype._autocast.dtype is None:
+            data = np.multiply(self.data, other.data)
+        else:
+            data = _ufunc(np.multiply, self.data, other.data, pool)
+        return Tensor._from_op(data, "tensor-elem-mult", Tensor._elem_mul_backward, [self, other], np.multiply, pool)
 
     def __rmul__(self, other: "Tensor"):
         return self.__mul__(other)
 
     @classmethod
-    def _elem_mul_backward(cls, self, operands):
-        if len(operands) != 1:
-            raise ValueError("Backward pass for tensor addition with more than 2 operands is not supported.")
-        return Tensor(operands[0].data, requires_grad=False)
+    def _elem_mul_backward(cls, grad, operands, index):
+        if len(operands) != 2:
+            raise ValueError("Backward pass for tensor multiplication with more than 2 operands is not supported.")
+        pool = _memory_pool._active
+        if pool is None:
+            return _reduce_to_shape(np.multiply(grad, operands[1 - index].data), operands[index].data.shape)
+        out = pool.empty(np.broadcast_shapes(grad.shape, operands[1 - index].data.shape), np.result_type(grad, operands[1 - index].data))
+        return _reduce_to_shape(np.multiply(grad, operands[1 - index].data, out=out), operands[index].data.shape)
 
-    def backward(self, grad_out=None):
+    def _inplace(self, ufunc, other, op_name: str, backward_fn: callable, needs_self: bool) -> "Tensor":
+        """
+        Computes ufunc(self, other) into the data of self and bumps its version, so graph nodes that saved
+        self raise on backward. If a graph is recorded, self becomes the result of the operation applied to
+        its old value (copied only if needs_self, i.e. the gradient of other depends on it).
+        """
+        other = self._wrap_operand(other)
+        if other is NotImplemented:
+            return NotImplemented
+        if np.broadcast_shapes(self.data.shape, other.data.shape) != self.data.shape:
+            raise ValueError("In-place operation cannot broadcast operand of dim", other.dim, "to dim", self.dim)
+        record = _grad_mode.enabled and (self.requires_grad or other.requires_grad)
+        saved = None
+        if record:
+            if self.requires_grad and self.grad_op is None:
+                raise RuntimeError("A leaf tensor that requires grad cannot be modified in-place (use no_grad()).")
+            op = self.grad_op
+            if op is not None and op.op_name in _VIEW_OPS and op.operands is not None and np.may_share_memory(self.data, op.operands[0].data):
+                raise RuntimeError("Views of tensors that require grad cannot be modified in-place.")
+            if self._is_inference or other._is_inference:
+                raise RuntimeError("Inference tensors cannot be used in operations that record a graph.")
+            if needs_self and other.requires_grad:
+                saved = self.data.copy()
+                old = _before_inplace(self, saved)
+            else:
+                old = _before_inplace(self, np.broadcast_to(np.empty((), self.data.dtype), self.data.shape))
+            operands = [old, old if other is self else other]
+        ufunc(self.data, other.data, out=self.data)
+        self._shared_version().value += 1
+        if _capture.tape is not None:
+            _capture.tape.append((functools.partial(_inplace_kernel, ufunc, saved), [self, other], self))
+        if record:
+            self.requires_grad = True
+            self.grad_op = GradOperation(op_name, backward_fn, operands, None if needs_self else ())
+        return self
+
+    def add_(self, other) -> "Tensor":
+        """
+        In-place tensor addition: adds other (broadcast to the shape of self) into the data of self.
+        Raises on backward if self was saved for the gradient of another operation.
+
+        :param other: Tensor, numpy array or python scalar
+        :type other: Tensor
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-add_", Tensor.add_, self, other)
+        level = _vmap.level
+        if level is not None and (level.is_batched(self) or level.is_batched(other)):
+            raise RuntimeError("In-place operations are not supported on batched tensors inside vmap.")
+        result = self._inplace(np.add, other, "tensor-add", Tensor._add_backward, needs_self=False)
+        if result is NotImplemented:
+            raise TypeError("unsupported operand type for add_:", type(other))
+        return result
+
+    def mul_(self, other) -> "Tensor":
+        """
+        In-place element-wise multiplication: multiplies the data of self by other (broadcast to the shape of self).
+        Raises on backward if self was saved for the gradient of another operation.
+
+        :param other: Tensor, numpy array or python scalar
+        :type other: Tensor
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-elem-mult_", Tensor.mul_, self, other)
+        level = _vmap.level
+        if level is not None and (level.is_batched(self) or level.is_batched(other)):
+            raise RuntimeError("In-place operations are not supported on batched tensors inside vmap.")
+        result = self._inplace(np.multiply, other, "tensor-elem-mult", Tensor._elem_mul_backward, needs_self=True)
+        if result is NotImplemented:
+            raise TypeError("unsupported operand type for mul_:", type(other))
+        return result
+
+    def __iadd__(self, other) -> "Tensor":
+        return self.add_(other)
+
+    def __imul__(self, other) -> "Tensor":
+        return self.mul_(other)
+
+    def backward(self, grad_out=None, retain_graph: bool = False):
+        """
+        Backpropagates grad_out through the graph that created this tensor
+        and accumulates the gradients into the leaf tensors.
+        The graph is freed on the way unless retain_graph is set.
+
+        :param grad_out: gradient of this tensor
+        :type grad_out: Tensor
+        :param retain_graph: whether the graph is kept for another backward pass
+        :type retain_graph: bool
+        """
         if grad_out == None:
             if not self.requires_grad:
                 raise ValueError("Cannot perform backward in tensor that has .requires_grad == False.")
             if self.grad_op == None:
                 raise ValueError("Cannot perform backward when no operation has been performed on this tensor.")
             raise NotImplementedError()
+        if not self.requires_grad:
+            return
+        if grad_out.dim != self.dim:
+            raise ValueError("Grad must be of same dim as tensor.")
+        autograd.backward(self, grad_out.data, retain_graph=retain_graph)
+
+    def _accumulate_grad(self, grad: np.ndarray):
+        """
+        Accumulates grad into the gradient buffer of this (leaf) tensor.
+        The buffer is allocated once and then updated in place.
+        Gradients of floating point tensors are accumulated in the dtype of the tensor.
+        Row sparse gradients (sparse.RowSparseTensor, for leaves with sparse_grad set) are kept sparse
+        until a dense gradient arrives.
+        """
+        if isinstance(grad, np.generic):
+            grad = np.asarray(grad)  # numpy ops on 0-d arrays return scalars
+        if not isinstance(grad, np.ndarray) or (self.grad is not None and not isinstance(self.grad, Tensor)):
+            self._accumulate_sparse_grad(grad)
+        elif self.grad is None:
+            dtype = self.data.dtype if self.data.dtype.kind in "fc" else np.result_type(self.data, grad)
+            buffer = self._grad_buffer(dtype)
+            np.copyto(buffer, grad)
+            self.grad = Tensor(buffer, requires_grad=False)
         else:
-            if not self.requires_grad:
-                # stop recursion
-                return
-            if grad_out.dim != self.dim:
-                raise ValueError("Grad must be of same dim as tensor.")
-            if self.grad_op == None:
-                # leaf node
-                if self.grad == None:
-                    self.grad = grad_out
-                else:
-                    # if grad exists, accumulate
-                    self.grad += grad_out
-                return
-        # keep propagating
-        self.grad_op.backward(grad_out)
+            np.add(self.grad.data, grad, out=self.grad.data)
+
+    def _grad_buffer(self, dtype: np.dtype) -> np.ndarray:
+        """Gradient buffer, memory-mapped to a temporary file for memory-mapped data over out_of_core.MEMORY_BUDGET."""
+        from . import out_of_core
+        if self.data.nbytes > out_of_core.MEMORY_BUDGET and out_of_core._is_mapped(self.data):
+            return out_of_core._temporary(self.data.shape, dtype)
+        return np.empty(self.data.shape, dtype=dtype)
 
-    def reshape(self, shape: tuple):
+    def _accumulate_sparse_grad(self, grad):
+        from .sparse import RowSparseTensor
+        if self.grad is None:
+            self.grad = RowSparseTensor(grad.rows, grad.values.astype(self.data.dtype, copy=False), grad.shape)
+        elif isinstance(self.grad, RowSparseTensor) and isinstance(grad, RowSparseTensor):
+            self.grad = self.grad + grad
+        elif isinstance(self.grad, RowSparseTensor):
+            sparse, self.grad = self.grad, None
+            self._accumulate_grad(grad)
+            sparse.add_to(self.grad.data)
+        else:
+            grad.add_to(self.grad.data)
+
+    def zero_grad(self):
         """
-        Reshapes data to given shape.
+        Sets the gradient to zero, reusing its buffer.
+        """
+        if isinstance(self.grad, Tensor):
+            self.grad.data.fill(0)
+        elif self.grad is not None:
+            self.grad = None
 
-        :param shape: goal shape
+    def reshape(self, *shape) -> "Tensor":
+        """
+        Returns a tensor with the same data in the given shape (a view if possible, like numpy).
+        self is not modified. The gradient is reshaped back.
+
+        :param shape: goal shape (tuple or ints, one entry may be -1)
         :type shape: tuple
         """
-        self.data = self.data.reshape(shape)
-        self.dim = shape
-        return self
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-reshape", Tensor.reshape, self, *shape)
+        level = _vmap.level
+        if level is not None:
+            return level.reshape(Tensor.reshape, self, shape)
+        shape = _shape_arg(shape)
+        data = self.data.reshape(shape)
+        if not np.may_share_memory(data, self.data):
+            return Tensor._from_op(data, "tensor-reshape", Tensor._reshape_backward, [self], _reshape_into, saved=())
+        t = Tensor._from_op(data, "tensor-reshape", Tensor._reshape_backward, [self], saved=())
+        t._version_counter = self._shared_version()
+        return t
+
+    def view(self, *shape) -> "Tensor":
+        """
+        Returns a tensor sharing the data of self in the given shape.
+        Raises a ValueError if the data cannot be viewed in that shape without a copy.
+
+        :param shape: goal shape (tuple or ints, one entry may be -1)
+        :type shape: tuple
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-view", Tensor.view, self, *shape)
+        level = _vmap.level
+        if level is not None:
+            return level.reshape(Tensor.view, self, shape)
+        shape = _shape_arg(shape)
+        try:
+            data = np.reshape(self.data, shape, copy=False)
+        except ValueError as e:
+            raise ValueError("Cannot view tensor of dim", self.dim, "in shape", shape, "without a copy.") from e
+        t = Tensor._from_op(data, "tensor-view", Tensor._reshape_backward, [self], saved=())
+        t._version_counter = self._shared_version()
+        return t
+
+    @classmethod
+    def _reshape_backward(cls, grad, operands, index):
+        return grad.reshape(operands[index].data.shape)
+
+    def permute(self, *dims) -> "Tensor":
+        """
+        Returns a view of self with permuted axes. The gradient is permuted back (also without a copy).
+
+        :param dims: new order of the axes (tuple or ints)
+        :type dims: tuple
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-permute", Tensor.permute, self, *dims)
+        level = _vmap.level
+        if level is not None:
+            return level.permute(self, dims)
+        dims = _shape_arg(dims)
+        ndim = self.data.ndim
+        if len(dims) != ndim or any(not -ndim <= d < ndim for d in dims) or sorted(d % ndim for d in dims) != list(range(ndim)):
+            raise ValueError("Invalid permutation", dims, "for tensor of dim", self.dim)
+        dims = tuple(d % ndim for d in dims)
+        t = Tensor._from_op(self.data.transpose(dims), "tensor-permute", functools.partial(_permute_backward, dims), [self],
+                            saved=())
+        t._version_counter = self._shared_version()
+        return t
+
+    def transpose(self, dim0: int, dim1: int) -> "Tensor":
+        """
+        Returns a view of self with the axes dim0 and dim1 swapped.
+
+        :param dim0: first axis
+        :type dim0: int
+        :param dim1: second axis
+        :type dim1: int
+        """
+        dims = list(range(len(self.dim)))
+        dims[dim0], dims[dim1] = dims[dim1], dims[dim0]
+        return self.permute(dims)
+
+    def __getitem__(self, key) -> "Tensor":
+        """
+        Basic indexing (integers, slices, None and Ellipsis) like in numpy; returns a view of self.
+        The gradient is scattered into a zero gradient of the shape of self.
+
+        :param key: index
+        :type key: int | slice | tuple
+        """
+        prof = _profiler._active
+        if prof is not None and not prof._busy:
+            return prof.call("tensor-getitem", Tensor.__getitem__, self, key)
+        level = _vmap.level
+        if level is not None:
+            return level.getitem(self, key)
+        key = _basic_index(key)
+        t = Tensor._from_op(self.data[key], "tensor-getitem", functools.partial(_getitem_backward, key), [self], saved=())
+        t._version_counter = self._shared_version()
+        return t
@@ -2,15 +2,115 @@
 Implements Tensor multiplication for arbitrary number of dimensions.
 """
 
+import functools
+
 import numpy as np
 
-from .tensor import Tensor
+from mytorch.autograd import is_grad_enabled
+from mytorch.memory import pool as _memory_pool
+from mytorch.profiler import profiler as _profiler
+
+from .tensor import Tensor, _autocast_dtype, _blas_operands, _vmap
+from .sparse import SparseTensor, tmult_sparse
+from .fusion import _materialize
+from . import out_of_core as _out_of_core
+
+
+class _TMultPlan:
+    """
+    Validated contraction of two operand shapes.
+    Holds the output shape and the axes needed to compute the gradients.
+    """
+    __slots__ = ("axes", "dim_out", "grad_x_axes", "grad_x_perm", "grad_y_axes", "grad_y_perm",
+                 "x_perm", "y_perm", "x_2d", "y_2d", "out_2d")
+
+    def __init__(self, x_dim: tuple, y_dim: tuple, x_axes: tuple, y_axes: tuple):
+        x_free = [i for i in range(len(x_dim)) if i not in x_axes]
+        y_free = [i for i in range(len(y_dim)) if i not in y_axes]
+        n_x_free = len(x_free)
+        self.axes = (list(x_axes), list(y_axes))
+        self.dim_out = tuple(x_dim[i] for i in x_free) + tuple(y_dim[i] for i in y_free)
+        # grad_x = tensordot(grad, y) has the axes x_free + (x axes matching y_axes in ascending order)
+        by_y = sorted(range(len(y_axes)), key=lambda i: y_axes[i])
+        self.grad_x_axes = (list(range(n_x_free, len(self.dim_out))), y_free)
+        self.grad_x_perm = tuple(np.argsort(x_free + [x_axes[i] for i in by_y]))
+        # grad_y = tensordot(x, grad) has the axes (y axes matching x_axes in ascending order) + y_free
+        by_x = sorted(range(len(x_axes)), key=lambda i: x_axes[i])
+        self.grad_y_axes = (x_free, list(range(n_x_free)))
+        self.grad_y_perm = tuple(np.argsort([y_axes[i] for i in by_x] + y_free))
+        # tensordot as a single 2d matmul: x -> (free, contracted), y -> (contracted, free)
+        m = int(np.prod([x_dim[i] for i in x_free]))
+        k = int(np.prod([x_dim[i] for i in x_axes]))
+        n = int(np.prod([y_dim[i] for i in y_free]))
+        self.x_perm = tuple(x_free) + tuple(x_axes)
+        self.y_perm = tuple(y_axes) + tuple(y_free)
+        self.x_2d = (m, k)
+        self.y_2d = (k, n)
+        self.out_2d = (m, n)
 
 
-def tmult(x: Tensor, y: Tensor, axes: tuple[list], dim_out: tuple) -> Tensor:
+@functools.lru_cache(maxsize=1024)
+def _tmult_plan(x_dim: tuple, y_dim: tuple, x_axes: tuple, y_axes: tuple) -> _TMultPlan:
+    """
+    Validates the axes for the given operand shapes and builds the contraction plan.
+    Cached per (shapes, axes) signature, errors are not cached.
+    """
+    if len(x_axes) != len(y_axes):
+        raise ValueError("axes given for both operands must be of same length")
+    for i in range(len(x_axes)):
+        if x_axes[i] < 0 or x_axes[i] >= len(x_dim):
+            raise ValueError("axis", x_axes[i], "given at index", i, "for first operand is not valid")
+        if y_axes[i] < 0 or y_axes[i] >= len(y_dim):
+            raise ValueError("axis", y_axes[i], "given at index", i, "for second operand is not valid")
+        if x_dim[x_axes[i]] != y_dim[y_axes[i]]:
+            raise ValueError("axes at index", i, "do not match:", x_dim[x_axes[i]], "!=", y_dim[y_axes[i]])
+    return _TMultPlan(x_dim, y_dim, x_axes, y_axes)
+
+
+def _tmult_into(plan: _TMultPlan, x: np.ndarray, y: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Computes tensordot(x, y) as a single 2d matmul written straight into out (C-contiguous).
+    If out has another dtype than the result (autocast), the result is computed first and then stored.
+    """
+    x_2d, y_2d = _blas_operands(x.transpose(plan.x_perm).reshape(plan.x_2d), y.transpose(plan.y_perm).reshape(plan.y_2d))
+    if out.dtype == np.result_type(x_2d, y_2d):
+        np.dot(x_2d, y_2d, out=out.reshape(plan.out_2d))
+    else:
+        np.copyto(out.reshape(plan.out_2d), np.dot(x_2d, y_2d), casting="unsafe")
+    return out
+
+
+def _tmult_backward(plan: _TMultPlan, grad, operands, index):
+    x, y = operands
+    if index == 0:
+        grad, y_data = _blas_operands(grad, y.data)
+        return np.tensordot(grad, y_data, axes=plan.grad_x_axes).transpose(plan.grad_x_perm)
+    x_data, grad = _blas_operands(x.data, grad)
+    return np.tensordot(x_data, grad, axes=plan.grad_y_axes).transpose(plan.grad_y_perm)
+
+
+def _tmult_out_of_core_backward(plan: _TMultPlan, blocking, grad, operands, index):
+    x, y = operands
+    if index == 0:
+        grad_plan = _tmult_plan(grad.shape, y.data.shape, *map(tuple, plan.grad_x_axes))
+        return blocking.run(grad_plan, grad, y.data, np.result_type(grad, y.data)).transpose(plan.grad_x_perm)
+    grad_plan = _tmult_plan(x.data.shape, grad.shape, *map(tuple, plan.grad_y_axes))
+    return blocking.run(grad_plan, x.data, grad, np.result_type(x.data, grad)).transpose(plan.grad_y_perm)
+
+
+def tmult(x: Tensor, y: Tensor, axes: tuple[list], dim_out: tuple, *, out: np.ndarray = None,
+          memory_budget: int = None, tile=None, num_workers: int = 0) -> Tensor:
     """
     Tensor multiplication for two tensors x and y.
     The output shape must be given explicitly.
+    One operand may be a SparseTensor (see sparse.tmult_sparse).
+
+    Contractions over memory-mapped operands (np.memmap, mytorch.load(..., mmap=True)) that exceed
+    out_of_core.MEMORY_BUDGET, or any contraction given a memory_budget, tile or num_workers, run
+    out-of-core: blocked, with at most memory_budget bytes of tiles in memory (per worker), into an
+    output that is memory-mapped to a temporary file if it exceeds the budget. The backward pass is
+    blocked alike; the gradient of a memory-mapped leaf over the budget is accumulated in a
+    memory-mapped temporary file as well.
     
     :param x: first operand
     :type x: Tensor
@@ -20,7 +120,30 @@ def tmult(x: Tensor, y: Tensor, axes: tuple[list], dim_out: tuple) -> Tensor:
     :type axes: tuple[list]
     :param dim_out: expected dimensions of the output
     :type dim_out: tuple
+    :param out: C-contiguous array of shape dim_out the result is stored into, e.g. an np.memmap
+    :type out: np.ndarray
+    :param memory_budget: bytes of operand and result tiles held in memory at a time (per worker)
+    :type memory_budget: int
+    :param tile: (rows, columns, contracted) tile size of the blocked matmul, or one int for all three
+    :type tile: int | tuple
+    :param num_workers: number of threads computing output tiles (0 computes them in the calling thread)
+    :type num_workers: int
     """
+    x, y = _materialize(x), _materialize(y)
+    options = out is not None or memory_budget is not None or tile is not None or num_workers != 0
+    prof = _profiler._active
+    if prof is not None and not prof._busy:
+        fn = functools.partial(tmult, out=out, memory_budget=memory_budget, tile=tile, num_workers=num_workers) if options else tmult
+        return prof.call("tensor-mult", fn, x, y, axes, dim_out)
+    level = _vmap.level
+    if level is not None:
+        if options:
+            raise TypeError("out-of-core options of tmult are not supported inside vmap")
+        return level.tmult(x, y, axes, dim_out)
+    if isinstance(x, SparseTensor) or isinstance(y, SparseTensor):
+        if options:
+            raise TypeError("out-of-core options of tmult are not supported for sparse operands")
+        return tmult_sparse(x, y, axes, dim_out)
     if not isinstance(x, Tensor):
         raise TypeError("first operand of tensor multiplication must be of type Tensor")
     if not isinstance(y, Tensor):
@@ -34,19 +157,135 @@ def tmult(x: Tensor, y: Tensor, axes: tuple[list], dim_out: tuple) -> Tensor:
         raise TypeError("axes given for first operand must be of type list")
     if not isinstance(y_axes, list):
         raise TypeError("axes given for second operand must be of type list")
-    if len(x_axes) != len(y_axes):
-        raise ValueError("axes given for both operands must be of same length")
-    for i in range(len(x_axes)):
-        if x_axes[i] < 0 or x_axes[i] >= len(x.dim):
-            raise ValueError("axis", x_axes[i], "given at index", i, "for first operand is not valid")
-        if y_axes[i] < 0 or y_axes[i] >= len(y.dim):
-            raise ValueError("axis", y_axes[i], "given at index", i, "for second operand is not valid")
-        if x.dim[x_axes[i]] != y.dim[y_axes[i]]:
-            raise ValueError("axes at index", i, "do not match:", x.dim[x_axes[i]], "!=", y.dim[y_axes[i]])
 
-    t = Tensor(np.tensordot(x.data,y.data,axes=axes), requires_grad=x.requires_grad or y.requires_grad)
+    plan = _tmult_plan(x.dim, y.dim, tuple(x_axes), tuple(y_axes))
+    if plan.dim_out != tuple(dim_out):
+        raise ValueError("output of tensor multiplication is not of expected shape", dim_out, "but instead of shape", plan.dim_out)
+
+    if out is not None and (out.shape != plan.dim_out or not out.flags.c_contiguous or not out.flags.writeable):
+        raise ValueError("out of tensor multiplication must be a writable C-contiguous array of shape", plan.dim_out)
+
+    dtype = _autocast_dtype(x.data, y.data)
+    if dtype is None:
+        dtype = np.result_type(x.data, y.data)
+    if memory_budget is not None or tile is not None or num_workers != 0 or (
+            (_out_of_core._is_mapped(x.data) or _out_of_core._is_mapped(y.data))
+            and x.data.nbytes + y.data.nbytes + int(np.prod(plan.dim_out)) * dtype.itemsize > _out_of_core.MEMORY_BUDGET):
+        blocking = _out_of_core._Blocking(memory_budget, tile, num_workers)
+        data = blocking.into(plan, x.data, y.data, blocking.output(plan.dim_out, dtype) if out is None else out)
+        return Tensor._from_op(data, "tensor-mult", functools.partial(_tmult_out_of_core_backward, plan, blocking), [x, y],
+                               functools.partial(blocking.into, plan))
+
+    pool = _memory_pool._active if out is None else None
+    if out is None and pool is None and dtype != np.float16:
+        data = np.tensordot(x.data, y.data, axes=plan.axes)
+    else:
+        if out is None:
+            out = np.empty(plan.dim_out, dtype) if pool is None else pool.empty(plan.dim_out, dtype)
+        data = _tmult_into(plan, x.data, y.data, out=out)
+    kernel = functools.partial(_tmult_into, plan)
+    return Tensor._from_op(data, "tensor-mult", functools.partial(_tmult_backward, plan), [x, y], kernel, pool)
+
+
+class _EinsumPlan:
+    """
+    Validated einsum expression for a set of operand shapes.
+    Holds the optimal contraction path found by np.einsum_path.
+    """
+    __slots__ = ("inputs", "output", "path", "sizes")
+
+    def __init__(self, subscripts: str, shapes: tuple):
+        subscripts = subscripts.replace(" ", "")
+        if "." in subscripts:
+            raise ValueError("ellipsis is not supported in einsum subscripts")
+        if "->" in subscripts:
+            inputs, output = subscripts.split("->")
+        else:
+            inputs = subscripts
+            letters = inputs.replace(",", "")
+            output = "".join(sorted(c for c in set(letters) if letters.count(c) == 1))
+        self.inputs = inputs.split(",")
+        self.output = output
+        if len(self.inputs) != len(shapes):
+            raise ValueError("einsum expression has", len(self.inputs), "operands but", len(shapes), "were given")
+        self.sizes = {}
+        for i, (sub, shape) in enumerate(zip(self.inputs, shapes)):
+            if len(sub) != len(shape):
+                raise ValueError("subscripts", sub, "of operand", i, "do not match its dimensions", shape)
+            for c, n in zip(sub, shape):
+                if self.sizes.setdefault(c, n) != n:
+                    raise ValueError("size of index", c, "does not match:", self.sizes[c], "!=", n)
+        for c in output:
+            if c not in self.sizes:
+                raise ValueError("output index", c, "does not appear in any operand")
+        dummies = [np.broadcast_to(np.zeros(()), shape) for shape in shapes]
+        self.path = np.einsum_path(inputs + "->" + output, *dummies, optimize="optimal")[0]
 
-    if t.dim != dim_out:
-        raise ValueError("output of tensor multiplication is not of expected shape", dim_out, "but instead of shape", t.dim)
 
-    return t
+@functools.lru_cache(maxsize=1024)
+def _einsum_plan(subscripts: str, shapes: tuple) -> _EinsumPlan:
+    """Builds the einsum plan, cached per (subscripts, shapes) signature."""
+    return _EinsumPlan(subscripts, shapes)
+
+
+def _run_einsum(inputs: list, output: str, arrays: list) -> np.ndarray:
+    subscripts = ",".join(inputs) + "->" + output
+    plan = _einsum_plan(subscripts, tuple(a.shape for a in arrays))
+    return _einsum_kernel(subscripts, plan.path, *arrays)
+
+
+def _einsum_kernel(subscripts: str, path: list, *arrays: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """np.einsum along a precomputed path, optionally stored into out of another dtype (autocast)."""
+    arrays = _blas_operands(*arrays)
+    if out is None or out.dtype == np.result_type(*arrays):
+        return np.einsum(subscripts, *arrays, out=out, optimize=path)
+    np.copyto(out, np.einsum(subscripts, *arrays, optimize=path), casting="unsafe")
+    return out
+
+
+def _einsum_backward(plan: _EinsumPlan, grad, operands, index):
+    target = plan.inputs[index]
+    others = [i for i in range(len(operands)) if i != index]
+    available = set(plan.output).union(*(plan.inputs[i] for i in others))
+    # indices that only appear in this operand were summed over, their gradient is broadcast
+    reduced = "".join(c for c in target if c in available)
+    result = _run_einsum([plan.output] + [plan.inputs[i] for i in others], reduced, [grad] + [operands[i].data for i in others])
+    if reduced == target:
+        return result
+    expanded = result.reshape(tuple(plan.sizes[c] if c in available else 1 for c in target))
+    return np.broadcast_to(expanded, operands[index].data.shape)
+
+
+def einsum(subscripts: str, *operands: Tensor) -> Tensor:
+    """
+    Tensor multiplication for an arbitrary number of tensors given in einsum notation, e.g. "ij,jk,kl->il".
+    The contraction order that keeps intermediate results smallest is chosen once per
+    (subscripts, shapes) signature and cached.
+
+    :param subscripts: einsum subscripts (without ellipsis)
+    :type subscripts: str
+    :param operands: tensors to multiply
+    :type operands: Tensor
+    """
+    operands = tuple(_materialize(operand) for operand in operands)
+    prof = _profiler._active
+    if prof is not None and not prof._busy:
+        return prof.call("tensor-einsum", einsum, subscripts, *operands)
+    level = _vmap.level
+    if level is not None:
+        return level.einsum(subscripts, operands)
+    for i, operand in enumerate(operands):
+        if not isinstance(operand, Tensor):
+            raise TypeError("operand", i, "of einsum must be of type Tensor")
+    plan = _einsum_plan(subscripts, tuple(operand.dim for operand in operands))
+    for sub, operand in zip(plan.inputs, operands):
+        if operand.requires_grad and is_grad_enabled() and len(set(sub)) != len(sub):
+            raise NotImplementedError("einsum gradient for repeated indices within one operand is not supported")
+
+    kernel = functools.partial(_einsum_kernel, ",".join(plan.inputs) + "->" + plan.output, plan.path)
+    arrays = [operand.data for operand in operands]
+    dtype = _autocast_dtype(*arrays)
+    if dtype is None:
+        dtype = np.result_type(*arrays)
+    data = kernel(*arrays).astype(dtype, copy=False)
+    return Tensor._from_op(data, "tensor-einsum", functools.partial(_einsum_backward, plan), list(operands), kernel)
@@ -0,0 +1,7 @@
+"""
+Package for training utilities.
+"""
+
+from .checkpoint import checkpoint, checkpoint_sequential
+
+__all__ = [checkpoint, checkpoint_sequential]
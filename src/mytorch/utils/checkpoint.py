@@ -0,0 +1,102 @@
+"""
+Implements gradient checkpointing for the MyTorch library.
+A checkpointed segment runs without recording a graph, so its intermediate activations are
+freed right away; only its inputs are kept. During backward the segment is run again with
+grad enabled and its local graph is backpropagated before being dropped.
+"""
+
+from mytorch import autograd
+from mytorch.autograd import JointGradOperation, enable_grad, is_grad_enabled, no_grad
+from mytorch.nn import Module
+from mytorch.tensor import Tensor
+
+
+def _segment_kernel(*arrays, out):
+    """Replay kernel (graph capture) of a checkpoint: the replayed steps of the segment already computed out."""
+
+
+def checkpoint(fn: callable, *tensors: Tensor) -> Tensor:
+    """
+    Runs fn(*tensors) without keeping its intermediate results for backward;
+    they are recomputed when the gradient reaches the segment.
+    Tensors requiring grad that fn uses must be passed as arguments,
+    unless they are parameters of fn itself (when fn is a module).
+
+    :param fn: segment mapping tensors to a tensor, must be deterministic
+    :type fn: callable
+    :param tensors: inputs of the segment
+    :type tensors: Tensor
+    """
+    for x in tensors:
+        if not isinstance(x, Tensor):
+            raise TypeError("inputs of checkpoint must be of type Tensor", type(x))
+    with no_grad():
+        out = fn(*tensors)
+    if not isinstance(out, Tensor):
+        raise TypeError("checkpointed function must return a tensor", type(out))
+    if not is_grad_enabled():
+        return out
+    params = list(fn.parameters()) if isinstance(fn, Module) else []
+    params = [param for param in params if all(param is not x for x in tensors)]
+    n_inputs = len(tensors)
+
+    def recompute(grad, operands):
+        inputs = [Tensor(x.data, requires_grad=x.requires_grad) for x in operands[:n_inputs]]
+        with enable_grad():
+            local_out = fn(*inputs)
+        # parameters are leaves of the local graph and accumulate their gradients directly
+        autograd.backward(local_out, grad)
+        grads = [None if x.grad is None else x.grad.data for x in inputs]
+        return grads + [None] * len(params)
+
+    t = Tensor._from_op(out.data, "checkpoint", None, list(tensors) + params, _segment_kernel)
+    if t.grad_op is not None:
+        t.grad_op = JointGradOperation("checkpoint", recompute, t.grad_op.operands)
+    return t
+
+
+def checkpoint_sequential(functions: list, segments: int, x: Tensor, every: int = 1) -> Tensor:
+    """
+    Runs functions one after another, split into the given number of segments.
+    Every every-th segment is checkpointed, starting with the first; the last segment
+    always keeps its activations since they are needed immediately by backward.
+
+    :param functions: sequence of functions (usually modules), each mapping a tensor to a tensor
+    :type functions: list
+    :param segments: number of segments
+    :type segments: int
+    :param x: input of the first function
+    :type x: Tensor
+    :param every: checkpoint policy, every-th segment is checkpointed
+    :type every: int
+    """
+    functions = list(functions)
+    if segments < 1:
+        raise ValueError("segments", segments, "number of segments must be positive")
+    if every < 1:
+        raise ValueError("every", every, "checkpoint interval must be positive")
+    size = -(-len(functions) // segments)
+    chunks = [functions[start:start + size] for start in range(0, len(functions), size)]
+
+    for k, chunk in enumerate(chunks):
+        segment = _Segment(chunk)
+        if k < len(chunks) - 1 and k % every == 0:
+            x = checkpoint(segment, x)
+        else:
+            x = segment(x)
+    return x
+
+
+class _Segment(Module):
+    """Runs a chunk of functions one after another; modules among them are registered as submodules."""
+    def __init__(self, functions: list):
+        super().__init__()
+        object.__setattr__(self, "functions", functions)
+        for i, fn in enumerate(functions):
+            if isinstance(fn, Module):
+                setattr(self, str(i), fn)
+
+    def forward(self, x: Tensor) -> Tensor:
+        for fn in self.functions:
+            x = fn(x)
+        return x
@@ -0,0 +1,70 @@
+"""Mixed precision tests for the amp package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult, einsum
+from mytorch.nn import Linear
+from mytorch.optim import SGD
+from mytorch.amp import autocast, GradScaler
+
+
+def _ones(t: Tensor) -> Tensor:
+    return Tensor(np.ones(t.dim), requires_grad=False)
+
+
+def test_autocast_activations_and_master_weights() -> None:
+    layer = Linear(4, 3)
+    x = Tensor(np.random.default_rng(0).standard_normal((5,4)), requires_grad=False, dtype=np.float32)
+    with autocast():
+        h = layer(x)
+        out = h * h + h
+    assert h.dtype == np.float16 and out.dtype == np.float16
+    assert layer.weight.dtype == np.float32
+    with autocast():
+        assert layer(x).grad_op.operands[1] is layer.weight
+    out.backward(_ones(out))
+    assert layer.weight.grad.dtype == np.float32
+
+    expected = layer(x)
+    (expected * expected + expected).backward(_ones(expected))
+    assert np.allclose(out.data, (expected * expected + expected).data, rtol=1e-2, atol=1e-2)
+
+    with autocast():
+        e = einsum("ij,kj->ik", h, h)
+    assert e.dtype == np.float16
+    assert np.allclose(e.data, h.data.astype(np.float32) @ h.data.astype(np.float32).T, rtol=1e-2, atol=1e-2)
+
+    @autocast(enabled=False)
+    def full(a):
+        return tmult(a, a, ([0], [0]), ())
+    with autocast():
+        assert full(Tensor([1.0, 2.0])).dtype == np.float32
+    with pytest.raises(TypeError):
+        autocast(np.int8)
+
+
+def test_grad_scaler() -> None:
+    p = Tensor([1.0, 2.0])
+    opt = SGD([p], lr=0.1)
+    scaler = GradScaler(init_scale=2.0**10, growth_interval=1)
+    with autocast():
+        loss = p * 1e-6
+    scaled = scaler.scale(loss)
+    assert scaled.dtype == np.float32
+    scaled.backward(_ones(scaled))
+    assert scaler.step(opt)
+    scaler.update()
+    assert np.allclose(p.data, [1.0 - 1e-7, 2.0 - 1e-7])
+    assert scaler.get_scale() == 2.0**11
+
+    opt.zero_grad()
+    loss = p.to(np.float16) * 1e3
+    scaled = scaler.scale(loss)
+    with np.errstate(over="ignore"):
+        scaled.backward(_ones(scaled))  # gradient overflows in float16 (cast backward)
+    before = p.data.copy()
+    assert not scaler.step(opt)
+    scaler.update()
+    assert (p.data == before).all()
+    assert scaler.get_scale() == 2.0**10
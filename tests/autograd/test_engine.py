@@ -0,0 +1,56 @@
+"""Backward engine tests for the autograd package."""
+
+import sys
+
+from mytorch.tensor import Tensor
+from mytorch.autograd import GradOperation
+
+
+def test_backward_deep_chain() -> None:
+    a = Tensor([1.0, 2.0])
+    c = Tensor([1.0, 1.0], requires_grad=False)
+    r = a
+    for _ in range(sys.getrecursionlimit() * 2):
+        r = r + c
+
+    r.backward(Tensor([1.0, 1.0]))
+
+    assert a.grad == Tensor([1.0, 1.0])
+    assert c.grad == None
+
+
+def test_backward_diamond_visits_each_node_once() -> None:
+    calls = []
+
+    def counting_mul_backward(grad, operands, index):
+        calls.append(1)
+        return Tensor._elem_mul_backward(grad, operands, index)
+
+    a = Tensor([1.0, 1.0])
+    r = a
+    depth = 30
+    for _ in range(depth):
+        prev = r
+        r = prev * prev
+        r.grad_op = GradOperation("tensor-elem-mult", counting_mul_backward, [prev, prev])
+
+    r.backward(Tensor([1.0, 1.0]))
+
+    # two operands per node, each node visited once
+    assert len(calls) == 2 * depth
+    # r = a^(2^depth), dr/da = 2^depth * a^(2^depth - 1)
+    assert (a.grad.data == 2.0 ** depth).all()
+
+
+def test_backward_sums_gradients_of_reused_tensor() -> None:
+    a = Tensor([1, 2])
+    b = Tensor([3, 4])
+    r1 = a * b
+    r2 = r1 + a
+    r3 = r2 * r1
+
+    r3.backward(Tensor([1, 1]))
+
+    # r3 = (a*b + a) * a*b = a^2*b^2 + a^2*b
+    assert a.grad == Tensor([24, 80])  # 2*a*b^2 + 2*a*b
+    assert b.grad == Tensor([7, 36])  # 2*a^2*b + a^2
@@ -0,0 +1,55 @@
+"""Gradient accumulation tests for the autograd package."""
+
+import numpy as np
+
+from mytorch.tensor import Tensor
+
+
+def test_grad_buffer_is_reused() -> None:
+    a = Tensor([1.0, 2.0])
+    b = Tensor([2.0, 3.0], requires_grad=False)
+
+    (a * b).backward(Tensor([1.0, 1.0]))
+    buffer = a.grad.data
+    assert a.grad == Tensor([2.0, 3.0])
+    assert a.grad.requires_grad == False
+    assert a.grad.grad_op is None
+
+    (a * b).backward(Tensor([1.0, 1.0]))
+    assert a.grad.data is buffer
+    assert a.grad == Tensor([4.0, 6.0])
+    assert a.grad.grad_op is None
+
+
+def test_zero_grad_reuses_buffer() -> None:
+    a = Tensor([1.0, 2.0])
+    a.zero_grad()
+    assert a.grad == None
+
+    (a + a).backward(Tensor([1.0, 1.0]))
+    buffer = a.grad.data
+    assert a.grad == Tensor([2.0, 2.0])
+
+    a.zero_grad()
+    assert a.grad.data is buffer
+    assert a.grad == Tensor([0.0, 0.0])
+
+    (a + a).backward(Tensor([3.0, 1.0]))
+    assert a.grad.data is buffer
+    assert a.grad == Tensor([6.0, 2.0])
+
+
+def test_add_backward_passes_gradient_through() -> None:
+    grad = np.array([1.0, 2.0])
+    operands = [Tensor([1.0, 1.0]), Tensor([2.0, 2.0])]
+    assert Tensor._add_backward(grad, operands, 0) is grad
+    assert Tensor._add_backward(grad, operands, 1) is grad
+
+
+def test_grad_out_is_not_modified() -> None:
+    a = Tensor([1.0, 2.0])
+    r = (a + a) + a
+    grad_out = Tensor([1.0, 1.0])
+    r.backward(grad_out)
+    assert a.grad == Tensor([3.0, 3.0])
+    assert grad_out == Tensor([1.0, 1.0])
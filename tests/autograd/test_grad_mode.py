@@ -0,0 +1,92 @@
+"""Grad mode tests for the autograd package."""
+
+import gc
+import weakref
+
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor, tmult
+
+
+def test_no_grad_context() -> None:
+    a = Tensor([1, 2])
+    b = Tensor([2, 3])
+    with mytorch.no_grad():
+        assert not mytorch.is_grad_enabled()
+        r = a * b + a
+        r2 = tmult(a, b, axes=([0], [0]), dim_out=())
+    assert mytorch.is_grad_enabled()
+
+    assert r.requires_grad == False
+    assert r.grad_op is None
+    assert r2.requires_grad == False
+    assert r == Tensor([3, 8])
+
+
+def test_no_grad_decorator() -> None:
+    @mytorch.no_grad()
+    def f(x, y):
+        return x + y
+
+    r = f(Tensor([1, 2]), Tensor([2, 3]))
+    assert r.requires_grad == False
+    assert r.grad_op is None
+    assert mytorch.is_grad_enabled()
+
+
+def test_no_grad_releases_operands() -> None:
+    a = Tensor([1, 2])
+    b = Tensor([2, 3])
+    with mytorch.no_grad():
+        tmp = a * b
+        ref = weakref.ref(tmp)
+        r = tmp + a
+        del tmp
+    gc.collect()
+    assert ref() is None
+    assert r == Tensor([3, 8])
+
+
+def test_enable_grad_inside_no_grad() -> None:
+    a = Tensor([1, 2])
+    with mytorch.no_grad():
+        with mytorch.enable_grad():
+            r = a + a
+        r2 = a + a
+    assert r.requires_grad == True
+    assert r.grad_op is not None
+    assert r2.grad_op is None
+
+
+def test_inference_mode() -> None:
+    a = Tensor([1, 2])
+    with mytorch.inference_mode():
+        r = a + a
+        with mytorch.enable_grad():
+            # cannot leave inference mode from the inside
+            r2 = a + a
+    assert r.requires_grad == False
+    assert r.grad_op is None
+    assert r.is_inference()
+    assert r2.is_inference()
+    assert not a.is_inference()
+
+    # inference tensors can still be used without grad
+    assert (r + Tensor([1, 1], requires_grad=False)) == Tensor([3, 5])
+    with pytest.raises(RuntimeError, match="Inference tensors"):
+        r + a
+
+
+def test_no_grad_inside_inference_mode() -> None:
+    a = Tensor([1, 2])
+    with mytorch.inference_mode():
+        with mytorch.no_grad():
+            r = a + a
+            assert mytorch.autograd.is_inference_mode_enabled()
+        r2 = a + a
+    assert r.is_inference()
+    assert r2.is_inference()
+    assert not mytorch.autograd.is_inference_mode_enabled()
+    with pytest.raises(RuntimeError, match="Inference tensors"):
+        r + a
@@ -0,0 +1,25 @@
+"""Smoke tests for the benchmark suite."""
+
+import json
+
+from mytorch.bench import CASES, Case, run_case
+from mytorch.bench.__main__ import main
+
+
+def test_run_case() -> None:
+    case = Case("add", "ops", {"size": 4}, next(c for c in CASES if c.name == "add").setup)
+    assert case.key == "add[size=4]"
+    result = run_case(case, min_time=0.001, repeat=2)
+    assert result["ops"] == 1 and result["seconds"] > 0
+    assert result["numpy_seconds"] > 0 and result["overhead_per_op_us"] is not None
+    assert result["peak_bytes"] > 0
+
+
+def test_main_writes_json(tmp_path, capsys) -> None:
+    out = tmp_path / "results.json"
+    assert main(["--filter", "graph[depth=100,", "--min-time", "0.001", "--repeat", "1", "--output", str(out)]) == 0
+    run = json.loads(out.read_text())
+    assert [r["key"] for r in run["results"]] == ["graph[depth=100,size=16]"]
+    assert main(["--filter", "graph[depth=100,", "--min-time", "0.001", "--repeat", "1", "--compare", str(out)]) == 0
+    assert "x" in capsys.readouterr().out.splitlines()[-1]
+    assert len(CASES) == len({case.key for case in CASES})
@@ -0,0 +1,71 @@
+"""Graph capture tests for the jit package."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor, tmult, einsum, lazy
+from mytorch.nn import Linear
+
+
+def _step(layer, x, y):
+    h = layer(x)
+    return einsum("ij,ij->i", h, h) * 0.5 + tmult(x, y, ([1], [0]), (5,))
+
+
+def test_capture_replay_matches_eager() -> None:
+    rng = np.random.default_rng(0)
+    layer = Linear(4, 3)
+    y = Tensor(rng.standard_normal((4,)))
+    step = mytorch.compile(lambda x: _step(layer, x, y))
+    for _ in range(3):
+        x_data = rng.standard_normal((5,4))
+        x = Tensor(x_data)
+        layer.zero_grad()
+        out = step(x)
+        expected_w, expected_x = layer.weight.grad.data.copy(), x.grad.data.copy()
+
+        layer.zero_grad()
+        x_eager = Tensor(x_data)
+        eager = _step(layer, x_eager, y)
+        eager.backward(Tensor(np.ones(eager.dim), requires_grad=False))
+        assert np.allclose(out.data, eager.data)
+        assert np.allclose(expected_w, layer.weight.grad.data)
+        assert np.allclose(expected_x, x_eager.grad.data)
+    assert len(step.graphs) == 1
+
+
+def test_capture_fused_and_no_backward() -> None:
+    @mytorch.capture(backward=False)
+    def f(a, b):
+        with lazy():
+            return a * b + a
+    a, b = Tensor(np.arange(6.0).reshape(3,2)), Tensor(np.ones((3,2)))
+    first = f(a, b)
+    assert np.allclose(first.data, np.arange(6.0).reshape(3,2) * 2)
+    second = f(Tensor(np.ones((3,2))), b)
+    assert second is first  # replayed into the traced buffers
+    assert np.allclose(second.data, 2.0)
+    assert a.grad is None
+
+
+def test_capture_shape_change() -> None:
+    f = mytorch.capture(lambda a: a * a, max_graphs=1)
+    a = Tensor(np.array([1.0, 2.0]))
+    f(a)
+    assert np.allclose(a.grad.data, [2.0, 4.0])
+    b = Tensor(np.array([1.0, 2.0, 3.0]))
+    out = f(b)  # new signature, cache full: eager
+    assert np.allclose(out.data, [1.0, 4.0, 9.0])
+    assert np.allclose(b.grad.data, [2.0, 4.0, 6.0])
+    assert len(f.graphs) == 1
+
+    with pytest.raises(TypeError):
+        mytorch.capture(lambda a: 1.0)(a)
+
+
+def test_capture_operation_without_kernel_raises() -> None:
+    f = mytorch.capture(lambda a: Tensor._from_op(a.data * 2.0, "double", None, [a]))
+
+    with pytest.raises(RuntimeError):
+        f(Tensor([1.0, 2.0]))
@@ -0,0 +1,60 @@
+"""Graph release and graph memory tracker tests for the memory package."""
+
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult
+from mytorch.memory import graph_stats
+
+
+def build(x: Tensor, w: Tensor) -> Tensor:
+    h = tmult(x, w, ([1], [0]), (4, 8))
+    return (h * h + 1.0) * 2.0
+
+
+def test_backward_releases_graph() -> None:
+    x = Tensor(np.ones((4, 16)), requires_grad=False)
+    w = Tensor(np.ones((16, 8)))
+    out = build(x, w)
+    h = out.grad_op.operands[0].grad_op.operands[0].grad_op.operands[0]
+    ref = weakref.ref(h)
+    del h
+
+    stats = graph_stats(out)
+    assert stats["nodes"] == 4
+    assert stats["saved_tensors"] == 7  # x, w, h, h * h, h * h + 1 and the two constants
+    assert stats["saved_bytes"] >= x.data.nbytes + w.data.nbytes + 3 * 4 * 8 * 8
+
+    out.backward(Tensor(np.ones((4, 8)), requires_grad=False))
+    assert graph_stats(out) == {"nodes": 0, "saved_tensors": 0, "saved_bytes": 0}
+    assert ref() is None  # intermediate activations are gone while out is still alive
+    assert np.allclose(w.grad.data, 4 * 16 * 4)
+
+    with pytest.raises(RuntimeError, match="retain_graph=True"):
+        out.backward(Tensor(np.ones((4, 8)), requires_grad=False))
+
+
+def test_retain_graph() -> None:
+    w = Tensor(np.ones((16, 8)))
+    out = build(Tensor(np.ones((4, 16)), requires_grad=False), w)
+    out.backward(Tensor(np.ones((4, 8)), requires_grad=False), retain_graph=True)
+    assert graph_stats(out)["nodes"] == 4
+    out.backward(Tensor(np.ones((4, 8)), requires_grad=False))
+    assert np.allclose(w.grad.data, 2 * 4 * 16 * 4)
+    assert graph_stats(out)["nodes"] == 0
+
+
+def test_graph_stats_of_all_live_graphs() -> None:
+    gc.collect()
+    before = graph_stats()
+    w = Tensor(np.ones((16, 8)))
+    out = build(Tensor(np.ones((4, 16)), requires_grad=False), w)
+    during = graph_stats()
+    assert during["nodes"] - before["nodes"] == 4
+    assert during["saved_bytes"] > before["saved_bytes"]
+    del out
+    gc.collect()
+    assert graph_stats()["nodes"] == before["nodes"]
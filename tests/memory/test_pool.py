@@ -0,0 +1,95 @@
+"""Buffer pool tests for the memory package."""
+
+import gc
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult
+from mytorch.memory import BufferPool, buffer_pool, get_pool
+
+
+def test_pool_reuses_buffers() -> None:
+    pool = BufferPool()
+    a = pool.empty((2,3), np.float64)
+    assert pool.stats()["misses"] == 1
+    assert pool.release(a)
+    assert pool.stats()["bytes_held"] == a.nbytes
+    b = pool.empty((2,3), np.float64)
+    assert b is a
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["bytes_held"] == 0
+
+    # views and read-only arrays are not taken
+    assert not pool.release(b[0])
+    c = np.zeros(3)
+    c.flags.writeable = False
+    assert not pool.release(c)
+
+
+def test_pool_lru_eviction() -> None:
+    pool = BufferPool(max_bytes=3 * 80)
+    buffers = [np.empty(10) for _ in range(4)]
+    for buffer in buffers:
+        pool.release(buffer)
+    stats = pool.stats()
+    assert stats["evictions"] == 1
+    assert stats["buffers_held"] == 3
+    assert stats["bytes_held"] == 240
+    # the oldest buffer was evicted, the most recent one is handed out first
+    assert pool.empty((10,), np.float64) is buffers[3]
+    assert all(pool.empty((10,), np.float64) is not buffers[0] for _ in range(2))
+
+    with pytest.raises(ValueError):
+        BufferPool(max_bytes=-1)
+
+
+def test_tensors_return_buffers_to_pool() -> None:
+    a = Tensor(np.ones((4,4)))
+    b = Tensor(np.ones((4,4)))
+    assert get_pool() is None
+    with buffer_pool() as pool:
+        assert get_pool() is pool
+        r = a * b + a
+        del r
+        gc.collect()
+        assert pool.stats()["buffers_held"] == 2
+        r = a * b
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["buffers_held"] == 1
+        assert r == Tensor(np.ones((4,4)))
+
+        # buffers that are still referenced are not given back
+        kept = r.data
+        del r
+        assert pool.stats()["buffers_held"] == 1
+        assert (kept == 1).all()
+    assert get_pool() is None
+
+
+def test_pooled_backward_and_tmult() -> None:
+    rng = np.random.default_rng(0)
+    x_data = rng.standard_normal((3,4))
+    y_data = rng.standard_normal((4,5))
+    grad_out = rng.standard_normal((3,5))
+
+    expected = []
+    for pooled in (False, True):
+        x = Tensor(x_data)
+        y = Tensor(y_data)
+        if pooled:
+            with buffer_pool() as pool:
+                for _ in range(3):
+                    x.zero_grad()
+                    y.zero_grad()
+                    r = tmult(x * x, y, axes=([1],[0]), dim_out=(3,5)) * y_data[0]
+                    r.backward(Tensor(grad_out))
+                    del r
+            assert pool.stats()["hits"] > 0
+        else:
+            r = tmult(x * x, y, axes=([1],[0]), dim_out=(3,5)) * y_data[0]
+            r.backward(Tensor(grad_out))
+            assert np.allclose(r.data, (x_data * x_data) @ y_data * y_data[0])
+        expected.append((x.grad.data.copy(), y.grad.data.copy()))
+    assert np.allclose(expected[0][0], expected[1][0])
+    assert np.allclose(expected[0][1], expected[1][1])
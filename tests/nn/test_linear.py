@@ -0,0 +1,84 @@
+"""Linear layer tests for the nn package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor
+from mytorch.nn import Linear
+
+
+def test_linear_forward() -> None:
+    layer = Linear(4, 3)
+    assert layer.weight.dim == (3,4)
+    assert layer.bias.dim == (3,)
+    assert list(layer.parameters()) == [layer.weight, layer.bias]
+
+    x = np.random.default_rng(0).standard_normal((5,4))
+    y = layer(Tensor(x))
+    assert y.dim == (5,3)
+    assert np.allclose(y.data, x @ layer.weight.data.T + layer.bias.data)
+    assert y.grad_op.op_name == "linear"
+
+    # arbitrary leading batch dimensions
+    y2 = layer(Tensor(x.reshape(5,1,4)))
+    assert y2.dim == (5,1,3)
+    assert np.allclose(y2.data.reshape(5,3), y.data)
+
+    with pytest.raises(ValueError):
+        layer(Tensor(np.ones((5,3))))
+
+
+def test_linear_backward() -> None:
+    rng = np.random.default_rng(1)
+    layer = Linear(4, 3)
+    x = Tensor(rng.standard_normal((5,4)))
+    grad_out = rng.standard_normal((5,3))
+    layer(x).backward(Tensor(grad_out))
+
+    assert np.allclose(x.grad.data, grad_out @ layer.weight.data)
+    assert np.allclose(layer.weight.grad.data, grad_out.T @ x.data)
+    assert np.allclose(layer.bias.grad.data, grad_out.sum(axis=0))
+
+    no_bias = Linear(4, 3, bias=False)
+    assert no_bias.bias is None
+    assert list(no_bias.parameters()) == [no_bias.weight]
+    no_bias(x).backward(Tensor(grad_out))
+    assert np.allclose(no_bias.weight.grad.data, grad_out.T @ x.data)
+
+
+def test_linear_reuses_workspaces() -> None:
+    layer = Linear(4, 3)
+    x = Tensor(np.ones((5,4)))
+    grad_out = Tensor(np.ones((5,3)))
+
+    y = layer(x)
+    buffer = y.data
+    y.backward(grad_out)
+    # the previous output is still referenced, so a new buffer is used
+    y2 = layer(x)
+    assert not np.shares_memory(y2.data, buffer)
+
+    del y, buffer
+    y3 = layer(x)
+    assert np.shares_memory(y3.data, layer._workspaces[("out", (5,3), np.dtype(np.float64))])
+    weight_grad_id = id(layer._workspaces[("grad_weight", (3,4), np.dtype(np.float64))])
+
+    # the same layer used twice in one graph must not overwrite gradients in flight
+    r = y3 + y2
+    r.backward(grad_out)
+    assert np.allclose(layer.weight.grad.data, 3 * np.ones((3,4)) * 5)
+    assert np.allclose(layer.bias.grad.data, 3 * np.ones(3) * 5)
+    assert id(layer._workspaces[("grad_weight", (3,4), np.dtype(np.float64))]) == weight_grad_id
+
+
+def test_linear_backward_uses_recorded_weight() -> None:
+    rng = np.random.default_rng(2)
+    layer = Linear(4, 3)
+    weight = layer.weight
+    x = Tensor(rng.standard_normal((5,4)))
+    grad_out = rng.standard_normal((5,3))
+    y = layer(x)
+    layer.weight = Tensor(np.zeros((3,4)))
+    y.backward(Tensor(grad_out))
+
+    assert np.allclose(x.grad.data, grad_out @ weight.data)
@@ -0,0 +1,50 @@
+"""Module tests for the nn package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor
+from mytorch.nn import Module, Linear
+
+
+class TwoLayer(Module):
+    def __init__(self):
+        super().__init__()
+        self.first = Linear(4, 8)
+        self.second = Linear(8, 2)
+        self.scale = Tensor([2.0])
+        self.constant = Tensor([1.0], requires_grad=False)
+
+    def forward(self, x):
+        return self.second(self.first(x)) * self.scale + self.constant
+
+
+def test_module_parameter_registration() -> None:
+    model = TwoLayer()
+    names = [name for name, _ in model.named_parameters()]
+    assert names == ["scale", "first.weight", "first.bias", "second.weight", "second.bias"]
+    assert len(list(model.parameters())) == 5
+
+    model.scale = None
+    assert [name for name, _ in model.named_parameters()][0] == "first.weight"
+
+
+def test_module_zero_grad() -> None:
+    model = TwoLayer()
+    model(Tensor(np.ones((3,4)))).backward(Tensor(np.ones((3,2))))
+    buffers = [p.grad.data for p in model.parameters()]
+    model.zero_grad()
+    for p, buffer in zip(model.parameters(), buffers):
+        assert p.grad.data is buffer
+        assert (p.grad.data == 0).all()
+
+
+def test_module_requires_init() -> None:
+    class Broken(Module):
+        def __init__(self):
+            self.weight = Tensor([1.0])
+
+    with pytest.raises(AttributeError):
+        Broken()
+    with pytest.raises(NotImplementedError):
+        Module()(Tensor([1.0]))
@@ -0,0 +1,160 @@
+"""SGD tests for the optim package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, SparseTensor, RowSparseTensor, tmult
+from mytorch.optim import SGD
+
+
+def reference_sgd(params, grads, bufs, lr, momentum, dampening, weight_decay, nesterov, first):
+    """Plain per-parameter SGD (same update rule as torch.optim.SGD)."""
+    for i, (p, g) in enumerate(zip(params, grads)):
+        d_p = g + weight_decay * p
+        if momentum != 0.0:
+            bufs[i] = d_p.copy() if first else momentum * bufs[i] + (1 - dampening) * d_p
+            d_p = d_p + momentum * bufs[i] if nesterov else bufs[i]
+        params[i] = p - lr * d_p
+
+
+@pytest.mark.parametrize("momentum,dampening,weight_decay,nesterov", [
+    (0.0, 0.0, 0.0, False),
+    (0.9, 0.0, 0.0, False),
+    (0.9, 0.1, 0.01, False),
+    (0.9, 0.0, 0.01, True),
+])
+def test_sgd_matches_reference(momentum, dampening, weight_decay, nesterov) -> None:
+    rng = np.random.default_rng(0)
+    shapes = [(3,4), (4,), (2,2,2), ()]
+    params = [Tensor(rng.standard_normal(shape)) for shape in shapes]
+    expected = [p.data.copy() for p in params]
+    bufs = [None] * len(params)
+    opt = SGD(params, lr=0.1, momentum=momentum, dampening=dampening, weight_decay=weight_decay, nesterov=nesterov)
+
+    for step in range(3):
+        grads = [rng.standard_normal(shape) for shape in shapes]
+        opt.zero_grad()
+        for p, g in zip(params, grads):
+            p.backward(Tensor(g))
+        opt.step()
+        reference_sgd(expected, grads, bufs, 0.1, momentum, dampening, weight_decay, nesterov, step == 0)
+        for p, e in zip(params, expected):
+            assert np.allclose(p.data, e)
+
+
+def test_sgd_flat_views() -> None:
+    a = Tensor(np.ones((2,3)))
+    b = Tensor(np.ones(4))
+    a.grad = Tensor(np.full((2,3), 2.0), requires_grad=False)
+    opt = SGD([a, b], lr=1.0)
+    flat_data, flat_grad = opt.groups[0].flat_data, opt.groups[0].flat_grad
+
+    assert flat_data.shape == (10,)
+    assert a.data.base is flat_data
+    assert b.data.base is flat_data
+    assert a.grad.data.base is flat_grad
+    assert (flat_grad[:6] == 2.0).all()
+    assert (flat_grad[6:] == 0.0).all()
+
+    # gradients accumulate in place into the flat buffer
+    (b * 3.0).backward(Tensor(np.ones(4)))
+    assert (flat_grad[6:] == 3.0).all()
+    opt.step()
+    assert a == Tensor(np.full((2,3), -1.0))
+    assert b == Tensor(np.full(4, -2.0))
+
+    opt.zero_grad()
+    assert (flat_grad == 0.0).all()
+
+
+def test_sgd_repacks_replaced_gradients() -> None:
+    a = Tensor(np.ones(3))
+    opt = SGD([a], lr=1.0)
+    a.grad = None
+    a.backward(Tensor(np.ones(3)))
+    assert a.grad.data.base is not opt.groups[0].flat_grad
+    opt.step()
+    assert a.grad.data.base is opt.groups[0].flat_grad
+    assert a == Tensor(np.zeros(3))
+
+
+def test_sgd_step_after_grad_set_to_none() -> None:
+    a = Tensor(np.array([0.0, 1.0]))
+    b = Tensor(np.ones(2))
+    opt = SGD([a, b], lr=1.0)
+    (a * 1.0 + b).backward(Tensor(np.ones(2)))
+    opt.step()
+    assert a == Tensor([-1.0, 0.0])
+
+    a.grad = None
+    opt.step()
+    # a has no gradient any more, b keeps its own
+    assert a == Tensor([-1.0, 0.0])
+    assert b == Tensor([-1.0, -1.0])
+
+
+def test_sgd_repack_assigned_arrays() -> None:
+    a = Tensor(np.ones(3))
+    opt = SGD([a], lr=1.0)
+    a.data = np.full(3, 2.0)
+    a.grad = Tensor(np.ones(3), requires_grad=False)
+    opt.repack()
+    assert a.data.base is opt.groups[0].flat_data
+    assert a.grad.data.base is opt.groups[0].flat_grad
+    opt.step()
+    assert a == Tensor(np.ones(3))
+
+
+def test_sgd_keeps_parameter_dtypes() -> None:
+    half = Tensor(np.ones(3, dtype=np.float16))
+    single = Tensor(np.ones(2, dtype=np.float32))
+    other = Tensor(np.ones(2, dtype=np.float16))
+    opt = SGD([half, single, other], lr=0.5, momentum=0.9)
+
+    assert [group.flat_data.dtype for group in opt.groups] == [np.float16, np.float32]
+    assert half.data.base is other.data.base is opt.groups[0].flat_data
+    for _ in range(2):
+        opt.zero_grad()
+        for p in (half, single, other):
+            p.backward(Tensor(np.ones(p.dim, dtype=p.data.dtype)))
+        opt.step()
+    # buf = 1, then 1.9: p = 1 - 0.5 * (1 + 1.9)
+    for p in (half, single, other):
+        assert p.data.dtype == p.grad.data.dtype
+        assert np.allclose(p.data, -0.45, atol=1e-3)
+    assert half.data.dtype == np.float16 and single.data.dtype == np.float32
+
+
+def test_sgd_validation() -> None:
+    with pytest.raises(ValueError):
+        SGD([Tensor([1.0])], lr=-1.0)
+    with pytest.raises(ValueError):
+        SGD([Tensor([1.0])], lr=0.1, nesterov=True)
+    with pytest.raises(ValueError):
+        SGD([], lr=0.1)
+
+
+def test_sgd_sparse_params() -> None:
+    table = Tensor(np.ones((6, 2)))
+    w = Tensor(np.ones(2))
+    opt = SGD([w, table], lr=0.5, sparse_params=[table])
+    assert table.grad is None
+    assert table.sparse_grad and not w.sparse_grad
+    lookup = SparseTensor.from_coo([0, 1], [4, 1], Tensor(np.ones(2), requires_grad=False), (2, 6))
+
+    for _ in range(2):
+        opt.zero_grad()
+        tmult(lookup, table, ([1], [0]), (2, 2)).backward(Tensor(np.full((2, 2), 2.0)))
+        (w * 1.0).backward(Tensor(np.ones(2)))
+        assert isinstance(table.grad, RowSparseTensor)
+        opt.step()
+    expected = np.ones((6, 2))
+    expected[[1, 4]] = -1.0
+    assert (table.data == expected).all()
+    # only the dense parameter is packed, the table has no region in the flat buffers
+    assert table.data.base is not opt.groups[0].flat_data
+    assert opt.groups[0].flat_grad.size == 2 and opt.groups[0].scratch.size == 2
+    assert w == Tensor([0.0, 0.0])
+
+    with pytest.raises(ValueError):
+        SGD([table], lr=0.1, momentum=0.9, sparse_params=[table])
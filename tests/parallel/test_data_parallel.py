@@ -0,0 +1,65 @@
+"""Data-parallel training tests for the parallel package."""
+
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult
+from mytorch.nn import Linear
+from mytorch.optim import SGD
+from mytorch.parallel import DataParallel
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork")
+
+
+def _loss(layer, w):
+    def fn(x):
+        h = layer(x)
+        return tmult(h * h, w, ([1], [0]), (x.dim[0],))
+    return fn
+
+
+def test_data_parallel_matches_single_process() -> None:
+    rng = np.random.default_rng(0)
+    layer = Linear(4, 3)
+    w = Tensor(rng.standard_normal(3))
+    fn = _loss(layer, w)
+    x = rng.standard_normal((10, 4)).astype(np.float32)
+    params = list(layer.parameters()) + [w]
+
+    reference = Linear(4, 3)
+    reference.load_state_dict(layer.state_dict())
+    ref_w = Tensor(w.data.copy())
+    ref_params = list(reference.parameters()) + [ref_w]
+    ref_fn = _loss(reference, ref_w)
+    ref_opt = SGD(ref_params, lr=0.1)
+
+    with DataParallel(fn, params, num_workers=3) as dp:
+        opt = SGD(params, lr=0.1)
+        group, = opt.groups
+        assert group.flat_data is dp._data.array and group.flat_grad is dp._grad.array  # no copies
+        for _ in range(3):
+            loss = dp.step(x)
+            ref_opt.zero_grad()
+            out = ref_fn(Tensor(x, requires_grad=False))
+            out.backward(Tensor(np.ones(10, dtype=out.dtype), requires_grad=False))
+            assert np.isclose(loss, out.data.sum(), rtol=1e-4)
+            for p, q in zip(params, ref_params):
+                assert np.allclose(p.grad.data, q.grad.data, rtol=1e-4, atol=1e-5)
+            opt.step()
+            ref_opt.step()
+        # larger batch: the shared input buffer grows and the workers are restarted
+        dp.step(np.ones((40, 4), dtype=np.float32))
+    assert all(np.allclose(p.data, q.data, rtol=1e-4, atol=1e-5) for p, q in zip(params, ref_params))
+
+
+def test_data_parallel_worker_error() -> None:
+    p = Tensor(np.ones(3))
+    with DataParallel(lambda x: x * p, [p], num_workers=2) as dp:
+        with pytest.raises(RuntimeError):
+            dp.step(np.ones((4, 2)))  # shapes do not broadcast
+        assert dp.step(np.ones((4, 3))) == 12.0
+        assert np.allclose(p.grad.data, 4.0)
+    with pytest.raises(ValueError):
+        DataParallel(lambda x: x, [p], num_workers=0)
@@ -0,0 +1,57 @@
+"""Profiler tests for the profiler package."""
+
+import json
+
+import numpy as np
+
+from mytorch.tensor import Tensor, tmult, lazy
+from mytorch.nn import Linear
+from mytorch.profiler import profile, get_profiler
+
+
+def test_profile_forward_and_backward(tmp_path) -> None:
+    layer = Linear(4, 3)
+    x = Tensor(np.ones((2,4)), requires_grad=False)
+    w = Tensor(np.ones((3,)))
+    with profile() as prof:
+        assert get_profiler() is prof
+        h = layer(x) * 2.0 + 1.0
+        out = tmult(h, w, ([1], [0]), (2,))
+        out.backward(Tensor(np.ones(2), requires_grad=False))
+    assert get_profiler() is None
+
+    forward = [(e.name, e.input_shapes, e.output_shapes) for e in prof.events if e.category == "forward"]
+    assert forward == [
+        ("linear", [[2,4]], [[2,3]]),
+        ("tensor-elem-mult", [[2,3]], [[2,3]]),
+        ("tensor-add", [[2,3]], [[2,3]]),
+        ("tensor-mult", [[2,3], [3]], [[2]]),
+    ]
+    backward = [e.name for e in prof.events if e.category == "backward"]
+    assert backward == ["tensor-mult", "tensor-add", "tensor-elem-mult", "linear"]
+    assert [e.name for e in prof.events if e.category == "engine"] == ["backward"]
+    assert all(e.duration >= 0 for e in prof.events)
+    assert prof.events[0].bytes == 2 * 3 * 8
+
+    rows = prof.key_averages()
+    assert {(row["category"], row["name"]) for row in rows} >= {("forward", "linear"), ("backward", "linear")}
+    table = prof.table()
+    assert "tensor-mult" in table and "engine" in table
+
+    path = tmp_path / "trace.json"
+    prof.export_chrome_trace(path)
+    trace = json.loads(path.read_text())["traceEvents"]
+    assert len(trace) == len(prof.events) and all(event["ph"] == "X" for event in trace)
+
+
+def test_profile_memory_and_fusion() -> None:
+    a = Tensor(np.ones((64, 64)))
+    with profile(record_memory=True) as prof:
+        with lazy():
+            r = a * a + a
+        r.materialize()
+        r.materialize()  # cached, not recorded again
+    names = [e.name for e in prof.events]
+    assert names.count("fused-elementwise") == 1
+    fused = next(e for e in prof.events if e.name == "fused-elementwise")
+    assert fused.bytes >= 64 * 64 * 8
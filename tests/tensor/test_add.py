@@ -58,7 +58,7 @@ def test_tensor_add_backward() -> None:
     assert grad_op.operands == [a, b]
 
     grad_out = Tensor([1,1])
-    r.backward(grad_out)
+    r.backward(grad_out, retain_graph=True)
 
     assert r.grad == None
     assert a.grad == Tensor([1,1])
@@ -0,0 +1,56 @@
+"""Broadcasting tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor
+
+
+def test_tensor_broadcast_forward() -> None:
+    a = Tensor([[1,2,3],[4,5,6]])
+    b = Tensor([10,20,30])
+    c = Tensor([[2],[3]])
+
+    assert (a + b).dim == (2,3)
+    assert (a + b) == Tensor([[11,22,33],[14,25,36]])
+    assert (a * c) == Tensor([[2,4,6],[12,15,18]])
+    assert (b * c) == Tensor([[20,40,60],[30,60,90]])
+
+    with pytest.raises(ValueError):
+        a + Tensor([1,2])
+
+
+def test_tensor_scalar_operands() -> None:
+    a = Tensor(np.array([1.0, 2.0], dtype=np.float32))
+
+    r = a * 2.0 + 1
+    assert r == Tensor([3.0, 5.0])
+    assert r.data.dtype == np.float32
+    assert (2 * a) == Tensor([2.0, 4.0])
+    assert (1.5 + a) == Tensor([2.5, 3.5])
+    assert (a * np.float32(3)) == Tensor([3.0, 6.0])
+    assert (a + np.array(1.0)) == Tensor([2.0, 3.0])
+    assert (np.array([1.0, 1.0]) + a) == Tensor([2.0, 3.0])
+
+    assert r.grad_op.operands[1].requires_grad == False
+    with pytest.raises(TypeError):
+        a + "a"
+
+
+def test_tensor_broadcast_backward() -> None:
+    a = Tensor([[1.0,2.0,3.0],[4.0,5.0,6.0]])
+    b = Tensor([10.0,20.0,30.0])
+    c = Tensor([[2.0],[3.0]])
+    d = Tensor(np.array(2.0))
+
+    r = (a + b) * c * d
+    r.backward(Tensor(np.ones((2,3))))
+
+    assert a.grad.dim == (2,3)
+    assert b.grad.dim == (3,)
+    assert c.grad.dim == (2,1)
+    assert d.grad.dim == ()
+    assert a.grad == Tensor([[4.0,4.0,4.0],[6.0,6.0,6.0]])
+    assert b.grad == Tensor([10.0,10.0,10.0])
+    assert c.grad == Tensor([[132.0],[150.0]])
+    assert d.grad == Tensor(np.array(11*2+22*2+33*2+14*3+25*3+36*3.0))
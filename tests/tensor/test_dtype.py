@@ -0,0 +1,52 @@
+"""Dtype tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult, get_default_dtype, set_default_dtype
+
+
+def test_default_dtype() -> None:
+    assert Tensor([1.0, 2.0]).dtype == np.float32
+    assert Tensor([1, 2]).dtype == np.int64
+    assert Tensor(np.ones(2)).dtype == np.float64  # arrays keep their dtype
+    assert Tensor([1, 2], dtype=np.float16).dtype == np.float16
+
+    set_default_dtype(np.float64)
+    try:
+        assert get_default_dtype() == np.float64
+        assert Tensor([1.0]).dtype == np.float64
+    finally:
+        set_default_dtype(np.float32)
+    with pytest.raises(TypeError):
+        set_default_dtype(np.int32)
+
+
+def test_to() -> None:
+    a = Tensor([1.0, 2.0])
+    assert a.to(np.float32) is a
+    h = a.to(np.float16)
+    assert h.dtype == np.float16
+    assert h.grad_op.op_name == "tensor-cast"
+    r = tmult(h, h, ([0], [0]), ())
+    assert r.dtype == np.float16
+    r.backward(Tensor(np.ones(()), requires_grad=False))
+    assert a.grad.dtype == np.float32
+    assert np.allclose(a.grad.data, [2.0, 4.0])
+
+
+def test_grad_accumulates_in_leaf_dtype() -> None:
+    a = Tensor(np.ones(2, dtype=np.float32))
+    (a * np.ones(2)).backward(Tensor(np.ones(2), requires_grad=False))
+    assert a.grad.dtype == np.float32
+
+
+def test_zero_dim_leaf_through_mul_and_cast() -> None:
+    a = Tensor(np.array(3.0, dtype=np.float32))
+    b = Tensor(np.array(2.0, dtype=np.float32))
+    r = (a * b).to(np.float64) * b
+    r.backward(Tensor(np.array(1.0), requires_grad=False))
+    assert a.grad.dim == ()
+    assert a.grad.dtype == np.float32
+    assert a.grad.data == 4.0
+    assert b.grad.data == 12.0
@@ -0,0 +1,75 @@
+"""Einsum tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor, einsum
+from mytorch.tensor.tensor_mult import _einsum_plan
+
+
+def test_einsum_forward() -> None:
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((2,30))
+    b = rng.standard_normal((30,40))
+    c = rng.standard_normal((40,3))
+    r = einsum("ij,jk,kl->il", Tensor(a), Tensor(b), Tensor(c))
+    assert r.dim == (2,3)
+    assert np.allclose(r.data, a @ b @ c)
+
+    # implicit output
+    r2 = einsum("ij,jk", Tensor(a), Tensor(b))
+    assert np.allclose(r2.data, a @ b)
+
+
+def test_einsum_plan_is_cached() -> None:
+    a = Tensor(np.ones((2,30)))
+    b = Tensor(np.ones((30,40)))
+    c = Tensor(np.ones((40,3)))
+    _einsum_plan.cache_clear()
+    einsum("ij,jk,kl->il", a, b, c)
+    einsum("ij,jk,kl->il", a, b, c)
+    assert _einsum_plan.cache_info().misses == 1
+    assert _einsum_plan.cache_info().hits == 1
+    # a@(b@c) is much cheaper than (a@b)@c here
+    path = _einsum_plan("ij,jk,kl->il", ((50,40),(40,30),(30,2))).path
+    assert path == ["einsum_path", (1,2), (0,1)]
+
+
+def test_einsum_backward() -> None:
+    rng = np.random.default_rng(1)
+    a_data = rng.standard_normal((2,3))
+    b_data = rng.standard_normal((3,4))
+    c_data = rng.standard_normal((4,5))
+    a = Tensor(a_data)
+    b = Tensor(b_data)
+    c = Tensor(c_data)
+    r = einsum("ij,jk,kl->il", a, b, c)
+    assert r.grad_op.op_name == "tensor-einsum"
+
+    grad_out = rng.standard_normal((2,5))
+    r.backward(Tensor(grad_out))
+    assert np.allclose(a.grad.data, grad_out @ (b_data @ c_data).T)
+    assert np.allclose(b.grad.data, a_data.T @ grad_out @ c_data.T)
+    assert np.allclose(c.grad.data, (a_data @ b_data).T @ grad_out)
+
+
+def test_einsum_backward_summed_index() -> None:
+    a = Tensor(np.arange(6.0).reshape(2,3))
+    b = Tensor([1.0,2.0])
+    r = einsum("ij,i->", a, b)
+    r.backward(Tensor(np.array(1.0)))
+    assert a.grad == Tensor([[1.0,1.0,1.0],[2.0,2.0,2.0]])
+    assert b.grad == Tensor([3.0,12.0])
+
+
+def test_einsum_validation() -> None:
+    a = Tensor(np.ones((2,3)))
+    with pytest.raises(ValueError, match="does not match"):
+        einsum("ij,ij->i", a, Tensor(np.ones((3,2))))
+    with pytest.raises(ValueError, match="ellipsis"):
+        einsum("...j->j", a)
+    with pytest.raises(NotImplementedError):
+        einsum("ii->i", Tensor(np.ones((2,2))))
+    with mytorch.no_grad():
+        assert einsum("ii->i", Tensor(np.ones((2,2)))) == Tensor([1.0,1.0])
@@ -0,0 +1,145 @@
+"""Lazy expression mode tests for the tensor package."""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.nn import Linear
+from mytorch.tensor import Tensor, LazyTensor, lazy
+
+
+def expression(a, b, c, d, e):
+    return a*b + c*d + e*a + 2.0
+
+
+def make_operands(seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    shapes = [(500,8), (500,8), (8,), (500,1), (1,8)]
+    return [rng.standard_normal(shape) for shape in shapes]
+
+
+def test_lazy_forward_matches_eager() -> None:
+    arrays = make_operands(0)
+    eager = expression(*[Tensor(x) for x in arrays])
+    with lazy():
+        r = expression(*[Tensor(x) for x in arrays])
+    assert isinstance(r, LazyTensor)
+    assert r.dim == (500,8)
+
+    # small chunks to exercise the chunked evaluation
+    t = r.materialize(chunk_bytes=1024)
+    assert isinstance(t, Tensor)
+    assert np.allclose(t.data, eager.data)
+    assert r.materialize() is t
+    assert r.data is t.data
+
+
+def test_lazy_backward_matches_eager() -> None:
+    arrays = make_operands(1)
+    grad_out = np.random.default_rng(2).standard_normal((500,8))
+
+    eager_operands = [Tensor(x) for x in arrays]
+    expression(*eager_operands).backward(Tensor(grad_out))
+
+    lazy_operands = [Tensor(x) for x in arrays]
+    lazy_operands[2].requires_grad = False
+    with lazy():
+        r = expression(*lazy_operands)
+    t = r.materialize(chunk_bytes=1024)
+    assert t.grad_op.op_name == "fused-elementwise"
+    assert t.grad_op.operands[:5] == lazy_operands  # + the constant 2.0
+    t.backward(Tensor(grad_out))
+
+    for eager_t, lazy_t in zip(eager_operands, lazy_operands):
+        if lazy_t.requires_grad:
+            assert lazy_t.grad.dim == lazy_t.dim
+            assert np.allclose(lazy_t.grad.data, eager_t.grad.data)
+        else:
+            assert lazy_t.grad == None
+
+
+def test_lazy_without_varying_first_axis() -> None:
+    a = Tensor([[1.0,2.0]])
+    b = Tensor(np.array(3.0))
+    with lazy():
+        r = a*b + a
+    t = r.materialize()
+    assert t == Tensor([[4.0,8.0]])
+    t.backward(Tensor([[1.0,1.0]]))
+    assert a.grad == Tensor([[4.0,4.0]])
+    assert b.grad == Tensor(np.array(3.0))
+
+
+def test_lazy_mixed_with_eager() -> None:
+    a = Tensor([1.0,2.0])
+    with lazy():
+        r = a * a
+    # operations on lazy tensors stay lazy outside of lazy()
+    r2 = r + a
+    assert isinstance(r2, LazyTensor)
+    assert r2.materialize() == Tensor([2.0,6.0])
+    r2.backward(Tensor([1.0,1.0]))
+    assert a.grad == Tensor([3.0,5.0])
+    # materialized lazy tensors are used as leaves
+    t = r.materialize()
+    r3 = r + 1.0
+    assert r3.materialize().grad_op.operands[0] is t
+    assert not isinstance(a + a, LazyTensor)
+
+
+def test_lazy_into_tensor_mult_and_linear() -> None:
+    x = Tensor(np.arange(6.0).reshape(2, 3))
+    w = Tensor(np.ones((3, 4)))
+    linear = Linear(3, 2)
+    with lazy():
+        h = x * 2.0 + 1.0
+        y = mytorch.tmult(h, w, ([1], [0]), (2, 4))
+        z = linear(h)
+        e = mytorch.einsum("ij,jk->ik", h, w)
+        r = h.reshape(3, 2)
+    eager = x.data * 2.0 + 1.0
+    assert np.allclose(y.data, eager @ w.data)
+    assert np.allclose(z.data, eager @ linear.weight.data.T + linear.bias.data)
+    assert np.allclose(e.data, y.data)
+    assert r.dim == (3, 2)
+    y.backward(Tensor(np.ones((2, 4))), retain_graph=True)
+    assert np.allclose(x.grad.data, 2.0 * 4)
+    x.grad = None
+    z.backward(Tensor(np.ones((2, 2))))
+    assert np.allclose(x.grad.data, 2.0 * linear.weight.data.sum(axis=0))
+
+
+def test_lazy_no_grad() -> None:
+    a = Tensor([1.0,2.0])
+    with mytorch.no_grad(), lazy():
+        t = (a * a + a).materialize()
+    assert t.requires_grad == False
+    assert t.grad_op is None
+
+
+def test_lazy_reduces_peak_memory() -> None:
+    n = 1 << 18
+    operands = [Tensor(np.ones(n), requires_grad=False) for _ in range(5)]
+
+    def peak(fn) -> int:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        fn()
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    def run_lazy():
+        with lazy():
+            expression(*operands).materialize()
+
+    eager_peak = peak(lambda: expression(*operands))
+    lazy_peak = peak(run_lazy)
+    # eager keeps several full-size temporaries alive, fused needs the output only
+    assert lazy_peak < 0.6 * eager_peak
+
+    with pytest.raises(TypeError):
+        with lazy():
+            operands[0] + "a"
@@ -0,0 +1,142 @@
+"""In-place operation tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.autograd import Function, no_grad
+from mytorch.tensor import Tensor
+
+
+def test_inplace_writes_into_data() -> None:
+    a = Tensor(np.array([1.0, 2.0]), requires_grad=False)
+    data = a.data
+    b = a
+    b += Tensor([1.0, 1.0], requires_grad=False)
+    b *= 3
+
+    assert b is a
+    assert a.data is data
+    assert (a.data == [6.0, 9.0]).all()
+    assert a._version == 2
+    with pytest.raises(ValueError):
+        a.add_(np.ones((2, 2)))
+
+
+def test_inplace_backward() -> None:
+    a = Tensor([1.0, 2.0])
+    w = Tensor([3.0, 4.0])
+    h = a * 2
+    h.add_(w)
+    h.mul_(w)
+    h.backward(Tensor([1.0, 1.0]))
+
+    # h = (2 a + w) * w
+    assert a.grad == Tensor([6.0, 8.0])
+    assert w.grad == Tensor([2 * 3.0 + 2.0, 2 * 4.0 + 4.0])
+
+
+def test_inplace_mul_self() -> None:
+    a = Tensor([1.0, 3.0])
+    h = a + 0
+    h *= h
+    h.backward(Tensor([1.0, 1.0]))
+
+    assert a.grad == Tensor([2.0, 6.0])
+
+
+def test_inplace_modified_operand_raises() -> None:
+    a = Tensor([1.0, 2.0])
+    h = a + 1
+    r = h * h
+    h.add_(1)
+
+    with pytest.raises(RuntimeError):
+        r.backward(Tensor([1.0, 1.0]))
+
+
+def test_inplace_view_shares_version() -> None:
+    a = Tensor(np.zeros((2, 3)), requires_grad=False)
+    w = Tensor(np.ones((2, 3)))
+    r = a * w
+    row = a[0]
+    row += 1
+
+    assert a._version == 1
+    assert (a.data[0] == 1).all()
+    with pytest.raises(RuntimeError):
+        r.backward(Tensor(np.ones((2, 3))))
+
+
+def test_inplace_function_input_raises() -> None:
+    class Square(Function):
+        @staticmethod
+        def forward(ctx, x):
+            ctx.save_for_backward(x)
+            return x * x
+
+        @staticmethod
+        def backward(ctx, grad):
+            x, = ctx.saved
+            return 2 * x * grad
+
+    a = Tensor([1.0, 2.0])
+    h = a * 1
+    r = Square.apply(h)
+    h.mul_(2)
+
+    with pytest.raises(RuntimeError):
+        r.backward(Tensor([1.0, 1.0]))
+
+
+def test_inplace_leaf_requires_no_grad() -> None:
+    w = Tensor([1.0, 2.0])
+    with pytest.raises(RuntimeError):
+        w.add_(1)
+    with pytest.raises(RuntimeError):
+        w[0].mul_(2)
+
+    with no_grad():
+        w.add_(1)
+    assert w == Tensor([2.0, 3.0])
+    assert w.grad_op is None
+
+
+def test_inplace_capture_replay() -> None:
+    def step(a, b):
+        h = a * 1.0
+        h.mul_(b)
+        return h
+
+    f = mytorch.capture(step)
+    for values in ([1.0, 2.0], [3.0, 5.0]):
+        a, b = Tensor(np.array(values)), Tensor(np.array([2.0, 4.0]))
+        out = f(a, b)
+        # the gradient of b uses the value of h before mul_ of this call, not of the traced one
+        assert np.allclose(out.data, np.array(values) * [2.0, 4.0])
+        assert np.allclose(a.grad.data, [2.0, 4.0])
+        assert np.allclose(b.grad.data, values)
+
+
+def test_inplace_unsaved_operand_allowed() -> None:
+    x = Tensor([1.0, 2.0])
+    c = Tensor([3.0, 4.0])
+    a = x * 1
+    b = a + c
+    a += 1
+    b.backward(Tensor([1.0, 1.0]))
+
+    assert x.grad == Tensor([1.0, 1.0])
+    assert c.grad == Tensor([1.0, 1.0])
+
+
+def test_inplace_gradient_uses_history_at_use() -> None:
+    x = Tensor([1.0, 2.0])
+    a = x * 1
+    r = a.reshape(2, 1)
+    b = a + 0
+    a *= 3
+    (b + r.reshape(2)).backward(Tensor([1.0, 1.0]))
+
+    # b and r used a before it was scaled, its gradient does not flow through the mul_
+    assert x.grad == Tensor([2.0, 2.0])
@@ -0,0 +1,76 @@
+"""Out-of-core multiplication tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor, tmult
+from mytorch.tensor import out_of_core
+
+
+@pytest.mark.parametrize("x_shape, y_shape, axes", [
+    ((30, 12), (12, 9), ([1], [0])),
+    ((12, 30), (12, 9), ([0], [0])),  # not a view of the mapping: restaged
+    ((5, 6, 4), (4, 3, 6), ([1, 2], [2, 0])),
+])
+def test_tmult_blocked_matches_tensordot(tmp_path, x_shape, y_shape, axes) -> None:
+    rng = np.random.default_rng(0)
+    x_data = np.memmap(tmp_path / "x", dtype=np.float64, mode="w+", shape=x_shape)
+    x_data[:] = rng.standard_normal(x_shape)
+    y_data = rng.standard_normal(y_shape)
+    expected = np.tensordot(np.asarray(x_data), y_data, axes=axes)
+    grad = rng.standard_normal(expected.shape)
+    x, y = Tensor(x_data), Tensor(y_data)
+
+    r = tmult(x, y, axes, expected.shape, tile=(4, 5, 3), num_workers=2)
+    r.backward(Tensor(grad, requires_grad=False))
+
+    x_ref, y_ref = Tensor(np.array(x_data)), Tensor(y_data)
+    tmult(x_ref, y_ref, axes, expected.shape).backward(Tensor(grad, requires_grad=False))
+    assert np.allclose(r.data, expected)
+    assert np.allclose(x.grad.data, x_ref.grad.data)
+    assert np.allclose(y.grad.data, y_ref.grad.data)
+
+
+def test_tmult_mapped_operand_over_budget(tmp_path, monkeypatch) -> None:
+    rng = np.random.default_rng(1)
+    x_data, y_data = rng.standard_normal((64, 16)), rng.standard_normal((16, 8))
+    mytorch.save(Tensor(x_data, requires_grad=False), tmp_path / "x.mt")
+    x = mytorch.load(tmp_path / "x.mt", mmap=True)
+    x.requires_grad = True
+    monkeypatch.setattr(out_of_core, "MEMORY_BUDGET", 1024)
+
+    r = tmult(x, Tensor(y_data, requires_grad=False), ([1], [0]), (64, 8))
+    r.backward(Tensor(np.ones((64, 8)), requires_grad=False))
+
+    # the 4 KiB result and the 8 KiB gradient of x do not fit the budget and are mapped to temporary files
+    assert isinstance(r.data, np.memmap)
+    assert np.allclose(r.data, x_data @ y_data)
+    assert isinstance(x.grad.data, np.memmap)
+    assert np.allclose(x.grad.data, np.ones((64, 8)) @ y_data.T)
+
+
+def test_tmult_num_workers_runs_blocked(monkeypatch) -> None:
+    calls = []
+    into = out_of_core._Blocking.into
+    monkeypatch.setattr(out_of_core._Blocking, "into", lambda self, *args: calls.append(self.num_workers) or into(self, *args))
+    a, b = Tensor(np.arange(6.0).reshape(2, 3)), Tensor(np.ones((3, 4)))
+
+    r = tmult(a, b, ([1], [0]), (2, 4), num_workers=2)
+
+    assert calls == [2]
+    assert np.allclose(r.data, [[3.0] * 4, [12.0] * 4])
+
+
+def test_tmult_out(tmp_path) -> None:
+    a, b = Tensor(np.arange(6.0).reshape(2, 3)), Tensor(np.ones((3, 4)))
+    out = np.memmap(tmp_path / "out", dtype=np.float32, mode="w+", shape=(2, 4))
+
+    r = tmult(a, b, ([1], [0]), (2, 4), out=out, memory_budget=64)
+
+    assert r.data is out
+    assert np.allclose(out, [[3.0] * 4, [12.0] * 4])
+    with pytest.raises(ValueError):
+        tmult(a, b, ([1], [0]), (2, 4), out=np.empty((4, 2)))
+    with pytest.raises(ValueError):
+        tmult(a, b, ([1], [0]), (2, 4), tile=0)
@@ -1,6 +1,7 @@
 """Reshape tests for the tensor package."""
 
 import numpy as np
+import pytest
 
 from mytorch.tensor import Tensor
 
@@ -10,10 +11,33 @@ def test_tensor_reshape() -> None:
     b = a.reshape((2,2))
     expected = np.array([1,2,3,4]).reshape((2,2))
 
-    # check dimensions
-    assert a.dim == (2,2)
+    # check dimensions (a is not modified)
+    assert a.dim == (4,)
     assert b.dim == (2,2)
-    assert a == b
+    assert a.reshape(2, -1) == b
 
     assert b.data.shape == (2,2)
     assert (b.data == expected).all()
+    assert np.shares_memory(a.data, b.data)
+
+
+def test_tensor_reshape_backward() -> None:
+    a = Tensor(np.arange(6.0))
+    b = a.reshape(2, 3) * Tensor([[1.0], [2.0]])
+    b.backward(Tensor(np.ones((2, 3))))
+
+    assert a.grad == Tensor([1.0, 1.0, 1.0, 2.0, 2.0, 2.0])
+
+
+def test_tensor_view() -> None:
+    a = Tensor(np.arange(6.0).reshape(2, 3))
+    assert np.shares_memory(a.view(3, 2).data, a.data)
+
+    t = a.transpose(0, 1)
+    with pytest.raises(ValueError):
+        t.view(6)
+    r = t.reshape(6)  # copies
+    assert not np.shares_memory(r.data, a.data)
+    assert r == Tensor([0.0, 3.0, 1.0, 4.0, 2.0, 5.0])
+    r.backward(Tensor(np.arange(6.0)))
+    assert a.grad == Tensor([[0.0, 2.0, 4.0], [1.0, 3.0, 5.0]])
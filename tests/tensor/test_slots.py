@@ -0,0 +1,24 @@
+"""Memory layout tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor
+from mytorch.autograd import GradOperation
+
+
+def test_tensor_has_no_instance_dict() -> None:
+    a = Tensor([1,2])
+    r = a + a
+    assert not hasattr(a, "__dict__")
+    assert not hasattr(r.grad_op, "__dict__")
+    with pytest.raises(AttributeError):
+        a.foo = 1
+
+
+def test_tensor_dim_is_derived_from_data() -> None:
+    a = Tensor([1,2,3,4])
+    assert a.dim == (4,)
+    a.data = np.zeros((2,2))
+    assert a.dim == (2,2)
+    assert isinstance(GradOperation("tensor-add", Tensor._add_backward, [a, a]), GradOperation)
@@ -0,0 +1,124 @@
+"""Sparse tensor tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor, SparseTensor, RowSparseTensor, tmult
+
+
+def random_sparse(rng, shape, density=0.3):
+    dense = rng.standard_normal(shape) * (rng.random(shape) < density)
+    return dense, SparseTensor.from_dense(dense)
+
+
+def test_sparse_construction() -> None:
+    s = SparseTensor.from_coo([2, 0, 2, 0], [1, 3, 1, 0], Tensor([1.0, 2.0, 3.0, 4.0]), (3, 4))
+    assert s.nnz == 3
+    assert list(s.indptr) == [0, 2, 2, 3]
+    assert list(s.indices) == [0, 3, 1]
+    assert s.to_dense() == Tensor([[4.0, 0.0, 0.0, 2.0], [0.0, 0.0, 0.0, 0.0], [0.0, 4.0, 0.0, 0.0]])
+    assert s.t().to_dense() == Tensor(s.to_dense().data.T.copy())
+
+    with pytest.raises(ValueError):
+        SparseTensor.from_coo([3], [0], [1.0], (3, 4))
+    with pytest.raises(ValueError):
+        SparseTensor([0, 1], [0], [1.0], (2, 2))
+
+
+def test_sparse_dense_tmult() -> None:
+    rng = np.random.default_rng(0)
+    a, s = random_sparse(rng, (5, 6))
+    d = rng.standard_normal((6, 3))
+    e = rng.standard_normal((4, 5, 2))
+
+    out = tmult(s, Tensor(d), ([1], [0]), (5, 3))
+    assert np.allclose(out.data, a @ d)
+    out = tmult(s, Tensor(e), ([0], [1]), (6, 4, 2))
+    assert np.allclose(out.data, np.tensordot(a, e, ([0], [1])))
+    out = tmult(Tensor(e), s, ([1], [0]), (4, 2, 6))
+    assert np.allclose(out.data, np.tensordot(e, a, ([1], [0])))
+
+    # one long row, the others short: summed per row instead of padded
+    skewed = np.zeros((5, 12))
+    skewed[0] = 1.0
+    skewed[1:, 2] = 2.0
+    f = rng.standard_normal((12, 3))
+    out = tmult(SparseTensor.from_dense(skewed), Tensor(f), ([1], [0]), (5, 3))
+    assert np.allclose(out.data, skewed @ f)
+
+    with pytest.raises(ValueError):
+        tmult(s, Tensor(d), ([1], [0]), (5, 4))
+    with pytest.raises(NotImplementedError):
+        tmult(s, s, ([1], [0]), (5, 6))
+
+
+def test_sparse_dense_tmult_backward() -> None:
+    rng = np.random.default_rng(1)
+    a, s = random_sparse(rng, (5, 6))
+    d = Tensor(rng.standard_normal((3, 6)))
+    g = rng.standard_normal((3, 5))
+
+    out = tmult(d, s, ([1], [1]), (3, 5))  # d @ a.T
+    out.backward(Tensor(g))
+    assert np.allclose(d.grad.data, g @ a)
+    rows, cols = np.nonzero(a)
+    assert np.allclose(s.values.grad.data, (g.T @ d.data)[rows, cols])
+
+    # a dense leaf only some rows are referenced of gets a dense gradient unless it opts in
+    table = Tensor(rng.standard_normal((10, 4)))
+    lookup = SparseTensor.from_coo([0, 1, 2], [7, 2, 7], Tensor(np.ones(3), requires_grad=False), (3, 10))
+    expected = np.zeros((10, 4))
+    expected[2], expected[7] = 1.0, 2.0
+    tmult(lookup, table, ([1], [0]), (3, 4)).backward(Tensor(np.ones((3, 4))))
+    assert isinstance(table.grad, Tensor)
+    assert np.allclose(table.grad.data, expected)
+
+    table.grad = None
+    table.sparse_grad = True
+    tmult(lookup, table, ([1], [0]), (3, 4)).backward(Tensor(np.ones((3, 4))))
+    assert isinstance(table.grad, RowSparseTensor)
+    assert list(table.grad.rows) == [2, 7]
+    assert np.allclose(table.grad.to_dense(), expected)
+
+
+def test_sparse_elementwise() -> None:
+    rng = np.random.default_rng(2)
+    a, s = random_sparse(rng, (4, 5))
+    b, t = random_sparse(rng, (4, 5))
+    d = Tensor(rng.standard_normal((4, 5)))
+    row = Tensor(rng.standard_normal(5))
+
+    assert np.allclose((s * 2.0).to_dense().data, a * 2.0)
+    p = s * d
+    assert isinstance(p, SparseTensor) and p.nnz == s.nnz
+    assert np.allclose(p.to_dense().data, a * d.data)
+    assert np.allclose((s * row).to_dense().data, a * row.data)
+    assert np.allclose((s * t).to_dense().data, a * b)
+    assert np.allclose((s + t).to_dense().data, a + b)
+    assert np.allclose((s + d).data, a + d.data)
+
+    q = s * row + t
+    q.to_dense().backward(Tensor(np.ones((4, 5))))
+    assert np.allclose(row.grad.data, a.sum(axis=0))
+    assert np.allclose(s.values.grad.data, row.data[s.indices])
+    assert np.allclose(t.values.grad.data, 1.0)
+
+
+def test_sparse_capture_replay() -> None:
+    def f(x, v):
+        m = SparseTensor.from_coo([1, 0, 1], [0, 1, 0], v, (2, 2))  # duplicate entry: segment sum
+        m = m + m
+        return tmult(m, x, ([0], [0]), (2, 2)) + m.to_dense()  # transposed: gather
+
+    captured = mytorch.capture(f)
+    for x_data, v_data in (([[1.0, 2.0], [3.0, 4.0]], [1.0, 2.0, 3.0]), ([[3.0, 4.0], [5.0, 6.0]], [2.0, 0.0, 1.0])):
+        x, v = Tensor(np.array(x_data)), Tensor(np.array(v_data))
+        out = captured(x, v)
+        x_eager, v_eager = Tensor(np.array(x_data)), Tensor(np.array(v_data))
+        eager = f(x_eager, v_eager)
+        eager.backward(Tensor(np.ones((2, 2)), requires_grad=False))
+        assert np.allclose(out.data, eager.data)
+        assert np.allclose(x.grad.data, x_eager.grad.data)
+        assert np.allclose(v.grad.data, v_eager.grad.data)
+    assert len(captured.graphs) == 1
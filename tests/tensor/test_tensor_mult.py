@@ -1,8 +1,10 @@
 """Multiplication tests for the tensor package."""
 
 import numpy as np
+import pytest
 
 from mytorch.tensor import Tensor, tmult
+from mytorch.tensor.tensor_mult import _tmult_plan
 
 
 def test_tensor_multiplication_forward() -> None:
@@ -39,3 +41,52 @@ def test_tensor_multiplication_forward() -> None:
     assert id(r.data) != id(b.data)
     assert id(r.data) != id(r2.data)
     assert id(a.data) != id(b.data)
+
+
+def test_tensor_multiplication_backward() -> None:
+    rng = np.random.default_rng(0)
+    x_data = rng.standard_normal((2,3,4))
+    y_data = rng.standard_normal((4,5,3))
+    x = Tensor(x_data)
+    y = Tensor(y_data)
+    r: Tensor = tmult(x,y,axes=([2,1],[0,2]),dim_out=(2,5))
+
+    assert r.requires_grad == True
+    assert r.grad_op.op_name == "tensor-mult"
+    assert r.grad_op.operands == [x, y]
+
+    grad_out = rng.standard_normal((2,5))
+    r.backward(Tensor(grad_out))
+
+    assert x.grad.dim == x.dim
+    assert y.grad.dim == y.dim
+    assert np.allclose(x.grad.data, np.einsum("ab,dbc->acd", grad_out, y_data))
+    assert np.allclose(y.grad.data, np.einsum("ab,acd->dbc", grad_out, x_data))
+
+
+def test_tensor_multiplication_outer_backward() -> None:
+    x = Tensor([1.0,2.0])
+    y = Tensor([3.0,4.0,5.0], requires_grad=False)
+    r: Tensor = tmult(x,y,axes=([],[]),dim_out=(2,3))
+    r.backward(Tensor(np.ones((2,3))))
+    assert x.grad == Tensor([12.0,12.0])
+    assert y.grad == None
+
+
+def test_tensor_multiplication_validation() -> None:
+    a = Tensor([[1,0,-1],[2,1,-2]])
+    b = Tensor([[-1,1],[-2,2],[-3,3]])
+    with pytest.raises(ValueError, match="do not match"):
+        tmult(a,b,axes=([1],[1]),dim_out=(2,3))
+    with pytest.raises(ValueError, match="not valid"):
+        tmult(a,b,axes=([2],[0]),dim_out=(2,2))
+    with pytest.raises(ValueError, match="not of expected shape"):
+        tmult(a,b,axes=([1],[0]),dim_out=(2,3))
+    with pytest.raises(TypeError):
+        tmult(a,b,axes=[[1],[0]],dim_out=(2,2))
+
+    # validation results are cached per signature
+    _tmult_plan.cache_clear()
+    tmult(a,b,axes=([1],[0]),dim_out=(2,2))
+    tmult(a,b,axes=([1],[0]),dim_out=(2,2))
+    assert _tmult_plan.cache_info().hits == 1
@@ -0,0 +1,60 @@
+"""Permute and indexing tests for the tensor package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult
+
+
+def test_tensor_permute() -> None:
+    x = np.arange(24.0).reshape(2, 3, 4)
+    a = Tensor(x)
+    b = a.permute(2, 0, 1)
+
+    assert b.dim == (4, 2, 3)
+    assert (b.data == x.transpose(2, 0, 1)).all()
+    assert np.shares_memory(a.data, b.data)
+    assert a.transpose(0, -1) == Tensor(x.transpose(2, 1, 0))
+
+    g = np.arange(24.0).reshape(4, 2, 3)
+    b.backward(Tensor(g))
+    assert a.grad == Tensor(g.transpose(1, 2, 0))
+
+    with pytest.raises(ValueError):
+        a.permute(0, 1)
+    with pytest.raises(ValueError):
+        a.permute(0, 0, 1)
+
+
+def test_tensor_getitem() -> None:
+    x = np.arange(12.0).reshape(3, 4)
+    a = Tensor(x)
+
+    assert a[1] == Tensor(x[1])
+    assert a[1, 2].dim == ()
+    assert a[:, 1:3] == Tensor(x[:, 1:3])
+    assert a[..., None].dim == (3, 4, 1)
+    assert np.shares_memory(a[::2, 1].data, a.data)
+
+    with pytest.raises(TypeError):
+        a[[0, 1]]
+    with pytest.raises(IndexError):
+        a[3]
+
+
+def test_tensor_getitem_backward() -> None:
+    a = Tensor(np.arange(12.0).reshape(3, 4))
+    w = Tensor([1.0, 2.0])
+
+    # overlapping slices: gradients of both uses add up
+    r = tmult(a[:, 1:3], w, ([1], [0]), (3,)) + a[0, 0]
+    r.backward(Tensor(np.ones(3)))
+    assert a.grad == Tensor([[3.0, 1.0, 2.0, 0.0], [0.0, 1.0, 2.0, 0.0], [0.0, 1.0, 2.0, 0.0]])
+
+
+def test_tensor_views_do_not_alias_inputs() -> None:
+    a = Tensor([1.0, 2.0, 3.0, 4.0])
+    b = a.reshape(2, 2)
+    c = b + 1
+    assert a.dim == (4,)
+    assert c == Tensor([[2.0, 3.0], [4.0, 5.0]])
@@ -0,0 +1,63 @@
+"""Save/load tests for mytorch."""
+
+import numpy as np
+import pytest
+
+import mytorch
+from mytorch.tensor import Tensor
+from mytorch.nn import Linear
+
+
+def test_save_load_roundtrip(tmp_path) -> None:
+    state = {
+        "w": Tensor(np.arange(12, dtype=np.float32).reshape(3,4)),
+        "t": Tensor(np.arange(6.0).reshape(2,3).T, requires_grad=False),  # not contiguous
+        "scalar": Tensor(np.array(2.5)),
+        "empty": np.zeros((0,3), dtype=np.int16),
+        "mask": np.array([True, False]),
+    }
+    path = tmp_path / "state.mt"
+    mytorch.save(state, path)
+    for mmap in (False, True):
+        loaded = mytorch.load(path, mmap=mmap)
+        assert list(loaded) == list(state)
+        for name, value in state.items():
+            expected = value.data if isinstance(value, Tensor) else value
+            got = loaded[name].data if isinstance(value, Tensor) else loaded[name]
+            assert isinstance(loaded[name], type(value))
+            assert got.dtype == expected.dtype and got.shape == expected.shape
+            assert (got == expected).all()
+        assert loaded["w"].requires_grad and not loaded["t"].requires_grad
+        assert loaded["w"].data.ctypes.data % 64 == 0 or not mmap
+
+    single = tmp_path / "single.mt"
+    mytorch.save(Tensor([1.0, 2.0]), single)
+    assert mytorch.load(single) == Tensor([1.0, 2.0])
+    with pytest.raises(TypeError):
+        mytorch.save([Tensor([1.0])], single)
+    (tmp_path / "bad").write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        mytorch.load(tmp_path / "bad")
+
+
+def test_load_mmap_modes(tmp_path) -> None:
+    path = tmp_path / "a.mt"
+    mytorch.save({"a": np.ones(4)}, path)
+    ro = mytorch.load(path, mmap=True)["a"]
+    assert not ro.flags.writeable
+    cow = mytorch.load(path, mmap=True, writable=True)["a"]
+    cow[0] = 5.0
+    assert (mytorch.load(path)["a"] == 1.0).all()  # copy-on-write does not touch the file
+
+
+def test_module_state_dict(tmp_path) -> None:
+    model = Linear(4, 3)
+    path = tmp_path / "linear.mt"
+    mytorch.save(model.state_dict(), path)
+    other = Linear(4, 3)
+    other.load_state_dict(mytorch.load(path, mmap=True))
+    assert other.weight == model.weight and other.bias == model.bias
+    with pytest.raises(ValueError):
+        other.load_state_dict({"weight": model.weight})
+    with pytest.raises(ValueError):
+        Linear(2, 3).load_state_dict(mytorch.load(path))
@@ -0,0 +1,62 @@
+"""Gradient checkpointing tests for the utils package."""
+
+import numpy as np
+import pytest
+
+from mytorch.tensor import Tensor, tmult
+from mytorch.nn import Linear
+from mytorch.utils import checkpoint, checkpoint_sequential
+
+
+def _ones(t: Tensor) -> Tensor:
+    return Tensor(np.ones(t.dim), requires_grad=False)
+
+
+def test_checkpoint_matches_eager() -> None:
+    a = Tensor(np.array([1.0, 2.0, 3.0]))
+    b = Tensor(np.array([0.5, -1.0, 2.0]))
+
+    def segment(x, y):
+        return x * y * x + y
+
+    out = checkpoint(segment, a, b)
+    assert out.grad_op.op_name == "checkpoint"
+    assert out.grad_op.operands == [a, b]
+    assert out.grad_op.operands[0].grad_op is None  # no intermediates kept
+    (out * 2).backward(_ones(out))
+    assert np.allclose(a.grad.data, 2 * 2 * a.data * b.data)
+    assert np.allclose(b.grad.data, 2 * (a.data ** 2 + 1))
+
+
+def test_checkpoint_module_parameters() -> None:
+    layer = Linear(3, 2)
+    x = Tensor(np.random.default_rng(0).standard_normal((4,3)), requires_grad=False)
+    out = checkpoint(layer, x)
+    out.backward(_ones(out))
+    expected = layer.weight.grad.data.copy()
+    layer.zero_grad()
+    eager = layer(x)
+    eager.backward(_ones(eager))
+    assert np.allclose(expected, layer.weight.grad.data)
+    with pytest.raises(TypeError):
+        checkpoint(layer, x.data)
+
+
+def test_checkpoint_sequential() -> None:
+    rng = np.random.default_rng(1)
+    layers = [Linear(4, 4) for _ in range(6)]
+    w = Tensor(rng.standard_normal((4,)))
+    functions = layers[:3] + [lambda h: h * 0.5] + layers[3:]
+    x_data = rng.standard_normal((2,4))
+
+    results = []
+    for segments, every in ((1, 1), (3, 1), (7, 2)):
+        for layer in layers:
+            layer.zero_grad()
+        out = tmult(checkpoint_sequential(functions, segments, Tensor(x_data), every), w, ([1], [0]), (2,))
+        out.backward(_ones(out))
+        results.append([layer.weight.grad.data.copy() for layer in layers])
+    for grads in results[1:]:
+        assert all(np.allclose(g, g0) for g, g0 in zip(grads, results[0]))
+    with pytest.raises(ValueError):
+        checkpoint_sequential(functions, 0, Tensor(x_data))